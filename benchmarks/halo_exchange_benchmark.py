@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+
+"""
+Compares the halo transports of veros.distributed (messages and shared memory).
+
+Every process holds a 3D array of the given local size, and exchanges its overlap with
+all neighbors, once through exchange_overlap and once for several arrays at once through
+exchange_overlap_many. Run through MPI, e.g.
+
+    mpirun -n 4 python halo_exchange_benchmark.py -n 2 2
+
+Reports the slowest process (exchanges are synchronized between neighbors).
+"""
+
+import timeit
+
+import click
+
+
+@click.command('halo-exchange-benchmark')
+@click.option('-n', '--num-proc', nargs=2, type=int, default=(2, 2), help='Number of processes in x and y')
+@click.option('--size', nargs=3, type=int, default=(100, 100, 40), help='Local grid size (x, y, z)')
+@click.option('--arrays', type=int, default=8, help='Number of arrays exchanged at once')
+@click.option('--exchanges', type=int, default=100, help='Number of exchanges per repetition')
+@click.option('--repetitions', type=int, default=5, help='Number of repetitions (best is reported)')
+def main(num_proc, size, arrays, exchanges, repetitions):
+    import numpy as np
+
+    from veros import VerosState, runtime_settings as rs, runtime_state as rst
+    from veros.distributed import exchange_overlap, exchange_overlap_many
+
+    rs.num_proc = num_proc
+    if rst.proc_num != num_proc[0] * num_proc[1]:
+        raise click.UsageError('benchmark has to be run with {} MPI processes'.format(num_proc[0] * num_proc[1]))
+
+    vs = VerosState()
+    vs.nx, vs.ny = size[0] * num_proc[0], size[1] * num_proc[1]
+
+    grid = ('xt', 'yt', 'zt')
+    shape = (size[0] + 4, size[1] + 4, size[2])
+    local_arrays = [np.random.rand(*shape) for _ in range(arrays)]
+
+    def time_exchange(exchange):
+        exchange()
+        best = float('inf')
+        for _ in range(repetitions):
+            rs.mpi_comm.barrier()
+            best = min(best, timeit.timeit(exchange, number=exchanges) / exchanges)
+        return rs.mpi_comm.allreduce(best, op=max)
+
+    for transport in ('messages', 'shared_memory'):
+        rs.halo_transport = transport
+        single = time_exchange(lambda: exchange_overlap(vs, local_arrays[0], grid))
+        many = time_exchange(lambda: exchange_overlap_many(vs, local_arrays, [grid] * arrays))
+
+        if rst.proc_rank == 0:
+            print('{:<14} 1 array: {:>8.1f}us  {} arrays: {:>8.1f}us'.format(
+                transport, single * 1e6, arrays, many * 1e6
+            ))
+
+
+if __name__ == '__main__':
+    main()
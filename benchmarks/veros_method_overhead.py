@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+
+"""
+Measures the per-call dispatch overhead of the veros_method decorator.
+
+Compares a plain Python function to the same function decorated with veros_method,
+once in ``debug`` dispatch mode (runtime configuration is resolved on every call)
+and once in ``production`` dispatch mode (runtime configuration is resolved once
+per function).
+"""
+
+import timeit
+
+import click
+
+from veros import VerosState, veros_method, runtime_settings as rs
+
+
+def plain_kernel(vs, arr):
+    return arr
+
+
+@veros_method
+def decorated_kernel(vs, arr):
+    return arr
+
+
+@veros_method(inline=True)
+def decorated_inline_kernel(vs, arr):
+    return arr
+
+
+def _time_per_call(func, args, calls, repetitions):
+    timer = timeit.Timer(lambda: func(*args))
+    return min(timer.repeat(repeat=repetitions, number=calls)) / calls
+
+
+@click.command('veros-method-overhead')
+@click.option('--calls', type=int, default=100000, help='Number of calls per repetition')
+@click.option('--repetitions', type=int, default=5, help='Number of repetitions (best is reported)')
+def main(calls, repetitions):
+    vs = VerosState()
+    args = (vs, None)
+
+    baseline = _time_per_call(plain_kernel, args, calls, repetitions)
+    print('plain function call: {:>10.0f}ns'.format(baseline * 1e9))
+
+    for mode in ('debug', 'production'):
+        rs.dispatch_mode = mode
+        for name, kernel in (('veros_method', decorated_kernel),
+                             ('veros_method(inline=True)', decorated_inline_kernel)):
+            per_call = _time_per_call(kernel, args, calls, repetitions)
+            print('{:<10} {:<26} {:>10.0f}ns ({:.0f}ns overhead)'.format(
+                mode, name, per_call * 1e9, (per_call - baseline) * 1e9
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -20,10 +20,12 @@ Runs selected Veros benchmarks back to back and writes timing results to a YAML
 """
 
 TESTDIR = os.path.join(os.path.dirname(__file__), os.path.relpath('benchmarks'))
-COMPONENTS = ['numpy', 'numpy-mpi', 'bohrium', 'bohrium-opencl', 'bohrium-cuda', 'bohrium-mpi', 'fortran', 'fortran-mpi']
+COMPONENTS = ['numpy', 'numpy-threaded', 'numba', 'numpy-mpi', 'bohrium', 'bohrium-opencl', 'bohrium-cuda', 'bohrium-mpi', 'fortran', 'fortran-mpi']
 STATIC_SETTINGS = '-v debug -s nx {nx} -s ny {ny} -s nz {nz} -s default_float_type {float_type} --timesteps {timesteps}'
 BENCHMARK_COMMANDS = {
     'numpy': '{python} {filename} -b numpy ' + STATIC_SETTINGS,
+    'numpy-threaded': 'VEROS_NUM_THREADS={nproc} {python} {filename} -b numpy-threaded ' + STATIC_SETTINGS,
+    'numba': '{python} {filename} -b numba ' + STATIC_SETTINGS,
     'numpy-mpi': '{mpiexec} -n {nproc} -- {python} {filename} -b numpy -n {decomp} ' + STATIC_SETTINGS,
     'bohrium': 'OMP_NUM_THREADS={nproc} BH_STACK=openmp BH_OPENMP_PROF=1 {python} {filename} -b bohrium '  + STATIC_SETTINGS,
     'bohrium-opencl': 'BH_STACK=opencl BH_OPENCL_PROF=1 {python} {filename} -b bohrium ' + STATIC_SETTINGS,
@@ -34,6 +36,8 @@ BENCHMARK_COMMANDS = {
 }
 SLURM_COMMANDS = {
     'numpy': 'srun --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b numpy ' + STATIC_SETTINGS,
+    'numpy-threaded': 'VEROS_NUM_THREADS={nproc} srun --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b numpy-threaded ' + STATIC_SETTINGS,
+    'numba': 'srun --ntasks 1 -- {python} {filename} -b numba ' + STATIC_SETTINGS,
     'numpy-mpi': 'srun --ntasks {nproc} --cpus-per-task 1 -- {python} {filename} -b numpy -n {decomp} ' + STATIC_SETTINGS,
     'bohrium': 'OMP_NUM_THREADS={nproc} BH_STACK=openmp BH_OPENMP_PROF=1 srun --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b bohrium ' + STATIC_SETTINGS,
     'bohrium-opencl': 'BH_STACK=opencl BH_OPENCL_PROF=1 srun --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b bohrium ' + STATIC_SETTINGS,
@@ -38,9 +38,9 @@ INSTALL_REQUIRES = [
 ]
 
 EXTRAS_REQUIRE = {
-    'fast': ['bohrium', 'pyamg'],
+    'fast': ['bohrium', 'pyamg', 'numba'],
     'mpi': ['mpi4py', 'petsc4py'],
-    'test': ['pytest', 'pytest-cov', 'pytest-xdist', 'codecov', 'pyopencl', 'pyamg', 'petsc4py', 'mpi4py']
+    'test': ['pytest', 'pytest-cov', 'pytest-xdist', 'codecov', 'pyopencl', 'pyamg', 'petsc4py', 'mpi4py', 'numba']
 }
 EXTRAS_REQUIRE['all'] = sorted(set(sum(EXTRAS_REQUIRE.values(), [])))
 
@@ -49,7 +49,8 @@ CONSOLE_SCRIPTS = [
     'veros-run = veros.cli.veros_run:cli',
     'veros-copy-setup = veros.cli.veros_copy_setup:cli',
     'veros-resubmit = veros.cli.veros_resubmit:cli',
-    'veros-create-mask = veros.cli.veros_create_mask:cli'
+    'veros-create-mask = veros.cli.veros_create_mask:cli',
+    'veros-import-time = veros.cli.veros_import_time:cli'
 ]
 
 PACKAGE_DATA = ['setup/*/assets.yml', 'setup/*/*.npy', 'setup/*/*.png']
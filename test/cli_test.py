@@ -30,3 +30,12 @@ def test_veros_copy_setup(runner):
             )]
             comparer = filecmp.dircmp(outpath, srcpath, ignore=ignore)
             assert not comparer.left_only and not comparer.right_only and not comparer.diff_files
+
+
+def test_veros_import_time(runner):
+    result = runner.invoke(veros.cli.veros_import_time.cli, ['veros.veros', '-n', '3'])
+    assert result.exit_code == 0, result.output
+
+    lines = result.output.splitlines()
+    assert lines[0].startswith('import veros.veros')
+    assert len(lines) == 4
@@ -0,0 +1,86 @@
+import pytest
+
+from veros import runtime_settings as rs
+
+
+@pytest.fixture
+def profile():
+    from veros.comm_profile import PROFILE
+    rs.profile_comm = True
+    PROFILE.clear()
+    yield PROFILE
+    rs.profile_comm = False
+    PROFILE.clear()
+
+
+def test_record(profile):
+    @profile.record('halo')
+    def exchange(nbytes):
+        profile.add_message(nbytes)
+        with profile.waiting():
+            pass
+
+    @profile.record('gather')
+    def gather():
+        # nested communication is accounted to the outer operation
+        exchange(10)
+        profile.add_message(20)
+
+    def kernel():
+        for _ in range(2):
+            exchange(100)
+        gather()
+
+    kernel()
+
+    assert len(profile.records) == 2
+    records = {op: (site, record) for (op, site), record in profile.records.items()}
+
+    site, halo = records['halo']
+    assert site.startswith('{}:kernel:'.format(__name__))
+    assert (halo.calls, halo.messages, halo.bytes) == (2, 2, 200)
+    assert 0 <= halo.wait_time <= halo.time
+
+    site, gather = records['gather']
+    assert site.startswith('{}:kernel:'.format(__name__))
+    assert (gather.calls, gather.messages, gather.bytes) == (1, 2, 30)
+
+
+def test_call_site(profile):
+    @profile.record('gather')
+    def gather():
+        profile.add_message(10)
+
+    with profile.call_site('some.module:kernel (gather / scatter)'):
+        gather()
+    gather()
+
+    sites = sorted(site for _, site in profile.records)
+    assert sites[0].startswith('{}:test_call_site:'.format(__name__))
+    assert sites[1] == 'some.module:kernel (gather / scatter)'
+
+
+def test_disabled():
+    from veros.comm_profile import PROFILE
+    PROFILE.clear()
+
+    @PROFILE.record('halo')
+    def exchange():
+        PROFILE.add_message(100)
+
+    exchange()
+    assert not PROFILE.records
+
+
+def test_report():
+    from veros.comm_profile import format_report
+
+    all_records = [
+        ({('halo', 'site_a'): (10, 40, 4096, 1., 0.5)}, 10.),
+        ({('halo', 'site_a'): (10, 40, 4096, 3., 2.5), ('allreduce', 'site_b'): (1, 1, 8, 1., 1.)}, 10.),
+    ]
+
+    report = format_report(all_records).splitlines()
+    assert report[0].startswith('Communication: 25.0% of wall time (20.0% waiting), 75.0% compute')
+    assert report[3].split()[:4] == ['halo', 'site_a', '20', '80']
+    assert report[-2].split()[:3] == ['rank', '1:', '3.500s']
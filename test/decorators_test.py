@@ -0,0 +1,40 @@
+import pytest
+
+from veros import VerosState, veros_method, runtime_settings as rs
+
+
+@veros_method
+def get_np(vs):
+    return np
+
+
+@veros_method(inline=True)
+def get_np_inline(vs):
+    return get_np(vs)
+
+
+@pytest.mark.parametrize('dispatch_mode', ['production', 'debug'])
+def test_backend_injection(dispatch_mode, backend):
+    from veros.backend import get_backend
+
+    rs.backend = backend
+    rs.dispatch_mode = dispatch_mode
+
+    vs = VerosState()
+    assert get_np(vs) is get_backend(backend)
+    assert get_np_inline(vs) is get_backend(backend)
+
+    # np is only visible while the function is executing
+    assert 'np' not in globals()
+
+
+def test_settings_generation():
+    # changing any runtime setting invalidates cached dispatch information
+    generation = rs.__generation__
+    rs.loglevel = rs.loglevel
+    assert rs.__generation__ == generation + 1
+
+
+def test_type_check():
+    with pytest.raises(TypeError):
+        get_np(object())
@@ -159,7 +159,8 @@ def test_scatter(backend):
 
 
 @pytest.mark.skipif(ON_GPU, reason='Cannot run MPI and OpenCL')
-def test_acc(backend):
+@pytest.mark.parametrize('linear_solver', ['scipy', 'krylov'])
+def test_acc(backend, linear_solver):
     test_kernel = dedent('''
     import os
     os.environ['OMP_NUM_THREADS'] = '1'
@@ -172,7 +173,7 @@ def test_acc(backend):
     from veros.setup.acc import ACCSetup
 
     rs.backend = '{backend}'
-    rs.linear_solver = 'scipy'
+    rs.linear_solver = '{linear_solver}'
 
     sim = ACCSetup(override=dict(
         diskless_mode=True,
@@ -221,8 +222,435 @@ def test_acc(backend):
 
             rs.mpi_comm.Get_parent().Send(psi_global, 0)
 
+    '''.format(
+        backend=backend,
+        linear_solver=linear_solver
+    ))
+
+    run_dist_kernel(test_kernel)
+
+
+@pytest.mark.skipif(ON_GPU, reason='Cannot run MPI and OpenCL')
+@pytest.mark.parametrize('cyclic', [False, True])
+@pytest.mark.parametrize('halo_transport,num_nodes', [
+    ('messages', 1),
+    ('shared_memory', 1),
+    ('shared_memory', 2),
+])
+def test_exchange_overlap(backend, cyclic, halo_transport, num_nodes):
+    test_kernel = dedent('''
+    import os
+    os.environ['OMP_NUM_THREADS'] = '1'
+
+    import numpy as np
+    from mpi4py import MPI
+
+    from veros import runtime_settings as rs, runtime_state as rst, VerosState
+    from veros import distributed
+    from veros.distributed import (
+        exchange_overlap, exchange_overlap_many, start_exchange_overlap, finish_exchange_overlap,
+        proc_rank_to_index, proc_index_to_rank
+    )
+
+    rs.backend = '{backend}'
+    rs.halo_transport = '{halo_transport}'
+
+    if {num_nodes} > 1:
+        # pretend that processes are spread over several nodes
+        distributed._get_node_comm = lambda: rs.mpi_comm.Split(rst.proc_rank % {num_nodes})
+
+    if rst.proc_num == 1:
+        import sys
+        comm = MPI.COMM_SELF.Spawn(
+            sys.executable,
+            args=['-m', 'mpi4py', sys.argv[-1]],
+            maxprocs=4
+        )
+
+        for proc in range(4):
+            assert comm.recv(source=proc)
+    else:
+        rs.num_proc = (2, 2)
+
+        assert rst.proc_num == 4
+
+        vs = VerosState()
+        vs.nx = 8
+        vs.ny = 8
+        vs.enable_cyclic_x = {cyclic}
+
+        px, py = proc_rank_to_index(rst.proc_rank)
+
+        np.random.seed(17)
+        grids_and_types = (
+            (('xt', 'yt', 'zt'), 'float64'),
+            (('xu', 'yu'), 'float64'),
+            (('xt', 'yu', None), 'int32'),
+            (('xt', 'zt'), 'float64'),
+            (('yt', 'zt'), 'float64'),
+            (('xt', 'yt', 'zw'), 'float64'),
+        )
+
+        global_arrays, local_arrays, expected, grids = [], [], [], []
+        for grid, dtype in grids_and_types:
+            shape = [12 if dim in ('xt', 'xu', 'yt', 'yu') else 3 for dim in grid]
+            global_arr = (100 * np.random.rand(*shape)).astype(dtype)
+            if vs.enable_cyclic_x and grid[0] in ('xt', 'xu'):
+                global_arr[:2] = global_arr[-4:-2]
+                global_arr[-2:] = global_arr[2:4]
+            local_idx = tuple(
+                slice(2, -2) if dim in ('xt', 'xu', 'yt', 'yu') else slice(None) for dim in grid
+            )
+            global_idx = tuple(
+                slice(4 * px, 4 * px + 8) if dim in ('xt', 'xu') else
+                slice(4 * py, 4 * py + 8) if dim in ('yt', 'yu') else slice(None)
+                for dim in grid
+            )
+
+            local_arr = -np.ones(global_arr[global_idx].shape, dtype=dtype)
+            local_arr[local_idx] = global_arr[global_idx][local_idx]
+
+            # overlap at the outer boundary is left untouched
+            expected_arr = global_arr[global_idx].copy()
+            for i, dim in enumerate(grid):
+                if dim in ('xt', 'xu'):
+                    if vs.enable_cyclic_x:
+                        continue
+                    p = px
+                elif dim in ('yt', 'yu'):
+                    p = py
+                else:
+                    continue
+                outer_idx = [slice(None)] * len(grid)
+                if p == 0:
+                    outer_idx[i] = slice(0, 2)
+                    expected_arr[tuple(outer_idx)] = -1
+                else:
+                    outer_idx[i] = slice(-2, None)
+                    expected_arr[tuple(outer_idx)] = -1
+
+            local_arrays.append(local_arr)
+            expected.append(expected_arr)
+            grids.append(grid)
+
+        single_arrays = [arr.copy() for arr in local_arrays]
+        split_arrays = [arr.copy() for arr in local_arrays]
+
+        # exchange twice, to re-use buffers
+        for _ in range(2):
+            for arr, grid in zip(single_arrays, grids):
+                exchange_overlap(vs, arr, grid)
+
+            exchange_overlap_many(vs, local_arrays, grids)
+
+            exchange = start_exchange_overlap(vs, split_arrays, grids)
+            finish_exchange_overlap(vs, exchange)
+
+        # plans are set up between neighbors only, not by all processes of a node
+        row_exchanged = True
+        if py == 0:
+            row_arr = np.full((8, 5), float(rst.proc_rank))
+            exchange_overlap(vs, row_arr, ('xt', 'zt'))
+            other = proc_index_to_rank(1 - px, py)
+            row_exchanged = np.all(row_arr[-2:] == other) if px == 0 else np.all(row_arr[:2] == other)
+
+        # plans of exchanges in flight are only freed once the exchange is finished
+        freed = []
+        exchange = start_exchange_overlap(vs, split_arrays, grids)
+        in_flight = [plan for plan, _ in exchange.plans]
+        for plan in in_flight:
+            plan.free = lambda plan=plan, free=plan.free: freed.append(plan) or free()
+
+        rs.halo_transport = '{halo_transport}'  # invalidates all plans
+        exchange_overlap(vs, single_arrays[0], grids[0])
+        freed_early = bool(freed)
+        finish_exchange_overlap(vs, exchange)
+
+        rs.mpi_comm.Get_parent().send(row_exchanged and not freed_early and freed == in_flight and all(
+            np.array_equal(arr, ref)
+            for arrays in (single_arrays, local_arrays, split_arrays)
+            for arr, ref in zip(arrays, expected)
+        ), dest=0)
+
+    '''.format(
+        backend=backend,
+        cyclic=cyclic,
+        halo_transport=halo_transport,
+        num_nodes=num_nodes
+    ))
+
+    run_dist_kernel(test_kernel)
+
+
+@pytest.mark.skipif(ON_GPU, reason='Cannot run MPI and OpenCL')
+def test_global_reduction(backend):
+    test_kernel = dedent('''
+    import os
+    os.environ['OMP_NUM_THREADS'] = '1'
+
+    import numpy as np
+    from mpi4py import MPI
+
+    from veros import runtime_settings as rs, runtime_state as rst, VerosState
+    from veros.distributed import GlobalReduction
+
+    rs.backend = '{backend}'
+
+    if rst.proc_num == 1:
+        import sys
+        comm = MPI.COMM_SELF.Spawn(
+            sys.executable,
+            args=['-m', 'mpi4py', sys.argv[-1]],
+            maxprocs=4
+        )
+
+        for proc in range(4):
+            assert comm.recv(source=proc)
+    else:
+        rs.num_proc = (2, 2)
+
+        assert rst.proc_num == 4
+
+        vs = VerosState()
+        rank = rst.proc_rank
+
+        reduction = GlobalReduction(vs)
+        reduction.sum('scalar', float(rank))
+        reduction.sum('array', rank * np.ones((2, 3)))
+        reduction.sum('int', np.int64(rank))
+        reduction.max('max', np.array([rank, -rank]))
+        reduction.min('min', float(rank))
+        res = reduction.compute()
+
+        assert res['scalar'] == 6
+        assert np.array_equal(res['array'], 6 * np.ones((2, 3)))
+        assert res['int'] == 6
+        assert np.array_equal(res['max'], [3, 0])
+        assert res['min'] == 0
+
+        rs.mpi_comm.Get_parent().send(True, 0)
     '''.format(
         backend=backend
     ))
 
     run_dist_kernel(test_kernel)
+
+
+@pytest.mark.skipif(ON_GPU, reason='Cannot run MPI and OpenCL')
+def test_uneven_decomposition(backend):
+    test_kernel = dedent('''
+    import os
+    os.environ['OMP_NUM_THREADS'] = '1'
+
+    import numpy as np
+    from mpi4py import MPI
+
+    from veros import runtime_settings as rs, runtime_state as rst, VerosState
+    from veros.distributed import (
+        gather, scatter, validate_decomposition, get_chunk_size, get_chunk_offset, proc_rank_to_index
+    )
+    from veros.variables import allocate
+
+    rs.backend = '{backend}'
+
+    if rst.proc_num == 1:
+        import sys
+        comm = MPI.COMM_SELF.Spawn(
+            sys.executable,
+            args=['-m', 'mpi4py', sys.argv[-1]],
+            maxprocs=4
+        )
+
+        assert comm.recv(source=0)
+    else:
+        rs.num_proc = (2, 2)
+
+        assert rst.proc_num == 4
+
+        vs = VerosState()
+        vs.nx = 7
+        vs.ny = 9
+        vs.nz = 3
+        vs.chunk_sizes = ((2, 5), (6, 3))
+        validate_decomposition(vs)
+
+        assert allocate(vs, ('xt', 'yu', 'zt')).shape == (
+            (6, 10, 3), (9, 10, 3), (6, 7, 3), (9, 7, 3)
+        )[rst.proc_rank]
+
+        np.random.seed(17)
+        results = []
+        for grid in (('xt', 'yt', 'zt'), ('xu', 'zt'), ('yu', 'zw')):
+            shape = [11 if dim in ('xt', 'xu') else 13 if dim in ('yt', 'yu') else 3 for dim in grid]
+            global_arr = np.random.rand(*shape)
+
+            # only the root process passes global data
+            local_arr = scatter(vs, global_arr if rst.proc_rank == 0 else allocate(vs, grid), grid)
+
+            # local chunk including (exchanged) overlap
+            proc_idx = proc_rank_to_index(rst.proc_rank)
+            size, offset = get_chunk_size(vs), get_chunk_offset(vs, proc_idx)
+            window = tuple(
+                slice(offset[0], offset[0] + size[0] + 4) if dim in ('xt', 'xu') else
+                slice(offset[1], offset[1] + size[1] + 4) if dim in ('yt', 'yu') else slice(None)
+                for dim in grid
+            )
+            results.append(np.array_equal(local_arr, global_arr[window]))
+
+            gathered_arr = gather(vs, local_arr, grid)
+            if rst.proc_rank == 0:
+                results.append(np.array_equal(gathered_arr, global_arr))
+
+        results = rs.mpi_comm.gather(all(results), root=0)
+        if rst.proc_rank == 0:
+            rs.mpi_comm.Get_parent().send(all(results), dest=0)
+
+    '''.format(
+        backend=backend
+    ))
+
+    run_dist_kernel(test_kernel)
+
+
+def test_chunk_sizes():
+    from veros.distributed import get_uniform_chunk_sizes, get_balanced_chunk_sizes
+
+    assert get_uniform_chunk_sizes(8, 2) == (4, 4)
+    assert get_uniform_chunk_sizes(10, 4) == (2, 3, 2, 3)
+
+    # land in the east
+    weights = [10] * 6 + [0] * 6
+    assert get_balanced_chunk_sizes(weights, 2) == (3, 9)
+    assert get_balanced_chunk_sizes(weights, 3) == (2, 2, 8)
+    assert get_balanced_chunk_sizes(weights, 4, min_size=2) == (2, 2, 2, 6)
+
+    # no chunk is smaller than min_size
+    assert get_balanced_chunk_sizes([0] * 6 + [10] * 2, 3, min_size=2) == (4, 2, 2)
+    assert get_balanced_chunk_sizes([0] * 8, 2) == (4, 4)
+
+
+@pytest.mark.skipif(ON_GPU, reason='Cannot run MPI and OpenCL')
+def test_acc_land_blocks(backend):
+    test_kernel = dedent('''
+    import os
+    os.environ['OMP_NUM_THREADS'] = '1'
+
+    import numpy as np
+    from mpi4py import MPI
+
+    from veros import runtime_settings as rs, runtime_state as rst, veros_method
+    from veros.distributed import gather
+    from veros.setup.acc import ACCSetup
+
+    rs.backend = '{backend}'
+    rs.linear_solver = 'scipy'
+
+
+    class ContinentSetup(ACCSetup):
+        @veros_method
+        def set_topography(self, vs):
+            # the northern center block of a 3x2 decomposition is land (including overlap)
+            x, y = np.meshgrid(vs.xt, vs.yt, indexing='ij')
+            continent = (x > 14.0) & (x < 42.0) & (y > -4.0)
+            vs.kbot[...] = np.logical_not(continent).astype(np.int)
+
+
+    sim = ContinentSetup(override=dict(
+        diskless_mode=True,
+        runlen=86400 * 10,
+        enable_land_block_elimination=True,
+    ))
+
+    if rst.proc_num == 1:
+        import sys
+        comm = MPI.COMM_SELF.Spawn(
+            sys.executable,
+            args=['-m', 'mpi4py', sys.argv[-1]],
+            maxprocs=5
+        )
+
+        try:
+            sim.setup()
+            sim.run()
+        except Exception as exc:
+            print(str(exc))
+            comm.Abort(1)
+
+        for var in ('psi', 'temp', 'u'):
+            arr = getattr(sim.state, var)
+            other_arr = np.empty_like(arr)
+            comm.Recv(other_arr, 0)
+
+            scale = max(np.abs(arr).max(), np.abs(other_arr).max())
+            np.testing.assert_allclose(arr / scale, other_arr / scale, rtol=0, atol=1e-5)
+    else:
+        rs.num_proc = (3, 2)
+
+        assert rst.proc_num == 5
+
+        sim.setup()
+        assert rs.land_blocks == ((1, 1),)
+        # runtime settings are changed on all processes alike
+        assert len(set(rs.mpi_comm.allgather(rs.__generation__))) == 1
+        sim.run()
+
+        for var in ('psi', 'temp', 'u'):
+            arr_global = gather(sim.state, getattr(sim.state, var), sim.state.variables[var].dims)
+
+            if rst.proc_rank == 0:
+                try:
+                    arr_global = arr_global.copy2numpy()
+                except AttributeError:
+                    pass
+
+                rs.mpi_comm.Get_parent().Send(arr_global, 0)
+
+    '''.format(
+        backend=backend
+    ))
+
+    run_dist_kernel(test_kernel)
+
+
+def test_find_decomposition():
+    import numpy as np
+    from veros.distributed import find_decomposition, get_decomposition_cost
+
+    wet_cells = np.ones((8, 8), dtype='int')
+    num_proc, chunk_sizes, land_blocks, _ = find_decomposition(4, wet_cells, nz=1)
+    assert num_proc == (2, 2)
+    assert chunk_sizes == ((4, 4), (4, 4))
+    assert land_blocks == ()
+
+    # long domain is cut across its long side
+    wet_cells = np.ones((16, 4), dtype='int')
+    assert find_decomposition(4, wet_cells, nz=1)[0] == (4, 1)
+
+    # cyclic boundaries add exchanges in x-direction
+    cost = get_decomposition_cost(wet_cells, 1, ((8, 8), (4,)))
+    cyclic_cost = get_decomposition_cost(wet_cells, 1, ((8, 8), (4,)), cyclic_x=True)
+    assert cost[:3] == (8 * 4 + 4. * 8, 32, 8)
+    assert cyclic_cost[:3] == (8 * 4 + 4. * 16, 32, 16)
+
+    # wet cells are balanced
+    wet_cells = np.ones((8, 4), dtype='int')
+    wet_cells[:4] = 0
+    num_proc, chunk_sizes, _, (_, work, _, imbalance) = find_decomposition(
+        2, wet_cells, nz=1, balanced=True
+    )
+    assert num_proc == (2, 1)
+    assert chunk_sizes == ((6, 2), (4,))
+    assert work == 8
+    assert imbalance == 1
+
+    # blocks without a process are allowed if they only contain land
+    wet_cells = np.ones((12, 8), dtype='int')
+    wet_cells[4:8, 4:] = 0
+    wet = np.ones((16, 12), dtype='bool')
+    wet[4:12, 4:] = False
+    num_proc, _, land_blocks, _ = find_decomposition(5, wet_cells, nz=1, wet=wet)
+    assert num_proc[0] * num_proc[1] - len(land_blocks) == 5
+    assert land_blocks
+
+    with pytest.raises(RuntimeError):
+        find_decomposition(7, np.ones((4, 4), dtype='int'), nz=1)
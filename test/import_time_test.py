@@ -0,0 +1,27 @@
+import sys
+import subprocess
+
+import pytest
+
+# modules that should only be imported when they are actually needed
+HEAVY_MODULES = ('scipy', 'requests', 'mpi4py', 'h5py', 'h5netcdf', 'tqdm', 'bohrium', 'numba')
+
+# generous upper bound (in seconds) to catch eager imports creeping back in
+MAX_IMPORT_TIME = 2.
+
+
+@pytest.mark.parametrize('module', ['veros', 'veros.veros', 'veros.setup.acc'])
+def test_lazy_imports(module):
+    proc = subprocess.run(
+        [sys.executable, '-c', 'import sys, {}; print(" ".join(sys.modules))'.format(module)],
+        stdout=subprocess.PIPE, check=True, universal_newlines=True
+    )
+    imported = {mod.split('.')[0] for mod in proc.stdout.split()}
+    assert not imported & set(HEAVY_MODULES)
+
+
+def test_import_time():
+    from veros.cli.veros_import_time import measure_import_time
+
+    total_time, package_times = measure_import_time('veros.setup.acc')
+    assert 0 < total_time < MAX_IMPORT_TIME, package_times.most_common(5)
@@ -0,0 +1,120 @@
+import pytest
+import numpy as np
+
+from veros import VerosState, runtime_settings as rs
+
+
+@pytest.fixture(scope='module')
+def acc_state():
+    from veros.setup.acc import ACCSetup
+
+    rs.backend = 'numpy'
+    sim = ACCSetup(override=dict(
+        diskless_mode=True,
+        enable_neutral_diffusion=True,
+        enable_skew_diffusion=True,
+        eq_of_state_type=5,
+    ))
+    sim.setup()
+
+    vs = sim.state
+    np.random.seed(17)
+    for var in ('temp', 'salt', 'u', 'v', 'w', 'tke', 'Nsqr', 'B1_gm'):
+        arr = getattr(vs, var)
+        arr[...] += 1e-2 * np.random.randn(*arr.shape)
+    return vs
+
+
+def _run_kernel(vs, kernel, outputs, backend):
+    rs.backend = backend
+
+    initial = {var: getattr(vs, var).copy() for var in vs.variables if hasattr(vs, var)}
+    try:
+        res = kernel(vs)
+        return res, {var: getattr(vs, var).copy() for var in outputs}
+    finally:
+        for var, arr in initial.items():
+            getattr(vs, var)[...] = arr
+        rs.backend = 'numpy'
+
+
+def _tke_diffusivities(vs):
+    from veros.core import tke
+    tke.set_tke_diffusivities(vs)
+
+
+def _superbee(vs):
+    from veros.core import advection
+    advection.adv_flux_superbee(vs, vs.flux_east, vs.flux_north, vs.flux_top, vs.temp[..., vs.tau])
+
+
+def _superbee_wgrid(vs):
+    from veros.core import advection
+    advection.adv_flux_superbee_wgrid(vs, vs.flux_east, vs.flux_north, vs.flux_top, vs.tke[..., vs.tau])
+
+
+def _density(vs):
+    from veros.core.density import gsw
+    salt, temp = np.abs(vs.salt[..., vs.tau]), vs.temp[..., vs.tau]
+    p = np.abs(vs.zt)[np.newaxis, np.newaxis, :]
+    return [
+        func(vs, salt, temp, p) for func in (
+            gsw.gsw_rho, gsw.gsw_drhodT, gsw.gsw_drhodS, gsw.gsw_drhodP,
+            gsw.gsw_dyn_enthalpy, gsw.gsw_dHdT, gsw.gsw_dHdS
+        )
+    ] + [gsw.gsw_rho(vs, 35., 10., 2000.)]
+
+
+@pytest.mark.parametrize('kernel, outputs', [
+    (_tke_diffusivities, ('mxl', 'kappaM', 'kappaH')),
+    (_superbee, ('flux_east', 'flux_north', 'flux_top')),
+    (_superbee_wgrid, ('flux_east', 'flux_north', 'flux_top')),
+    (_density, ()),
+])
+def test_compiled_kernels(acc_state, kernel, outputs):
+    pytest.importorskip('numba')
+
+    ref_res, reference = _run_kernel(acc_state, kernel, outputs, 'numpy')
+    res, result = _run_kernel(acc_state, kernel, outputs, 'numba')
+
+    for var in outputs:
+        np.testing.assert_array_equal(reference[var], result[var], err_msg=var)
+
+    if ref_res is not None:
+        # logarithms may differ in the last digit between NumPy and Numba
+        for ref_arr, arr in zip(ref_res, res):
+            np.testing.assert_allclose(ref_arr, arr, rtol=0, atol=1e-10 * np.abs(ref_arr).max())
+
+
+def test_overturning(acc_state):
+    pytest.importorskip('numba')
+    from veros.diagnostics.overturning import Overturning
+
+    def diagnose(backend):
+        rs.backend = backend
+        try:
+            diag = Overturning(acc_state)
+            diag.initialize(acc_state)
+            diag.diagnose(acc_state)
+            return {var: getattr(diag, var) for var in ('trans', 'vsf_iso', 'bolus_iso')}
+        finally:
+            rs.backend = 'numpy'
+
+    reference = diagnose('numpy')
+    result = diagnose('numba')
+
+    for var in reference:
+        np.testing.assert_allclose(reference[var], result[var], rtol=1e-12, atol=1e-8, err_msg=var)
+
+
+def test_fallback(monkeypatch):
+    from veros import jit
+    from veros.core.density import gsw
+
+    monkeypatch.setattr(jit, '_NUMBA', False)
+    rs.backend = 'numba'
+    try:
+        assert not jit.is_enabled()
+        assert gsw.gsw_rho(VerosState(), 35., 10., 2000.) == pytest.approx(1.0351e3 - 1024., abs=1)
+    finally:
+        rs.backend = 'numpy'
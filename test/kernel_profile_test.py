@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from veros import VerosState, veros_method, runtime_settings as rs
+
+
+@pytest.fixture
+def profile():
+    from veros.kernel_profile import PROFILE
+    rs.profile_kernels = True
+    PROFILE.clear()
+    yield PROFILE
+    rs.profile_kernels = False
+    PROFILE.clear()
+
+
+@veros_method
+def inner(vs):
+    pass
+
+
+@veros_method(inline=True)
+def inner_inline(vs):
+    inner(vs)
+
+
+@veros_method
+def outer(vs):
+    for _ in range(3):
+        inner(vs)
+    inner_inline(vs)
+
+
+@veros_method
+def raise_error(vs):
+    inner(vs)
+    raise RuntimeError()
+
+
+def test_call_tree(profile):
+    vs = VerosState()
+    outer(vs)
+    outer(vs)
+    inner(vs)
+
+    root = profile.root
+    assert set(root.children) == {'{}:outer'.format(__name__), '{}:inner'.format(__name__)}
+
+    outer_node = root.children['{}:outer'.format(__name__)]
+    assert outer_node.calls == 2
+    # inline functions are accounted to their caller
+    assert list(outer_node.children) == ['{}:inner'.format(__name__)]
+    assert outer_node.children['{}:inner'.format(__name__)].calls == 8
+    assert outer_node.total_time >= outer_node.children['{}:inner'.format(__name__)].total_time
+    assert root.children['{}:inner'.format(__name__)].calls == 1
+
+    summary = profile.get_summary(min_fraction=0).splitlines()
+    assert len(summary) == 4
+    assert summary[2].startswith('  {}:inner'.format(__name__))
+
+
+def test_exception(profile):
+    vs = VerosState()
+    with pytest.raises(RuntimeError):
+        raise_error(vs)
+    inner(vs)
+
+    assert profile.root.children['{}:inner'.format(__name__)].calls == 1
+    assert profile.root.children['{}:raise_error'.format(__name__)].calls == 1
+
+
+def test_trace(profile, tmpdir):
+    vs = VerosState()
+    outer(vs)
+
+    summary_file, trace_file = profile.write(str(tmpdir.join('profile')), rank=1)
+
+    with open(trace_file) as f:
+        trace = json.load(f)
+
+    events = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    assert len(events) == 5
+    assert all(event['pid'] == 1 for event in events)
+
+    outer_event = [event for event in events if event['name'] == 'outer'][0]
+    for event in events:
+        assert event['ts'] >= outer_event['ts']
+        assert event['ts'] + event['dur'] <= outer_event['ts'] + outer_event['dur']
+
+    with open(summary_file) as f:
+        assert 'outer' in f.read()
+
+
+def test_disabled():
+    from veros.kernel_profile import PROFILE
+    PROFILE.clear()
+    outer(VerosState())
+    assert not PROFILE.root.children
@@ -3,7 +3,7 @@ import pytest
 import numpy as np
 
 from veros import VerosState
-from veros.core.streamfunction.solvers import scipy, petsc, pyamg
+from veros.core.streamfunction.solvers import scipy, petsc, pyamg, krylov, direct, multigrid
 
 
 class SolverTestState(VerosState):
@@ -50,7 +50,7 @@ def reference_solution(vs, rhs, sol, boundary_val=None):
 
 
 @pytest.mark.parametrize('cyclic', [True, False])
-@pytest.mark.parametrize('solver_class', [scipy.SciPySolver, petsc.PETScSolver, pyamg.PyAMGSolver])
+@pytest.mark.parametrize('solver_class', [scipy.SciPySolver, petsc.PETScSolver, pyamg.PyAMGSolver, krylov.KrylovSolver, direct.DirectSolver, multigrid.MultigridSolver])
 def test_solver(solver_class, cyclic, backend):
     from veros import runtime_settings as rs
     rs.backend = backend
@@ -66,3 +66,24 @@ def test_solver(solver_class, cyclic, backend):
     # set tolerance may apply in preconditioned space,
     # so let's allow for some wiggle room
     assert np.max(np.abs(ref_sol - sol) / np.abs(ref_sol).max()) < vs.congr_epsilon * 1e4
+
+
+@pytest.mark.parametrize('cyclic', [True, False])
+@pytest.mark.parametrize('solver_class', [scipy.SciPySolver, petsc.PETScSolver, pyamg.PyAMGSolver, krylov.KrylovSolver, direct.DirectSolver, multigrid.MultigridSolver])
+def test_solver_many(solver_class, cyclic, backend):
+    from veros import runtime_settings as rs
+    rs.backend = backend
+
+    vs = SolverTestState(cyclic)
+
+    rhs = np.stack([np.ones((vs.nx + 4, vs.ny + 4)), np.zeros((vs.nx + 4, vs.ny + 4))], axis=-1)
+    sol = np.random.rand(vs.nx + 4, vs.ny + 4, 2)
+    boundary_val = np.stack([np.full((vs.nx + 4, vs.ny + 4), 10.), np.ones((vs.nx + 4, vs.ny + 4))], axis=-1)
+
+    ref_sol = np.stack([
+        reference_solution(vs, rhs[..., i], sol[..., i], boundary_val[..., i]) for i in range(2)
+    ], axis=-1)
+    solver_class(vs).solve_many(vs, rhs, sol, boundary_val)
+
+    for i in range(2):
+        assert np.max(np.abs(ref_sol[..., i] - sol[..., i]) / np.abs(ref_sol[..., i]).max()) < vs.congr_epsilon * 1e4
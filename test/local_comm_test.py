@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from veros.local_comm import launch
+
+
+def test_communication():
+    def kernel():
+        from veros import runtime_settings as rs, runtime_state as rst
+        from veros import local_comm as MPI
+
+        comm = rs.mpi_comm
+        rank, size = rst.proc_rank, rst.proc_num
+        assert size == 3
+
+        # point-to-point, posting the receive before sending
+        right, left = (rank + 1) % size, (rank - 1) % size
+        recv_buf = np.empty(4)
+        request = comm.Irecv([recv_buf, 4, MPI.DOUBLE], source=left, tag=5)
+        comm.Send([np.full(4, rank, dtype='float64'), 4, MPI.DOUBLE], dest=right, tag=5)
+        request.wait()
+        assert np.all(recv_buf == left)
+
+        comm.Sendrecv(np.full(2, rank), dest=right, sendtag=1, recvbuf=recv_buf[:2], source=left, recvtag=1)
+        assert np.all(recv_buf[:2] == left)
+
+        # persistent requests can be started repeatedly
+        send_buf = np.empty(1)
+        requests = [comm.Recv_init(recv_buf[:1], source=left, tag=2), comm.Send_init(send_buf, dest=right, tag=2)]
+        for i in range(3):
+            send_buf[0] = 10 * rank + i
+            MPI.Prequest.Startall(requests)
+            MPI.Request.Waitall(requests)
+            assert recv_buf[0] == 10 * left + i
+
+        # collectives
+        res = np.empty(2)
+        comm.Allreduce(np.array([rank, -rank], dtype='float64'), res, op=MPI.MAX)
+        assert np.array_equal(res, [2, 0])
+
+        assert comm.bcast('hello' if rank == 1 else None, root=1) == 'hello'
+        assert comm.allgather(rank) == [0, 1, 2]
+
+        arr = np.arange(5.) if rank == 0 else np.empty(5)
+        comm.Bcast(arr, root=0)
+        assert np.array_equal(arr, np.arange(5.))
+
+        counts, displs = [1, 2, 3], [0, 1, 3]
+        gathered = np.empty(6)
+        comm.Gatherv(np.full(rank + 1, rank, dtype='float64'), [gathered, (counts, displs), MPI.DOUBLE], root=0)
+        if rank == 0:
+            assert np.array_equal(gathered, [0, 1, 1, 2, 2, 2])
+
+        scattered = np.empty(rank + 1)
+        comm.Scatterv([np.arange(6.), (counts, displs), MPI.DOUBLE] if rank == 0 else None, scattered, root=0)
+        assert np.array_equal(scattered, np.arange(6.)[displs[rank]:displs[rank] + counts[rank]])
+
+        # every process sends a column of its array to the first process, in place
+        local = np.full((2, 3), rank, dtype='float64')
+        columns = np.zeros((2, 4)) if rank == 0 else np.empty(0)
+        send_types = [MPI.DOUBLE.Create_subarray((2, 3), (2, 1), (0, rank)).Commit()] + [MPI.DOUBLE] * 2
+        recv_types = [MPI.DOUBLE.Create_subarray((2, 4), (2, 1), (0, other + 1)).Commit() for other in range(3)]
+        recv_counts = [1, 1, 1] if rank == 0 else [0, 0, 0]
+        comm.Alltoallw(
+            [local, ([1, 0, 0], [0, 0, 0]), send_types],
+            [columns, (recv_counts, [0, 0, 0]), recv_types if rank == 0 else [MPI.DOUBLE] * 3]
+        )
+        if rank == 0:
+            assert np.array_equal(columns, [[0, 0, 1, 2], [0, 0, 1, 2]])
+
+        comm.barrier()
+
+    launch(kernel, 3)
+
+
+def test_failure():
+    def kernel():
+        from veros import runtime_settings as rs, runtime_state as rst
+
+        if rst.proc_rank == 1:
+            raise ValueError('failure on one process')
+
+        # wait for a message that never arrives
+        rs.mpi_comm.recv(source=1)
+
+    with pytest.raises(RuntimeError, match='veros-1'):
+        launch(kernel, 2)
+
+
+def test_acc(tmpdir):
+    def run_acc(num_proc, outfile):
+        from veros import runtime_settings as rs, runtime_state as rst
+        from veros.distributed import gather
+        from veros.setup.acc import ACCSetup
+
+        rs.linear_solver = 'scipy'
+        rs.num_proc = num_proc
+
+        sim = ACCSetup(override=dict(
+            diskless_mode=True,
+            runlen=86400 * 10,
+        ))
+        sim.setup()
+        sim.run()
+
+        psi_global = gather(sim.state, sim.state.psi, ('xt', 'yt', None))
+        if rst.proc_rank == 0:
+            np.save(outfile, psi_global)
+
+    serial_file, dist_file = str(tmpdir / 'serial.npy'), str(tmpdir / 'dist.npy')
+    launch(run_acc, 1, args=((1, 1), serial_file))
+    launch(run_acc, 4, args=((2, 2), dist_file))
+
+    psi, other_psi = np.load(serial_file), np.load(dist_file)
+    scale = max(np.abs(psi).max(), np.abs(other_psi).max())
+    np.testing.assert_allclose(psi / scale, other_psi / scale, rtol=0, atol=1e-5)
@@ -0,0 +1,86 @@
+import sys
+
+import pytest
+
+from veros import VerosState, veros_method, runtime_settings as rs
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 9), reason='requires Python >= 3.9')
+
+MB = 1024 ** 2
+
+
+@pytest.fixture
+def profile():
+    from veros.memory_profile import PROFILE
+    backend = rs.backend
+    rs.backend = 'numpy'
+    rs.profile_memory = True
+    PROFILE.clear()
+    yield PROFILE
+    rs.profile_memory = False
+    rs.backend = backend
+    PROFILE.stop()
+    PROFILE.clear()
+
+
+@veros_method
+def allocate_temporary(vs, size):
+    tmp = np.ones(size * MB // 8)
+    return float(tmp.sum())
+
+
+@veros_method
+def allocate_persistent(vs):
+    vs.persistent = np.ones(4 * MB // 8)
+
+
+@veros_method
+def outer(vs):
+    small = np.ones(MB // 8)
+    allocate_temporary(vs, 8)
+    allocate_persistent(vs)
+    allocate_temporary(vs, 2)
+    return float(small.sum())
+
+
+def test_peak_attribution(profile):
+    vs = VerosState()
+    outer(vs)
+
+    kernels = profile.kernels
+    temporary = kernels['{}:allocate_temporary'.format(__name__)]
+    persistent = kernels['{}:allocate_persistent'.format(__name__)]
+    outer_kernel = kernels['{}:outer'.format(__name__)]
+
+    assert temporary.calls == 2
+    assert 8 * MB <= temporary.peak < 9 * MB
+    assert temporary.self_peak == temporary.peak
+
+    assert 4 * MB <= persistent.peak < 5 * MB
+
+    # 1 MB own temporary + 8 MB from callee
+    assert 9 * MB <= outer_kernel.peak < 10 * MB
+    # 1 MB own temporary + 4 MB kept by callee
+    assert 5 * MB <= outer_kernel.self_peak < 6 * MB
+
+    assert profile.peak_location == (
+        '{}:outer'.format(__name__), '{}:allocate_temporary'.format(__name__)
+    )
+
+    summary = profile.get_summary().splitlines()
+    assert summary[2].startswith('{}:outer'.format(__name__))
+    assert summary[3].startswith('{}:allocate_temporary'.format(__name__))
+
+
+def test_exception(profile):
+    @veros_method
+    def raise_error(vs):
+        allocate_temporary(vs, 1)
+        raise RuntimeError()
+
+    vs = VerosState()
+    with pytest.raises(RuntimeError):
+        raise_error(vs)
+
+    assert not profile._stack.frames
+    assert profile.kernels['{}:allocate_temporary'.format(__name__)].calls == 1
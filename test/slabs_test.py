@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+
+from veros import runtime_settings as rs
+
+
+@pytest.fixture(scope='module')
+def acc_state():
+    from veros.setup.acc import ACCSetup
+
+    rs.backend = 'numpy'
+    sim = ACCSetup(override=dict(
+        diskless_mode=True,
+        enable_conserve_energy=True,
+        enable_noslip_lateral=True,
+        K_hbi=1e11,
+    ))
+    sim.setup()
+
+    vs = sim.state
+    np.random.seed(17)
+    for var in ('temp', 'salt', 'u', 'v', 'w', 'K_iso', 'int_drhodT', 'int_drhodS'):
+        arr = getattr(vs, var)
+        arr[...] += 1e-2 * np.random.randn(*arr.shape)
+    return vs
+
+
+def _run_kernel(vs, kernel, outputs, backend):
+    rs.backend = backend
+
+    initial = {var: getattr(vs, var).copy() for var in vs.variables if hasattr(vs, var)}
+    try:
+        kernel(vs)
+        return {var: getattr(vs, var).copy() for var in outputs}
+    finally:
+        for var, arr in initial.items():
+            getattr(vs, var)[...] = arr
+        rs.backend = 'numpy'
+
+
+def _superbee(vs):
+    from veros.core import advection
+    advection.adv_flux_superbee(vs, vs.flux_east, vs.flux_north, vs.flux_top, vs.temp[..., vs.tau])
+
+
+def _superbee_wgrid(vs):
+    from veros.core import advection
+    advection.adv_flux_superbee_wgrid(vs, vs.flux_east, vs.flux_north, vs.flux_top, vs.temp[..., vs.tau])
+
+
+def _harmonic_friction(vs):
+    from veros.core import friction
+    friction.harmonic_friction(vs)
+
+
+def _biharmonic_mixing(vs):
+    from veros.core import diffusion
+    diffusion.tempsalt_biharmonic(vs)
+
+
+def _isoneutral(vs):
+    from veros.core import isoneutral
+    isoneutral.isoneutral_diffusion_pre(vs)
+
+
+@pytest.mark.parametrize('kernel, outputs', [
+    (_superbee, ('flux_east', 'flux_north', 'flux_top')),
+    (_superbee_wgrid, ('flux_east', 'flux_north', 'flux_top')),
+    (_harmonic_friction, ('flux_east', 'flux_north', 'du_mix', 'dv_mix', 'K_diss_h')),
+    (_biharmonic_mixing, ('flux_east', 'flux_north', 'dtemp_hmix', 'dsalt_hmix', 'temp', 'salt', 'P_diss_hmix')),
+    (_isoneutral, ('Ai_ez', 'Ai_nz', 'Ai_bx', 'Ai_by', 'K_11', 'K_22', 'K_33')),
+])
+def test_slab_kernels(acc_state, kernel, outputs, monkeypatch):
+    from veros import slabs
+
+    # force many narrow slabs
+    monkeypatch.setattr(slabs, 'MIN_SLAB_WIDTH', 2)
+    monkeypatch.setattr(slabs, 'MIN_SLAB_SIZE', 1)
+    monkeypatch.setattr(rs, 'num_threads', 5)
+
+    reference = _run_kernel(acc_state, kernel, outputs, 'numpy')
+    result = _run_kernel(acc_state, kernel, outputs, 'numpy-threaded')
+
+    for var in outputs:
+        np.testing.assert_array_equal(reference[var], result[var], err_msg=var)
+
+
+def test_slab_bounds():
+    from veros.slabs import get_slab_bounds
+
+    bounds = get_slab_bounds(34, 4, 2)
+    assert [owned for owned, _ in bounds] == [slice(0, 8), slice(8, 17), slice(17, 25), slice(25, 34)]
+    assert [with_halo for _, with_halo in bounds] == [slice(0, 10), slice(6, 19), slice(15, 27), slice(23, 34)]
+
+
+def test_slab_helper_globals(acc_state, monkeypatch):
+    import importlib
+    from veros import slabs
+    get_rho = importlib.import_module('veros.core.density.get_rho')
+
+    monkeypatch.setattr(slabs, 'MIN_SLAB_WIDTH', 2)
+    monkeypatch.setattr(slabs, 'MIN_SLAB_SIZE', 1)
+    monkeypatch.setattr(rs, 'num_threads', 5)
+
+    # veros methods called from slabs must not leave the backend in their module
+    _run_kernel(acc_state, _isoneutral, (), 'numpy-threaded')
+    assert 'np' not in vars(get_rho)
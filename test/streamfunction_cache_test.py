@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+from veros import runtime_settings as rs, veros_method
+from veros.setup.acc import ACCSetup
+
+
+def _setup_acc(cache_dir, setup_class=ACCSetup):
+    sim = setup_class(override=dict(
+        diskless_mode=True,
+        setup_cache_dir=cache_dir,
+    ))
+    sim.setup()
+    return sim.state
+
+
+def test_streamfunction_cache(tmpdir, monkeypatch, backend):
+    from veros.core.streamfunction.solvers.scipy import SciPySolver
+
+    rs.backend = backend
+    rs.linear_solver = 'scipy'
+    cache_dir = str(tmpdir)
+
+    try:
+        vs = _setup_acc(cache_dir)
+        cached_files = sorted(os.listdir(cache_dir))
+        assert [f.split('_')[0] for f in cached_files] == ['island', 'poisson']
+
+        # second setup must not assemble the matrix or solve for island streamfunctions
+        def fail(*args, **kwargs):
+            raise AssertionError('setup was not read from cache')
+
+        with monkeypatch.context() as m:
+            m.setattr(SciPySolver, '_assemble_poisson_matrix', fail)
+            m.setattr(SciPySolver, 'solve', fail)
+            cached_vs = _setup_acc(cache_dir)
+
+        assert sorted(os.listdir(cache_dir)) == cached_files
+        np.testing.assert_array_equal(vs.psin, cached_vs.psin)
+        np.testing.assert_array_equal(vs.line_psin, cached_vs.line_psin)
+        np.testing.assert_array_equal(
+            vs.linear_solver._matrix.toarray(), cached_vs.linear_solver._matrix.toarray()
+        )
+
+        # different topography leads to new entries
+        class ShallowACCSetup(ACCSetup):
+            @veros_method
+            def set_topography(self, vs):
+                super().set_topography(vs)
+                vs.kbot[...] = np.where(vs.kbot > 0, np.maximum(vs.kbot, 5), 0)
+
+        _setup_acc(cache_dir, ShallowACCSetup)
+        assert len(os.listdir(cache_dir)) == 2 * len(cached_files)
+    finally:
+        rs.linear_solver = 'best'
+
+
+def test_streamfunction_cache_distributed(tmpdir):
+    from veros.local_comm import launch
+
+    def run_acc(outfile):
+        from veros import runtime_settings as rs, runtime_state as rst
+        from veros.distributed import gather
+
+        rs.linear_solver = 'scipy'
+        rs.num_proc = (2, 1)
+
+        # the cache is only visible to the first process (e.g. on node-local storage)
+        vs = _setup_acc(str(tmpdir / 'cache-{}'.format(rst.proc_rank)))
+
+        psin = gather(vs, vs.psin, ('xu', 'yu', 'isle'))
+        if rst.proc_rank == 0:
+            np.save(outfile, psin)
+
+    launch(run_acc, 2, args=(str(tmpdir / 'psin.npy'),))
+    assert not os.path.exists(str(tmpdir / 'cache-1'))
+    cached_files = sorted(os.listdir(str(tmpdir / 'cache-0')))
+    assert cached_files
+
+    # all processes must agree that the cache is hit
+    launch(run_acc, 2, args=(str(tmpdir / 'cached_psin.npy'),))
+    assert sorted(os.listdir(str(tmpdir / 'cache-0'))) == cached_files
+    assert not os.path.exists(str(tmpdir / 'cache-1'))
+
+    np.testing.assert_array_equal(np.load(str(tmpdir / 'psin.npy')), np.load(str(tmpdir / 'cached_psin.npy')))
@@ -0,0 +1,80 @@
+import pytest
+
+from veros import VerosState, veros_method, runtime_settings as rs
+
+
+@veros_method
+def kernel(vs):
+    pass
+
+
+@pytest.fixture
+def flush_counter(monkeypatch):
+    """Makes every backend look lazy, and counts how often it is flushed"""
+    from veros import backend
+
+    flushes = []
+    monkeypatch.setattr(backend, 'get_flush', lambda backend_name: lambda: flushes.append(backend_name))
+    yield flushes
+    rs.sync_policy = 'call'
+
+
+@pytest.mark.parametrize('sync_policy, flushed_levels', [
+    ('call', ('call', 'stage', 'timestep')),
+    ('stage', ('stage', 'timestep')),
+    ('timestep', ('timestep',)),
+])
+def test_sync_policy(flush_counter, sync_policy, flushed_levels):
+    from veros.timer import Timer
+
+    # settings are applied on the next call of each veros_method
+    rs.sync_policy = sync_policy
+
+    kernel(VerosState())
+    assert len(flush_counter) == ('call' in flushed_levels)
+
+    for level in ('stage', 'timestep'):
+        del flush_counter[:]
+        timer = Timer(level, sync_level=level)
+        with timer:
+            pass
+        assert timer.synchronized == (level in flushed_levels)
+        assert len(flush_counter) == (level in flushed_levels)
+
+
+@pytest.mark.parametrize('sync_policy', ['call', 'timestep'])
+def test_timing_summary(flush_counter, sync_policy):
+    from loguru import logger
+    from veros.timer import Timer
+    from veros.veros import VerosSetup
+
+    rs.sync_policy = sync_policy
+
+    vs = VerosState()
+    vs.timers = {k: Timer(k, sync_level='timestep') for k in ('setup', 'main', 'diagnostics')}
+    vs.timers.update({k: Timer(k, sync_level='stage') for k in (
+        'momentum', 'temperature', 'eke', 'idemix', 'tke', 'pressure',
+        'friction', 'isoneutral', 'vmix', 'eq_of_state'
+    )})
+    for timer in vs.timers.values():
+        with timer:
+            pass
+
+    messages = []
+    handler = logger.add(messages.append, level='DEBUG', format='{message}')
+    try:
+        VerosSetup._log_timing_summary(vs)
+    finally:
+        logger.remove(handler)
+
+    summary = ''.join(messages).splitlines()
+    momentum_line, = [line for line in summary if line.strip().startswith('momentum')]
+    main_line, = [line for line in summary if line.strip().startswith('main loop time')]
+    assert not main_line.endswith('(*)')
+
+    if sync_policy == 'timestep':
+        assert momentum_line.endswith('(*)')
+        assert summary[-1].startswith('(*) not synchronized under sync policy "timestep"')
+    else:
+        assert not momentum_line.endswith('(*)')
+        assert not any(line.startswith('(*)') for line in summary)
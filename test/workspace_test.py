@@ -0,0 +1,96 @@
+import pytest
+
+from veros import VerosState, veros_method, runtime_settings as rs
+from veros.variables import allocate, allocate_like
+
+
+@pytest.fixture
+def pool(backend):
+    from veros.workspace import POOL
+    rs.backend = backend
+    POOL.clear()
+    POOL.clear_stats()
+    yield POOL
+    POOL.clear()
+    POOL.clear_stats()
+
+
+@pytest.fixture
+def vs():
+    state = VerosState()
+    state.nx, state.ny, state.nz = 8, 6, 4
+    return state
+
+
+@veros_method(workspace=True)
+def get_temporaries(vs):
+    a = allocate(vs, ('xt', 'yt', 'zt'), fill=1)
+    b = allocate_like(vs, a)
+    return id(a), id(b), float(a.sum()), float(b.sum())
+
+
+@veros_method(workspace=True)
+def return_temporary(vs):
+    return allocate(vs, ('xt', 'yt'))
+
+
+@veros_method
+def allocate_plain(vs):
+    return allocate(vs, ('xt', 'yt'))
+
+
+@veros_method(workspace=True)
+def call_nested(vs):
+    return allocate_plain(vs)
+
+
+@veros_method(workspace=True)
+def raise_error(vs):
+    allocate(vs, ('xt', 'yt'))
+    raise RuntimeError()
+
+
+def test_reuse(pool, vs):
+    if rs.backend == 'bohrium':
+        pytest.skip('workspace is disabled for lazy backends')
+
+    ids_1 = get_temporaries(vs)
+    ids_2 = get_temporaries(vs)
+    assert ids_1 == ids_2
+    # temporaries are always re-initialized
+    assert ids_2[2:] == (12 * 10 * 4, 0)
+
+    assert pool.hits == 2 and pool.misses == 2
+    assert pool.hit_rate == 0.5
+    assert pool.peak_bytes == 2 * 12 * 10 * 4 * 8
+    assert pool.bytes_in_use == 0
+
+
+def test_escaping_arrays(pool, vs):
+    a = return_temporary(vs)
+    b = return_temporary(vs)
+    assert a is not b
+    assert pool.hits == 0
+    assert pool.bytes_in_use == 0
+
+
+def test_nested_scope(pool, vs):
+    a = call_nested(vs)
+    b = call_nested(vs)
+    assert a is not b
+    assert pool.hits + pool.misses == 0
+
+
+def test_exception(pool, vs):
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            raise_error(vs)
+
+    if rs.backend != 'bohrium':
+        assert pool.hits == 1
+    assert pool.bytes_in_use == 0
+
+
+def test_inline_workspace():
+    with pytest.raises(ValueError):
+        veros_method(inline=True, workspace=True)
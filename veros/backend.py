@@ -2,6 +2,9 @@ from loguru import logger
 
 BACKENDS = None
 
+# points at which lazy backends may be synchronized, from finest to coarsest
+SYNC_LEVELS = ('call', 'stage', 'timestep')
+
 
 def init_environment():
     import os
@@ -29,14 +32,22 @@ def init_backends():
         numpy = numpy_force
 
     BACKENDS['numpy'] = numpy
+    # same module, but selected kernels are executed in parallel on slabs (see veros.slabs)
+    BACKENDS['numpy-threaded'] = numpy
+    # same module, but selected kernels are replaced by compiled versions (see veros.jit)
+    BACKENDS['numba'] = numpy
+
+    # importing Bohrium is expensive, so it is only imported when requested
+    BACKENDS['bohrium'] = _import_bohrium
 
+
+def _import_bohrium():
     try:
         import bohrium
     except ImportError:
         logger.warning('Could not import Bohrium (Bohrium backend will be unavailable)')
-        BACKENDS['bohrium'] = None
-    else:
-        BACKENDS['bohrium'] = bohrium
+        return None
+    return bohrium
 
 
 def get_backend(backend_name):
@@ -47,6 +58,10 @@ def get_backend(backend_name):
         raise ValueError('unrecognized backend {} (must be either of: {!r})'
                          .format(backend_name, list(BACKENDS.keys())))
 
+    if callable(BACKENDS[backend_name]):
+        # backend is not imported yet
+        BACKENDS[backend_name] = BACKENDS[backend_name]()
+
     if BACKENDS[backend_name] is None:
         raise ValueError('backend "{}" failed to import'.format(backend_name))
 
@@ -73,14 +88,41 @@ def get_vector_engine(np):
     return None
 
 
+def get_flush(backend_name):
+    """Returns the function that synchronizes the given backend, or None if
+    the backend executes eagerly."""
+    if backend_name in ('numpy', 'numpy-threaded', 'numba'):
+        return None
+
+    elif backend_name == 'bohrium':
+        return get_backend(backend_name).flush
+
+    raise RuntimeError('Unrecognized backend %s' % backend_name)
+
+
 def flush():
     from . import runtime_settings as rs
 
-    if rs.backend == 'numpy':
-        pass
+    flush_func = get_flush(rs.backend)
+
+    if flush_func is not None:
+        flush_func()
+
+
+def is_sync_point(level):
+    """Whether the backend is synchronized at the given level (one of ``SYNC_LEVELS``)
+    under the current sync policy."""
+    from . import runtime_settings as rs
+    return SYNC_LEVELS.index(level) >= SYNC_LEVELS.index(rs.sync_policy)
+
+
+def synchronize(level):
+    """Flushes the backend if the current sync policy demands synchronization at ``level``.
+    Returns whether all computations have finished (always true for eager backends)."""
+    from . import runtime_settings as rs
 
-    elif rs.backend == 'bohrium':
-        get_backend(rs.backend).flush()
+    if is_sync_point(level):
+        flush()
+        return True
 
-    else:
-        raise RuntimeError('Unrecognized backend %s' % rs.backend)
+    return get_flush(rs.backend) is None
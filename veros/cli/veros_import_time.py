@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import sys
+import subprocess
+import collections
+import functools
+
+import click
+
+DEFAULT_MODULES = ('veros', 'veros.veros', 'veros.setup.acc')
+
+
+def measure_import_time(module, python=sys.executable):
+    """Imports ``module`` in a fresh interpreter and returns the total import time and
+    the time spent in every top-level package (in seconds)"""
+    proc = subprocess.run(
+        [python, '-X', 'importtime', '-c', 'import {}'.format(module)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError('Importing {} failed:\n{}'.format(module, proc.stderr))
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_time, cumulative_time, name = line[len('import time:'):].split('|')
+        depth = len(name) - len(name.lstrip())
+        entries.append((int(self_time), int(cumulative_time), depth, name.strip()))
+
+    total_time = 0.
+    package_times = collections.Counter()
+
+    # children are reported before their parent, with deeper indentation
+    for i in reversed(range(len(entries))):
+        self_time, cumulative_time, depth, name = entries[i]
+        if name != module:
+            continue
+
+        total_time = cumulative_time * 1e-6
+        package_times[name.split('.')[0]] += self_time * 1e-6
+        for child_self_time, _, child_depth, child_name in reversed(entries[:i]):
+            if child_depth <= depth:
+                break
+            package_times[child_name.split('.')[0]] += child_self_time * 1e-6
+        break
+
+    return total_time, package_times
+
+
+def import_time(modules=(), num_packages=10, python=sys.executable):
+    """Report import time of Veros modules, broken down by top-level package
+
+    Every module is imported in a fresh interpreter (default: veros, veros.veros,
+    veros.setup.acc).
+    """
+    if not modules:
+        modules = DEFAULT_MODULES
+
+    for module in modules:
+        total_time, package_times = measure_import_time(module, python=python)
+        click.echo('import {:<36} {:>8.1f}ms'.format(module, total_time * 1e3))
+        for package, package_time in package_times.most_common(num_packages):
+            click.echo('    {:<40} {:>8.1f}ms'.format(package, package_time * 1e3))
+
+
+@click.command('veros-import-time')
+@click.argument('modules', nargs=-1, metavar='[MODULE]...')
+@click.option('-n', '--num-packages', type=click.INT, default=10,
+              help='Number of top-level packages to show per module (default: 10)')
+@click.option('--python', default=sys.executable,
+              help='Python interpreter to use (default: current interpreter)')
+@functools.wraps(import_time)
+def cli(*args, **kwargs):
+    import_time(*args, **kwargs)
+
+
+if __name__ == '__main__':
+    cli()
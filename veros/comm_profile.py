@@ -0,0 +1,224 @@
+"""Accounting of MPI communication.
+
+If the runtime setting ``profile_comm`` is enabled, all communication routines in
+:mod:`veros.distributed` record the number of messages and bytes they send, the total
+time they take, and the time they spend blocked in MPI calls (waiting for other
+ranks). Records are kept per operation and call site, i.e., the first function
+outside of :mod:`veros.distributed` (calls through
+:func:`veros.core.utilities.enforce_boundaries` and its variants are attributed to
+their caller), or the site given through :meth:`CommProfile.call_site` (used for the
+gathers and scatters around kernels that are not distributed-safe).
+
+At the end of a run, the records of all ranks are gathered on rank 0 and summarized
+in a report.
+"""
+
+import os
+import sys
+import contextlib
+import functools
+import timeit
+
+from loguru import logger
+
+_SKIPPED_FILES = tuple(
+    os.path.join(os.path.dirname(__file__), f) for f in ('distributed.py', 'decorators.py', 'comm_profile.py')
+)
+_UTILITIES_FILE = os.path.join(os.path.dirname(__file__), 'core', 'utilities.py')
+_BOUNDARY_FUNCTIONS = (
+    'enforce_boundaries', 'enforce_boundaries_many', 'start_enforce_boundaries', 'finish_enforce_boundaries'
+)
+
+
+class CommRecord:
+    __slots__ = ('calls', 'messages', 'bytes', 'time', 'wait_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.messages = 0
+        self.bytes = 0
+        self.time = 0.
+        self.wait_time = 0.
+
+    def as_tuple(self):
+        return (self.calls, self.messages, self.bytes, self.time, self.wait_time)
+
+
+def get_call_site(frame):
+    """Name of the first function up the stack from ``frame`` that does not belong to the
+    communication layer"""
+    via = ''
+    while frame is not None:
+        filename = frame.f_code.co_filename
+
+        if filename == _UTILITIES_FILE and frame.f_code.co_name in _BOUNDARY_FUNCTIONS:
+            via = ' ({})'.format(frame.f_code.co_name)
+
+        elif filename not in _SKIPPED_FILES:
+            return '{}:{}:{}{}'.format(
+                frame.f_globals.get('__name__', filename), frame.f_code.co_name, frame.f_lineno, via
+            )
+
+        frame = frame.f_back
+
+    return '<unknown>'
+
+
+class _Waiting:
+    def __init__(self, profile):
+        self.profile = profile
+
+    def __enter__(self):
+        self.start = timeit.default_timer()
+
+    def __exit__(self, *args):
+        record = self.profile.current
+        if record is not None:
+            record.wait_time += timeit.default_timer() - self.start
+
+
+class _NotWaiting:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+class CommProfile:
+    def __init__(self):
+        self._waiting = _Waiting(self)
+        self._not_waiting = _NotWaiting()
+        self.clear()
+
+    def clear(self):
+        self.records = {}
+        self.current = None
+        self.site = None
+
+    def record(self, op):
+        """Decorator for communication routines; ``op`` is the name of the operation"""
+        def decorator(function):
+            @functools.wraps(function)
+            def profiled_wrapper(*args, **kwargs):
+                from . import runtime_settings as rs
+
+                # nested communication is accounted to the outermost operation
+                if not rs.profile_comm or self.current is not None:
+                    return function(*args, **kwargs)
+
+                key = (op, self.site or get_call_site(sys._getframe(1)))
+                record = self.records.get(key)
+                if record is None:
+                    record = self.records[key] = CommRecord()
+
+                self.current = record
+                start = timeit.default_timer()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    record.time += timeit.default_timer() - start
+                    record.calls += 1
+                    self.current = None
+
+            return profiled_wrapper
+        return decorator
+
+    @contextlib.contextmanager
+    def call_site(self, site):
+        """Attributes all communication within the context to ``site``"""
+        outer_site, self.site = self.site, site
+        try:
+            yield
+        finally:
+            self.site = outer_site
+
+    def add_message(self, nbytes):
+        record = self.current
+        if record is not None:
+            record.messages += 1
+            record.bytes += nbytes
+
+    def waiting(self):
+        """Context manager around blocking MPI calls"""
+        if self.current is None:
+            return self._not_waiting
+        return self._waiting
+
+    def get_report(self, total_time):
+        """Gathers the records of all ranks and formats them (only on rank 0).
+        ``total_time`` is the wall time the profiled code ran for."""
+        from . import runtime_settings as rs, runtime_state as rst
+
+        local_records = {key: record.as_tuple() for key, record in self.records.items()}
+        if rst.proc_num > 1:
+            all_records = rs.mpi_comm.gather((local_records, total_time), root=0)
+        else:
+            all_records = [(local_records, total_time)]
+
+        if rst.proc_rank != 0:
+            return None
+
+        return format_report(all_records)
+
+
+def format_report(all_records, num_sites=20, num_ranks=5):
+    """Report of records from all ranks, given as list of ``(records, total_time)``"""
+    num_procs = len(all_records)
+
+    sites = {}
+    rank_stats = []
+    for rank, (records, total_time) in enumerate(all_records):
+        comm_time = wait_time = 0.
+        for key, (calls, messages, nbytes, time, wait) in records.items():
+            site = sites.setdefault(key, [0, 0, 0, 0., 0., 0.])
+            site[0] += calls
+            site[1] += messages
+            site[2] += nbytes
+            site[3] += time
+            site[4] += wait
+            site[5] = max(site[5], wait)
+            comm_time += time
+            wait_time += wait
+        rank_stats.append((rank, comm_time, wait_time, total_time))
+
+    total_comm = sum(s[1] for s in rank_stats)
+    total_wait = sum(s[2] for s in rank_stats)
+    total_time = sum(s[3] for s in rank_stats) or 1.
+
+    lines = [
+        'Communication: {:.1%} of wall time ({:.1%} waiting), {:.1%} compute '
+        '(mean over {} ranks)'.format(
+            total_comm / total_time, total_wait / total_time,
+            1 - total_comm / total_time, num_procs
+        ),
+        '',
+        '{:<10} {:<70} {:>8} {:>9} {:>10} {:>9} {:>9} {:>9}'.format(
+            'operation', 'call site', 'calls', 'messages', 'MB', 'time [s]', 'wait [s]', 'max wait'
+        )
+    ]
+
+    sites = sorted(sites.items(), key=lambda item: item[1][3], reverse=True)
+    for (op, site), (calls, messages, nbytes, time, wait, max_wait) in sites[:num_sites]:
+        # times are mean over ranks, counts are total
+        lines.append('{:<10} {:<70} {:>8d} {:>9d} {:>10.2f} {:>9.3f} {:>9.3f} {:>9.3f}'.format(
+            op, site, calls, messages, nbytes / 1024 ** 2,
+            time / num_procs, wait / num_procs, max_wait
+        ))
+
+    lines.extend(['', 'Ranks with longest wait time:'])
+    for rank, comm_time, wait_time, rank_time in sorted(rank_stats, key=lambda s: s[2], reverse=True)[:num_ranks]:
+        lines.append('  rank {:>5d}: {:.3f}s waiting, {:.3f}s communicating ({:.1%} of wall time)'.format(
+            rank, wait_time, comm_time, comm_time / (rank_time or 1.)
+        ))
+
+    return '\n'.join(lines)
+
+
+def log_report(total_time):
+    report = PROFILE.get_report(total_time)
+    if report is not None:
+        logger.info('Communication profile:\n{}', report)
+
+
+PROFILE = CommProfile()
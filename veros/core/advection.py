@@ -1,4 +1,4 @@
-from .. import veros_method
+from .. import veros_method, jit
 from ..variables import allocate
 from .utilities import pad_z_edges, where
 
@@ -12,6 +12,22 @@ def _calc_cr(vs, rjp, rj, rjm, vel):
     return where(vs, vel > 0., rjm, rjp) / where(vs, np.abs(rj) < eps, eps, rj)
 
 
+@jit.ufunc
+def _superbee_flux_kernel(vel, var_m1, var_0, var_p1, var_p2, mask_m1, mask_0, mask_p1, dx, velfac, dt):
+    """
+    Element-wise version of the superbee flux (same operations as the NumPy version
+    of _adv_superbee, but without temporary arrays)
+    """
+    eps = 1e-20
+    uCFL = abs(velfac * vel * dt / dx)
+    rjp = (var_p2 - var_p1) * mask_p1
+    rj = (var_p1 - var_0) * mask_0
+    rjm = (var_0 - var_m1) * mask_m1
+    cr = (rjm if vel > 0. else rjp) / (eps if abs(rj) < eps else rj)
+    cr = max(0., max(min(1., 2 * cr), min(2., cr)))
+    return velfac * vel * (var_p1 + var_0) * 0.5 - abs(velfac * vel) * ((1. - cr) + uCFL * cr) * rj * 0.5
+
+
 @veros_method
 def _adv_superbee(vs, vel, var, mask, dx, axis):
     def limiter(cr):
@@ -33,6 +49,9 @@ def _adv_superbee(vs, vel, var, mask, dx, axis):
         dx = dx[np.newaxis, np.newaxis, :-1]
     else:
         raise ValueError('axis must be 0, 1, or 2')
+    if jit.is_enabled():
+        return _superbee_flux_kernel(vel[s], var[sm1], var[s], var[sp1], var[sp2],
+                                     mask[sm1], mask[s], mask[sp1], dx, velfac, vs.dt_tracer)
     uCFL = np.abs(velfac * vel[s] * vs.dt_tracer / dx)
     rjp = (var[sp2] - var[sp1]) * mask[sp1]
     rj = (var[sp1] - var[s]) * mask[s]
@@ -55,7 +74,7 @@ def adv_flux_2nd(vs, adv_fe, adv_fn, adv_ft, var):
     adv_ft[:, :, -1] = 0.
 
 
-@veros_method
+@veros_method(slab_outputs=['adv_fe', 'adv_fn', 'adv_ft'])
 def adv_flux_superbee(vs, adv_fe, adv_fn, adv_ft, var):
     r"""
     from MITgcm
@@ -126,7 +145,7 @@ def calculate_velocity_on_wgrid(vs):
                                           / (vs.cost[np.newaxis, 1:, np.newaxis] * vs.dyt[np.newaxis, 1:, np.newaxis])), axis=2)
 
 
-@veros_method
+@veros_method(slab_outputs=['adv_fe', 'adv_fn', 'adv_ft'])
 def adv_flux_superbee_wgrid(vs, adv_fe, adv_fn, adv_ft, var):
     """
     Calculates advection of a tracer defined on Wgrid
@@ -1,4 +1,4 @@
-from ... import veros_method
+from ... import veros_method, jit
 
 """
 ==========================================================================
@@ -70,6 +70,11 @@ def gsw_rho(vs, sa, ct, p):
     """
     # convert scalar values if necessary
     sa, ct, p = np.asarray(sa), np.asarray(ct), np.asarray(p)
+    return _gsw_rho(sa, ct, p)
+
+
+@jit.elementwise
+def _gsw_rho(sa, ct, p):
     sqrtsa = np.sqrt(sa)
     v_hat_denominator = v01 + ct * (v02 + ct * (v03 + v04 * ct)) \
         + sa * (v05 + ct * (v06 + v07 * ct)
@@ -95,6 +100,11 @@ def gsw_drhodT(vs, sa, ct, p):
     ==========================================================================
     """
     p = np.asarray(p)  # convert scalar value if necessary
+    return _gsw_drhodT(sa, ct, p)
+
+
+@jit.elementwise
+def _gsw_drhodT(sa, ct, p):
     a01 = 2.839940833161907e0
     a02 = -6.295518531177023e-2
     a03 = 3.545416635222918e-3
@@ -161,6 +171,11 @@ def gsw_drhodS(vs, sa, ct, p):
     ==========================================================================
     """
     p = np.asarray(p)  # convert scalar value if necessary
+    return _gsw_drhodS(sa, ct, p)
+
+
+@jit.elementwise
+def _gsw_drhodS(sa, ct, p):
     b01 = -6.698001071123802e0
     b02 = -2.986498947203215e-2
     b03 = 2.327859407479162e-4
@@ -219,6 +234,11 @@ def gsw_drhodP(vs, sa, ct, p):
     ==========================================================================
     """
     p = np.asarray(p)  # convert scalar value if necessary
+    return _gsw_drhodP(sa, ct, p)
+
+
+@jit.elementwise
+def _gsw_drhodP(sa, ct, p):
     c01 = -2.233269627352527e-2
     c02 = -3.436090079851880e-4
     c03 = 3.726050720345733e-6
@@ -280,6 +300,11 @@ def gsw_dyn_enthalpy(vs, sa, ct, p):
     ==========================================================================
     """
     p = np.asarray(p)  # convert scalar value if necessary
+    return _gsw_dyn_enthalpy(sa, ct, p)
+
+
+@jit.elementwise
+def _gsw_dyn_enthalpy(sa, ct, p):
     db2pa = 1e4                             # factor to convert from dbar to Pa
     sqrtsa = np.sqrt(sa)
     a0 = v21 + ct * (v22 + ct * (v23 + ct * (v24 + v25 * ct))) \
@@ -344,6 +369,11 @@ def gsw_dHdT(vs, sa_in, ct_in, p):
     p      : sea pressure                                    [dbar]
     """
     p = np.asarray(p)  # convert scalar value if necessary
+    return _gsw_dHdT(sa_in, ct_in, p)
+
+
+@jit.elementwise
+def _gsw_dHdT(sa_in, ct_in, p):
     sa = np.maximum(1e-1, sa_in)  # prevent division by zero
     ct = np.maximum(-12, ct_in)  # prevent blowing up for values smaller than -15 degC
     t1 = v45 * ct
@@ -463,6 +493,11 @@ def gsw_dHdS(vs, sa_in, ct_in, p):
     p      : sea pressure                                    [dbar]
     """
     p = np.asarray(p)  # convert scalar value if necessary
+    return _gsw_dHdS(sa_in, ct_in, p)
+
+
+@jit.elementwise
+def _gsw_dHdS(sa_in, ct_in, p):
     sa = np.maximum(1e-1, sa_in)  # prevent division by zero
     ct = np.maximum(-12.0, ct_in)  # prevent blowing up for values smaller than -15 degC
     t1 = ct * v46
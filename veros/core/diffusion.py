@@ -44,6 +44,20 @@ def tempsalt_biharmonic(vs):
 
     fxa = math.sqrt(abs(vs.K_hbi))
 
+    _biharmonic_del2_temp(vs, del2, fxa)
+    utilities.enforce_boundaries(vs, del2)
+    _biharmonic_tendency_temp(vs, del2, fxa)
+
+    if vs.enable_conserve_energy and vs.pyom_compatibility_mode:
+        fxa = vs.int_drhodT[-3, -3, -1, vs.tau]
+
+    _biharmonic_del2_salt(vs, del2, fxa)
+    utilities.enforce_boundaries(vs, del2)
+    _biharmonic_tendency_salt(vs, del2, fxa)
+
+
+@veros_method(slab_outputs=['del2', 'flux_east', 'flux_north'])
+def _biharmonic_del2_temp(vs, del2, fxa):
     vs.flux_east[:-1, :, :] = -fxa * (vs.temp[1:, :, :, vs.tau] - vs.temp[:-1, :, :, vs.tau]) \
         / (vs.cost[np.newaxis, :, np.newaxis] * vs.dxu[:-1, np.newaxis, np.newaxis]) * vs.maskU[:-1, :, :]
     vs.flux_east[:, -1, :] = 0.
@@ -56,8 +70,9 @@ def tempsalt_biharmonic(vs):
         + (vs.flux_north[1:, 1:, :] - vs.flux_north[1:, :-1, :]) \
         / (vs.cost[np.newaxis, 1:, np.newaxis] * vs.dyt[np.newaxis, 1:, np.newaxis])
 
-    utilities.enforce_boundaries(vs, del2)
 
+@veros_method(slab_outputs=['flux_east', 'flux_north', 'dtemp_hmix', 'temp', 'P_diss_hmix'])
+def _biharmonic_tendency_temp(vs, del2, fxa):
     vs.flux_east[:-1, :, :] = fxa * (del2[1:, :, :] - del2[:-1, :, :]) \
         / (vs.cost[np.newaxis, :, np.newaxis] * vs.dxu[:-1, np.newaxis, np.newaxis]) \
         * vs.maskU[:-1, :, :]
@@ -75,11 +90,12 @@ def tempsalt_biharmonic(vs):
     vs.temp[:, :, :, vs.taup1] += vs.dt_tracer * vs.dtemp_hmix * vs.maskT
 
     if vs.enable_conserve_energy:
-        if vs.pyom_compatibility_mode:
-            fxa = vs.int_drhodT[-3, -3, -1, vs.tau]
         vs.P_diss_hmix[...] = 0.
         dissipation_on_wgrid(vs, vs.P_diss_hmix, int_drhodX=vs.int_drhodT[..., vs.tau])
 
+
+@veros_method(slab_outputs=['del2', 'flux_east', 'flux_north'])
+def _biharmonic_del2_salt(vs, del2, fxa):
     vs.flux_east[:-1, :, :] = -fxa * (vs.salt[1:, :, :, vs.tau] - vs.salt[:-1, :, :, vs.tau]) \
         / (vs.cost[np.newaxis, :, np.newaxis] * vs.dxu[:-1, np.newaxis, np.newaxis]) * vs.maskU[:-1, :, :]
     vs.flux_north[:, :-1, :] = -fxa * (vs.salt[:, 1:, :, vs.tau] - vs.salt[:, :-1, :, vs.tau]) \
@@ -93,8 +109,9 @@ def tempsalt_biharmonic(vs):
         + (vs.flux_north[1:, 1:, :] - vs.flux_north[1:, :-1, :]) \
         / (vs.cost[np.newaxis, 1:, np.newaxis] * vs.dyt[np.newaxis, 1:, np.newaxis])
 
-    utilities.enforce_boundaries(vs, del2)
 
+@veros_method(slab_outputs=['flux_east', 'flux_north', 'dsalt_hmix', 'salt', 'P_diss_hmix'])
+def _biharmonic_tendency_salt(vs, del2, fxa):
     vs.flux_east[:-1, :, :] = fxa * (del2[1:, :, :] - del2[:-1, :, :]) \
         / (vs.cost[np.newaxis, :, np.newaxis] * vs.dxu[:-1, np.newaxis, np.newaxis]) \
         * vs.maskU[:-1, :, :]
@@ -5,7 +5,7 @@ from ..variables import allocate
 from . import numerics, utilities
 
 
-@veros_method
+@veros_method(workspace=True)
 def explicit_vert_friction(vs):
     """
     explicit vertical friction
@@ -54,7 +54,7 @@ def explicit_vert_friction(vs):
     vs.K_diss_v += diss
 
 
-@veros_method
+@veros_method(workspace=True)
 def implicit_vert_friction(vs):
     """
     vertical friction
@@ -235,7 +235,7 @@ def quadratic_bottom_friction(vs):
         vs.K_diss_bot[...] += numerics.calc_diss(vs, diss, 'V')
 
 
-@veros_method
+@veros_method(slab_outputs=['flux_east', 'flux_north', 'du_mix', 'dv_mix', 'K_diss_h'])
 def harmonic_friction(vs):
     """
     horizontal harmonic friction
@@ -399,8 +399,7 @@ def biharmonic_friction(vs):
         """
         diagnose dissipation by lateral friction
         """
-        utilities.enforce_boundaries(vs, vs.flux_east)
-        utilities.enforce_boundaries(vs, vs.flux_north)
+        utilities.enforce_boundaries_many(vs, [vs.flux_east, vs.flux_north])
         diss = allocate(vs, ('xt', 'yt', 'zt'))
         diss[1:-2, 2:-2, :] = -0.5 * ((vs.u[2:-1, 2:-2, :, vs.tau] - vs.u[1:-2, 2:-2, :, vs.tau]) * vs.flux_east[1:-2, 2:-2, :]
                                     + (vs.u[1:-2, 2:-2, :, vs.tau] - vs.u[:-3, 2:-2, :, vs.tau]) * vs.flux_east[:-3, 2:-2, :]) \
@@ -459,8 +458,7 @@ def biharmonic_friction(vs):
         """
         diagnose dissipation by lateral friction
         """
-        utilities.enforce_boundaries(vs, vs.flux_east)
-        utilities.enforce_boundaries(vs, vs.flux_north)
+        utilities.enforce_boundaries_many(vs, [vs.flux_east, vs.flux_north])
         diss[2:-2, 1:-2, :] = -0.5 * ((vs.v[3:-1, 1:-2, :, vs.tau] - vs.v[2:-2, 1:-2, :, vs.tau]) * vs.flux_east[2:-2, 1:-2, :]
                                     + (vs.v[2:-2, 1:-2, :, vs.tau] - vs.v[1:-3, 1:-2, :, vs.tau]) * vs.flux_east[1:-3, 1:-2, :]) \
             / (vs.cosu[np.newaxis, 1:-2, np.newaxis] * vs.dxt[2:-2, np.newaxis, np.newaxis]) \
@@ -25,7 +25,7 @@ def set_idemix_parameter(vs):
                                  * np.abs(vs.coriolis_t[..., np.newaxis]) / cstar**2) * vs.maskW
 
 
-@veros_method
+@veros_method(workspace=True)
 def integrate_idemix(vs):
     """
     integrate idemix on W grid
@@ -5,7 +5,8 @@ from ... import veros_method
 from ...variables import allocate
 
 
-@veros_method
+@veros_method(slab_outputs=['Ai_ez', 'Ai_nz', 'Ai_bx', 'Ai_by', 'K_11', 'K_22', 'K_33'],
+              workspace=True)
 def isoneutral_diffusion_pre(vs):
     """
     Isopycnal diffusion for tracer
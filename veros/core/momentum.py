@@ -1,5 +1,4 @@
 from .. import veros_method
-from ..variables import allocate
 from . import friction, isoneutral, streamfunction
 
 
@@ -118,28 +117,30 @@ def momentum(vs):
         streamfunction.solve_streamfunction(vs)
 
 
+def _shift_west(s):
+    stop = -1 if s.stop is None else s.stop - 1
+    return slice(s.start - 1, stop)
+
+
 @veros_method
-def vertical_velocity(vs):
+def vertical_velocity(vs, columns=(slice(1, None), slice(1, None))):
     """
     vertical velocity from continuity :
     \\int_0^z w_z dz = w(z)-w(0) = - \\int dz (u_x + v_y)
     w(z) = -int dz u_x + v_y
+
+    only water columns in ``columns`` (slices in x and y, starting at 1 or later) are updated
     """
-    fxa = allocate(vs, ('xt', 'yt', 'zw'))[1:, 1:]
+    i, j = columns
+    im1, jm1 = _shift_west(i), _shift_west(j)
     # integrate from bottom to surface to see error in w
-    fxa[:, :, 0] = -vs.maskW[1:, 1:, 0] * vs.dzt[0] * \
-        ((vs.u[1:, 1:, 0, vs.taup1] - vs.u[:-1, 1:, 0, vs.taup1])
-        / (vs.cost[np.newaxis, 1:] * vs.dxt[1:, np.newaxis])
-        + (vs.cosu[np.newaxis, 1:] * vs.v[1:, 1:, 0, vs.taup1]
-            - vs.cosu[np.newaxis, :-1] * vs.v[1:, :-1, 0, vs.taup1])
-        / (vs.cost[np.newaxis, 1:] * vs.dyt[np.newaxis, 1:]))
-    fxa[:, :, 1:] = -vs.maskW[1:, 1:, 1:] * vs.dzt[np.newaxis, np.newaxis, 1:] \
-        * ((vs.u[1:, 1:, 1:, vs.taup1] - vs.u[:-1, 1:, 1:, vs.taup1])
-        / (vs.cost[np.newaxis, 1:, np.newaxis] * vs.dxt[1:, np.newaxis, np.newaxis])
-        + (vs.cosu[np.newaxis, 1:, np.newaxis] * vs.v[1:, 1:, 1:, vs.taup1]
-            - vs.cosu[np.newaxis, :-1, np.newaxis] * vs.v[1:, :-1, 1:, vs.taup1])
-        / (vs.cost[np.newaxis, 1:, np.newaxis] * vs.dyt[np.newaxis, 1:, np.newaxis]))
-    vs.w[1:, 1:, :, vs.taup1] = np.cumsum(fxa, axis=2)
+    fxa = -vs.maskW[i, j, :] * vs.dzt[np.newaxis, np.newaxis, :] \
+        * ((vs.u[i, j, :, vs.taup1] - vs.u[im1, j, :, vs.taup1])
+        / (vs.cost[np.newaxis, j, np.newaxis] * vs.dxt[i, np.newaxis, np.newaxis])
+        + (vs.cosu[np.newaxis, j, np.newaxis] * vs.v[i, j, :, vs.taup1]
+            - vs.cosu[np.newaxis, jm1, np.newaxis] * vs.v[i, jm1, :, vs.taup1])
+        / (vs.cost[np.newaxis, j, np.newaxis] * vs.dyt[np.newaxis, j, np.newaxis]))
+    vs.w[i, j, :, vs.taup1] = np.cumsum(fxa, axis=2)
 
 
 @veros_method
@@ -1,5 +1,6 @@
 from .. import veros_method, runtime_settings as rs, runtime_state as rst
 from . import density, diffusion, utilities
+from ..variables import allocate_like
 
 
 @veros_method(dist_safe=False, local_variables=(
@@ -106,15 +107,10 @@ def calc_beta(vs):
 
 
 @veros_method
-def calc_topo(vs):
-    """
-    calulate masks, total depth etc
+def close_domain(vs):
     """
-
+    set kbot to zero outside of the domain
     """
-    close domain
-    """
-
     vs.kbot[:, :2] = 0
     vs.kbot[:, -2:] = 0
     if vs.enable_cyclic_x:
@@ -123,6 +119,14 @@ def calc_topo(vs):
         vs.kbot[:2, :] = 0
         vs.kbot[-2:, :] = 0
 
+
+@veros_method
+def calc_topo(vs):
+    """
+    calulate masks, total depth etc
+    """
+    close_domain(vs)
+
     """
     Land masks
     """
@@ -166,8 +170,7 @@ def calc_initial_conditions(vs):
     if np.any(vs.salt < 0.0):
         raise RuntimeError('encountered negative salinity')
 
-    utilities.enforce_boundaries(vs, vs.temp)
-    utilities.enforce_boundaries(vs, vs.salt)
+    utilities.enforce_boundaries_many(vs, [vs.temp, vs.salt])
 
     vs.rho[...] = density.get_rho(vs, vs.salt, vs.temp, np.abs(vs.zt)[:, np.newaxis]) \
                   * vs.maskT[..., np.newaxis]
@@ -187,7 +190,7 @@ def calc_initial_conditions(vs):
 
 @veros_method(inline=True)
 def ugrid_to_tgrid(vs, a):
-    b = np.zeros_like(a)
+    b = allocate_like(vs, a)
     b[2:-2, :, :] = (vs.dxu[2:-2, np.newaxis, np.newaxis] * a[2:-2, :, :] + vs.dxu[1:-3, np.newaxis, np.newaxis] * a[1:-3, :, :]) \
         / (2 * vs.dxt[2:-2, np.newaxis, np.newaxis])
     return b
@@ -195,7 +198,7 @@ def ugrid_to_tgrid(vs, a):
 
 @veros_method(inline=True)
 def vgrid_to_tgrid(vs, a):
-    b = np.zeros_like(a)
+    b = allocate_like(vs, a)
     b[:, 2:-2, :] = (vs.area_v[:, 2:-2, np.newaxis] * a[:, 2:-2, :] + vs.area_v[:, 1:-3, np.newaxis] * a[:, 1:-3, :]) \
         / (2 * vs.area_t[:, 2:-2, np.newaxis])
     return b
@@ -221,7 +224,7 @@ def solve_tridiag(vs, a, b, c, d):
 
 @veros_method(inline=True)
 def calc_diss(vs, diss, tag):
-    diss_u = np.zeros_like(diss)
+    diss_u = allocate_like(vs, diss)
     ks = np.zeros_like(vs.kbot)
     if tag == 'U':
         ks[1:-2, 2:-2] = np.maximum(vs.kbot[1:-2, 2:-2], vs.kbot[2:-1, 2:-2]) - 1
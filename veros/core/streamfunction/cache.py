@@ -0,0 +1,122 @@
+"""On-disk cache of the time-independent setup of the streamfunction method.
+
+Assembling the Poisson matrix and its preconditioners, and solving for the
+streamfunction of every island, can dominate the startup time on large grids. If the
+setting ``setup_cache_dir`` is given, these results are stored in that directory and
+re-used by all runs on the same grid (e.g. subsequent runs of a resubmitted
+experiment). Entries are keyed by a hash of the grid metrics, the topography,
+cyclicity, and the solver settings, so any change to those leads to a cache miss.
+"""
+
+import os
+import pickle
+import hashlib
+
+from loguru import logger
+
+from ... import veros_method, runtime_state as rst, distributed
+
+#: Bump to invalidate existing caches when their content changes
+CACHE_VERSION = 1
+
+_KEY_VARIABLES = (
+    'dxt', 'dxu', 'dyt', 'dyu', 'cost', 'cosu', 'hur', 'hvr', 'kbot', 'boundary_mask'
+)
+
+
+def is_enabled(vs):
+    return bool(getattr(vs, 'setup_cache_dir', ''))
+
+
+@veros_method(dist_safe=False, local_variables=list(_KEY_VARIABLES))
+def _hash_setup(vs, extra):
+    setup_hash = hashlib.sha256()
+    setup_hash.update(repr((
+        CACHE_VERSION, vs.nx, vs.ny, vs.enable_cyclic_x,
+        vs.congr_epsilon, vs.congr_max_iterations, extra
+    )).encode())
+
+    for var in _KEY_VARIABLES:
+        arr = getattr(vs, var)
+        try:
+            arr = arr.copy2numpy()
+        except AttributeError:
+            pass
+        setup_hash.update(repr((var, str(arr.dtype), arr.shape)).encode())
+        setup_hash.update(np.ascontiguousarray(arr).tobytes())
+
+    return setup_hash.hexdigest()
+
+
+@veros_method
+def get_key(vs, *extra):
+    """Hash of the grid and topography, plus the given (representable) values.
+    Returns the same key on all processes."""
+    return distributed.broadcast(vs, _hash_setup(vs, extra))
+
+
+def _get_path(vs, kind, key):
+    return os.path.join(vs.setup_cache_dir, '{}_{}.pickle'.format(kind, key))
+
+
+def _read(vs, kind, key):
+    path = _get_path(vs, kind, key)
+    if not os.path.isfile(path):
+        logger.debug(' No cached {} found in {}', kind, vs.setup_cache_dir)
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            obj = pickle.load(f)
+    except Exception as exc:
+        logger.warning('Could not read cached {} from {} ({}), re-computing it', kind, path, exc)
+        return None
+
+    logger.info(' Using cached {} from {}', kind, path)
+    return obj
+
+
+@veros_method
+def load_on_root(vs, kind, key):
+    """Reads the cached object of the given kind on the first process only.
+
+    Returns whether there is a cache hit (on all processes), and the cached object
+    (on the first process, ``None`` elsewhere). Use this for large objects that are
+    distributed among processes afterwards.
+    """
+    if not is_enabled(vs):
+        return False, None
+
+    obj = _read(vs, kind, key) if rst.proc_rank == 0 else None
+    return distributed.broadcast(vs, obj is not None), obj
+
+
+@veros_method
+def load(vs, kind, key):
+    """Returns the cached object of the given kind, or ``None`` on a cache miss.
+
+    Only the first process reads the cache, so all processes agree on whether there
+    is a hit (even if they do not share the cache directory).
+    """
+    hit, obj = load_on_root(vs, kind, key)
+    if not hit:
+        return None
+
+    return distributed.broadcast(vs, obj)
+
+
+def store(vs, kind, key, obj):
+    """Writes ``obj`` to the cache (from the first process only)"""
+    if not is_enabled(vs) or rst.proc_rank != 0:
+        return
+
+    os.makedirs(vs.setup_cache_dir, exist_ok=True)
+    path = _get_path(vs, kind, key)
+
+    # write atomically, so concurrent runs never read partial files
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    logger.debug(' Wrote {} to cache {}', kind, path)
@@ -1,5 +1,4 @@
 import numpy
-import scipy.ndimage
 
 from ... import veros_method, runtime_settings as rs
 from .. import utilities
@@ -7,6 +6,8 @@ from .. import utilities
 
 @veros_method
 def isleperim(vs, kmt, verbose=False):
+    import scipy.ndimage
+
     utilities.enforce_boundaries(vs, kmt)
 
     if rs.backend == 'bohrium':
@@ -41,8 +41,7 @@ def solve_streamfunction(vs):
     fpy = np.sum((vs.dv[:, :, :, vs.tau] + vs.dv_mix)
                  * vs.maskV * vs.dzt, axis=(2,)) * vs.hvr
 
-    mainutils.enforce_boundaries(vs, fpx)
-    mainutils.enforce_boundaries(vs, fpy)
+    mainutils.enforce_boundaries_many(vs, [fpx, fpy])
 
     forc = allocate(vs, ('xu', 'yu'))
     forc[2:-2, 2:-2] = (fpy[3:-1, 2:-2] - fpy[2:-2, 2:-2]) \
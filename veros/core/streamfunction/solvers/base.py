@@ -9,3 +9,13 @@ class LinearSolver(metaclass=ABCMeta):
     @abstractmethod
     def solve(self, vs, rhs, x0, boundary_val=None):
         pass
+
+    def solve_many(self, vs, rhs, x0, boundary_val=None):
+        """Solves for several right-hand sides, stacked along the last axis of all
+        arrays. Solvers that can share work between right-hand sides override this;
+        by default, they are solved one after another."""
+        for i in range(rhs.shape[-1]):
+            self.solve(
+                vs, rhs[..., i], x0[..., i],
+                boundary_val=None if boundary_val is None else boundary_val[..., i]
+            )
@@ -0,0 +1,81 @@
+from loguru import logger
+import numpy
+import scipy.sparse
+import scipy.sparse.linalg as spalg
+
+from .scipy import SciPySolver
+from ... import utilities
+from .... import veros_method, runtime_settings as rs, runtime_state as rst
+
+
+class DirectSolver(SciPySolver):
+    """
+    Solves the Poisson equation through a sparse LU factorization of its matrix
+    (including the cyclic wrap-around diagonals). The matrix is factorized once during
+    setup, so every solve consists of a forward and a backward substitution.
+
+    Memory use grows faster than the number of grid cells due to fill-in, so this
+    solver is best suited for small and medium grids.
+    """
+    @veros_method
+    def __init__(self, vs):
+        super(DirectSolver, self).__init__(vs)
+
+        if rst.proc_rank == 0:
+            # cells without any coupling (e.g. inside of land masses) make the matrix singular;
+            # iterative solvers leave them at their initial guess, so we do the same
+            self._decoupled = numpy.abs(self._matrix.diagonal()) == 0
+            self._factorization = self._factorize(
+                self._matrix + scipy.sparse.diags(self._decoupled.astype('float64'))
+            )
+
+    @staticmethod
+    def _factorize(matrix):
+        factorization = spalg.splu(matrix.tocsc())
+
+        factor_nnz = factorization.L.nnz + factorization.U.nnz
+        factor_bytes = sum(
+            factor.data.nbytes + factor.indices.nbytes + factor.indptr.nbytes
+            for factor in (factorization.L, factorization.U)
+        )
+        logger.info(
+            ' LU factorization has {} nonzeros ({:.1f}x fill-in, {:.1f} MB)',
+            factor_nnz, factor_nnz / matrix.nnz, factor_bytes / 1024 ** 2
+        )
+        return factorization
+
+    @veros_method(dist_safe=False, local_variables=['boundary_mask'])
+    def _scipy_solver(self, vs, rhs, sol, boundary_val):
+        # boundary values may be scalar
+        boundary_val = np.asarray(boundary_val)[..., np.newaxis]
+        self._scipy_solver_many(vs, rhs[..., np.newaxis], sol[..., np.newaxis], boundary_val=boundary_val)
+
+    @veros_method(dist_safe=False, local_variables=['boundary_mask'])
+    def _scipy_solver_many(self, vs, rhs, sol, boundary_val):
+        # boundary values may be taken from the solution
+        utilities.enforce_boundaries(vs, sol)
+
+        boundary_mask = np.logical_and.reduce(~vs.boundary_mask, axis=2)
+        rhs = utilities.where(vs, boundary_mask[..., np.newaxis], rhs, boundary_val)
+
+        x0 = sol
+
+        try:
+            rhs = rhs.copy2numpy()
+        except AttributeError:
+            pass
+
+        try:
+            x0 = x0.copy2numpy()
+        except AttributeError:
+            pass
+
+        # all right-hand sides are solved with the same factorization
+        rhs = rhs.reshape(-1, rhs.shape[-1]) * self._preconditioner.diagonal()[:, np.newaxis]
+        rhs[self._decoupled] = x0.reshape(rhs.shape)[self._decoupled]
+        linear_solution = self._factorization.solve(rhs)
+
+        if rs.backend == 'bohrium':
+            linear_solution = np.asarray(linear_solution)
+
+        sol[...] = linear_solution.reshape(sol.shape)
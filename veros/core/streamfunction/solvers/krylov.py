@@ -0,0 +1,262 @@
+from loguru import logger
+
+from .base import LinearSolver
+from ..utilities import poisson_stencil
+from ... import utilities
+from .... import veros_method, distributed
+from ....variables import allocate
+
+
+class KrylovSolver(LinearSolver):
+    """Jacobi-preconditioned BiCGStab that operates on the local chunk of every process.
+
+    The Poisson stencil is applied locally after an overlap exchange, and dot products
+    are reduced through :func:`veros.distributed.global_sum`, so no data is gathered
+    to the main process.
+    """
+
+    @veros_method
+    def __init__(self, vs):
+        self._coeffs, self._preconditioner = self._assemble_poisson_stencil(vs)
+        self._work = allocate(vs, ('xu', 'yu'))
+
+    @veros_method
+    def _apply_stencil(self, vs, arr):
+        coeffs = self._coeffs
+        if arr.ndim > 2:
+            # several right-hand sides along the last axis
+            coeffs = tuple(coeff[..., np.newaxis] for coeff in coeffs)
+
+        main_diag, east_diag, west_diag, north_diag, south_diag = coeffs
+        return main_diag * arr[2:-2, 2:-2] \
+            + east_diag * arr[3:-1, 2:-2] \
+            + west_diag * arr[1:-3, 2:-2] \
+            + north_diag * arr[2:-2, 3:-1] \
+            + south_diag * arr[2:-2, 1:-3]
+
+    @veros_method
+    def _matvec(self, vs, arr, work=None):
+        # overlap of the work array is zero on the outer boundaries of the domain
+        if work is None:
+            work = self._work
+        work[2:-2, 2:-2] = arr
+        utilities.enforce_boundaries(vs, work)
+        return self._apply_stencil(vs, work)
+
+    @veros_method
+    def _dot(self, vs, *pairs):
+        """Global dot products of all given pairs of arrays, in a single reduction"""
+        local_dots = np.array([np.sum(a * b) for a, b in pairs])
+        return distributed.global_sum(vs, local_dots)
+
+    @veros_method
+    def _dot_columns(self, vs, *pairs):
+        """Global dot products of the columns (last axis) of all given pairs of arrays,
+        in a single reduction"""
+        local_dots = np.stack([np.sum(a * b, axis=(0, 1)) for a, b in pairs])
+        return distributed.global_sum(vs, local_dots)
+
+    @veros_method
+    def _bicgstab(self, vs, rhs, x0):
+        x = x0[2:-2, 2:-2].copy()
+        r = rhs - self._apply_stencil(vs, x0)
+        r_hat = r.copy()
+
+        rhs_norm, rho, r_norm = self._dot(vs, (rhs, rhs), (r_hat, r), (r, r))
+        rhs_norm, r_norm = np.sqrt(rhs_norm), np.sqrt(r_norm)
+
+        if rhs_norm == 0:
+            return rhs
+
+        tol = vs.congr_epsilon * rhs_norm
+
+        p = v = None
+        alpha = omega = rho_old = 1.
+
+        for iteration in range(vs.congr_max_iterations):
+            if r_norm <= tol:
+                break
+
+            if rho == 0:
+                logger.warning('Streamfunction solver broke down after {} iterations', iteration)
+                break
+
+            if p is None:
+                p = r.copy()
+            else:
+                beta = (rho / rho_old) * (alpha / omega)
+                p = r + beta * (p - omega * v)
+
+            v = self._matvec(vs, p)
+            alpha = rho / self._dot(vs, (r_hat, v))[0]
+            s = r - alpha * v
+
+            t = self._matvec(vs, s)
+            ts, tt, ss = self._dot(vs, (t, s), (t, t), (s, s))
+
+            if np.sqrt(ss) <= tol or tt == 0:
+                x += alpha * p
+                r = s
+                r_norm = np.sqrt(ss)
+                break
+
+            omega = ts / tt
+            x += alpha * p + omega * s
+            r = s - omega * t
+
+            rho_old = rho
+            rho, r_norm = self._dot(vs, (r_hat, r), (r, r))
+            r_norm = np.sqrt(r_norm)
+        else:
+            iteration = vs.congr_max_iterations
+
+        if r_norm > tol:
+            logger.warning('Streamfunction solver did not converge after {} iterations', iteration)
+
+        return x
+
+    @veros_method
+    def _bicgstab_many(self, vs, rhs, x0):
+        """Like :meth:`_bicgstab`, for the columns (last axis) of ``rhs`` and ``x0``.
+
+        All columns are iterated together, so they share overlap exchanges and global
+        reductions. Columns stop being updated once they have converged.
+        """
+        x = x0[2:-2, 2:-2].copy()
+        r = rhs - self._apply_stencil(vs, x0)
+        r_hat = r.copy()
+        work = np.zeros_like(x0)
+
+        rhs_norm, rho, r_norm = self._dot_columns(vs, (rhs, rhs), (r_hat, r), (r, r))
+        rhs_norm, r_norm = np.sqrt(rhs_norm), np.sqrt(r_norm)
+
+        tol = vs.congr_epsilon * rhs_norm
+        active = (rhs_norm > 0) & (r_norm > tol)
+
+        p = np.zeros_like(r)
+        v = np.zeros_like(r)
+        alpha = np.ones_like(rho)
+        omega = np.ones_like(rho)
+        rho_old = np.ones_like(rho)
+
+        for iteration in range(vs.congr_max_iterations):
+            broken_down = active & (rho == 0)
+            if broken_down.any():
+                logger.warning('Streamfunction solver broke down after {} iterations', iteration)
+                active &= ~broken_down
+
+            if not active.any():
+                break
+
+            # coefficients of inactive columns are zero, which leaves them unchanged
+            beta = np.where(active, (rho / np.where(active, rho_old, 1.)) * (alpha / np.where(active, omega, 1.)), 0.)
+            p = np.where(active, r + beta * (p - omega * v), p)
+
+            v = self._matvec(vs, p, work)
+            r_hat_v = self._dot_columns(vs, (r_hat, v))[0]
+            alpha = np.where(active, rho / np.where(active, r_hat_v, 1.), 0.)
+            s = r - alpha * v
+
+            t = self._matvec(vs, s, work)
+            ts, tt, ss = self._dot_columns(vs, (t, s), (t, t), (s, s))
+
+            converged = active & ((np.sqrt(ss) <= tol) | (tt == 0))
+            omega = np.where(active & ~converged, ts / np.where(tt == 0, 1., tt), 0.)
+
+            x += alpha * p + omega * s
+            r = s - omega * t
+            active &= ~converged
+
+            rho_old = rho
+            rho, r_norm = self._dot_columns(vs, (r_hat, r), (r, r))
+            r_norm = np.sqrt(r_norm)
+            active &= r_norm > tol
+        else:
+            iteration = vs.congr_max_iterations
+
+        # zero right-hand sides have zero solutions
+        x[..., rhs_norm == 0] = 0.
+
+        not_converged = int(np.sum((rhs_norm > 0) & (r_norm > tol)))
+        if not_converged:
+            logger.warning('Streamfunction solver did not converge after {} iterations for {} of {} right-hand sides',
+                           iteration, not_converged, rhs.shape[-1])
+
+        return x
+
+    @veros_method
+    def solve(self, vs, rhs, sol, boundary_val=None):
+        """
+        Main solver for streamfunction. Solves a 2D Poisson equation with a distributed
+        BiCGStab method.
+
+        Arguments:
+            rhs: Right-hand side vector
+            sol: Initial guess, gets overwritten with solution
+            boundary_val: Array containing values to set on boundary elements. Defaults to `sol`.
+        """
+        if boundary_val is None:
+            boundary_val = sol
+
+        utilities.enforce_boundaries(vs, sol)
+
+        boundary_mask = np.logical_and.reduce(~vs.boundary_mask, axis=2)
+        rhs = utilities.where(vs, boundary_mask, rhs, boundary_val) # set right hand side on boundaries
+
+        # initial guess, with boundary values on the outer boundaries of the domain
+        x0 = rhs.copy()
+        x0[2:-2, 2:-2] = sol[2:-2, 2:-2]
+        utilities.enforce_boundaries(vs, x0)
+
+        sol[...] = rhs
+        sol[2:-2, 2:-2] = self._bicgstab(vs, rhs[2:-2, 2:-2] * self._preconditioner, x0)
+
+    @veros_method
+    def solve_many(self, vs, rhs, sol, boundary_val=None):
+        """
+        Like :meth:`solve`, for several right-hand sides (along the last axis of all arrays),
+        which are solved simultaneously.
+        """
+        if boundary_val is None:
+            boundary_val = sol
+
+        utilities.enforce_boundaries(vs, sol)
+
+        boundary_mask = np.logical_and.reduce(~vs.boundary_mask, axis=2)
+        rhs = utilities.where(vs, boundary_mask[..., np.newaxis], rhs, boundary_val)
+
+        x0 = rhs.copy()
+        x0[2:-2, 2:-2] = sol[2:-2, 2:-2]
+        utilities.enforce_boundaries(vs, x0)
+
+        sol[...] = rhs
+        sol[2:-2, 2:-2] = self._bicgstab_many(
+            vs, rhs[2:-2, 2:-2] * self._preconditioner[..., np.newaxis], x0
+        )
+
+    @veros_method
+    def _assemble_poisson_stencil(self, vs):
+        """
+        Construct the coefficients of the 5-point stencil for the 2D Poisson equation
+        on the local chunk, scaled by a Jacobi preconditioner.
+        """
+        eps = 1e-20
+
+        boundary_mask = np.logical_and.reduce(~vs.boundary_mask[2:-2, 2:-2], axis=2)
+
+        main_diag, east_diag, west_diag, north_diag, south_diag = poisson_stencil(vs)
+
+        main_diag = boundary_mask * main_diag + (1 - boundary_mask)
+
+        # Jacobi preconditioner
+        preconditioner = utilities.where(vs, np.abs(main_diag) > eps, 1. / (main_diag + eps), 1.)
+
+        coeffs = tuple(preconditioner * diag for diag in (
+            main_diag,
+            boundary_mask * east_diag,
+            boundary_mask * west_diag,
+            boundary_mask * north_diag,
+            boundary_mask * south_diag
+        ))
+
+        return coeffs, preconditioner
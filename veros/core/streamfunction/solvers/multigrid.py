@@ -0,0 +1,233 @@
+import numpy
+import scipy.sparse
+import scipy.sparse.linalg as spalg
+
+from .scipy import SciPySolver
+from .... import veros_method
+
+#: Levels with at most this many cells are solved directly
+COARSEST_SIZE = 1000
+
+#: Number of red-black Gauss-Seidel sweeps before and after each coarse grid correction
+SMOOTHING_STEPS = 2
+
+#: Scaling of coarse grid corrections, to make up for the piecewise constant interpolation
+OVERCORRECTION = 1.8
+
+
+class MultigridSolver(SciPySolver):
+    """
+    Solves the Poisson equation with BiCGStab, preconditioned by one V-cycle of a
+    geometric multigrid method.
+
+    The multigrid hierarchy is built from the finite volume form of the Poisson stencil
+    (i.e., the face coefficients derived from ``hur``, ``hvr``, and the grid metrics).
+    Coarse levels aggregate blocks of 2x2 cells that are not part of the boundary of
+    an island, so the coarse operators remain 5-point stencils, and are periodic in
+    x for cyclic domains. Setup and every cycle take O(N) operations.
+    """
+    @veros_method(dist_safe=False, local_variables=[
+        'hvr', 'hur',
+        'dxu', 'dxt', 'dyu', 'dyt',
+        'cosu', 'cost',
+        'boundary_mask', 'kbot'
+    ])
+    def __init__(self, vs):
+        super(MultigridSolver, self).__init__(vs)
+        levels = self._build_hierarchy(vs)
+        self._extra_args['M'] = self._get_preconditioner(vs, levels)
+
+    def _build_hierarchy(self, vs):
+        """Multigrid levels of the (negative, area-weighted) Poisson operator on the interior"""
+        arrays = dict(
+            hvr=vs.hvr, hur=vs.hur, dxu=vs.dxu, dxt=vs.dxt, dyu=vs.dyu, dyt=vs.dyt,
+            cosu=vs.cosu, cost=vs.cost, boundary_mask=vs.boundary_mask
+        )
+        for name, arr in arrays.items():
+            try:
+                arrays[name] = arr.copy2numpy()
+            except AttributeError:
+                arrays[name] = numpy.asarray(arr)
+
+        # coefficients of the faces west and south of each cell, such that
+        # the Poisson equation multiplied by cell area is sum(coeff * (psi_neighbor - psi))
+        coeff_x = arrays['hvr'] * arrays['dyu'][numpy.newaxis, :] \
+            / arrays['dxt'][:, numpy.newaxis] / arrays['cosu'][numpy.newaxis, :]
+        coeff_y = arrays['hur'] * arrays['cost'][numpy.newaxis, :] \
+            * arrays['dxu'][:, numpy.newaxis] / arrays['dyt'][numpy.newaxis, :]
+        self._cell_area = (
+            arrays['dxu'][:, numpy.newaxis] * arrays['dyu'][numpy.newaxis, :] * arrays['cosu'][numpy.newaxis, :]
+        )[2:-2, 2:-2]
+
+        # faces to all neighbors (including boundaries and land) contribute to the diagonal
+        diag = (coeff_x[2:-2, 2:-2] + coeff_x[3:-1, 2:-2] + coeff_y[2:-2, 2:-2] + coeff_y[2:-2, 3:-1])
+
+        # unknowns are interior cells that are neither on island boundaries nor decoupled
+        boundary_mask = numpy.logical_and.reduce(~arrays['boundary_mask'], axis=2)
+        self._active = boundary_mask[2:-2, 2:-2] & (diag > 0)
+
+        # only faces between two unknowns are off-diagonal entries
+        active = self._active
+        west = coeff_x[2:-2, 2:-2].copy()
+        if vs.enable_cyclic_x:
+            west *= active & numpy.roll(active, 1, axis=0)
+        else:
+            west[1:] *= active[1:] & active[:-1]
+            west[0] = 0.
+        south = coeff_y[2:-2, 2:-2].copy()
+        south[:, 1:] *= active[:, 1:] & active[:, :-1]
+        south[:, 0] = 0.
+
+        levels = [_GridLevel(numpy.where(active, diag, 1.), west, south, active)]
+        while levels[-1].size > COARSEST_SIZE:
+            coarse = levels[-1].coarsen()
+            if coarse is None:
+                break
+            levels.append(coarse)
+
+        levels[-1].factorize()
+        return levels
+
+    def _get_preconditioner(self, vs, levels):
+        """Linear operator that applies one V-cycle to the (Jacobi preconditioned) residual"""
+        matrix = self._matrix
+        scaling = self._preconditioner.diagonal()
+        active = self._active
+        cell_area = self._cell_area
+
+        def apply_vcycle(residual):
+            residual = residual.reshape(-1) / scaling
+
+            # values on boundaries are known, and enter the equations of their neighbors
+            correction = residual.copy()
+            interior_correction = correction.reshape(vs.nx + 4, vs.ny + 4)[2:-2, 2:-2]
+            interior_correction[active] = 0.
+            boundary_residual = residual - (matrix * correction) / scaling
+
+            rhs = -cell_area * boundary_residual.reshape(vs.nx + 4, vs.ny + 4)[2:-2, 2:-2]
+            interior_correction[active] = _vcycle(levels, numpy.where(active, rhs, 0.))[active]
+            return correction
+
+        return spalg.LinearOperator(matrix.shape, matvec=apply_vcycle, dtype=matrix.dtype)
+
+
+class _GridLevel:
+    """
+    Positive definite 5-point operator on a (masked) grid. Rows of inactive cells
+    are identity rows without any coupling. ``west[i, j]`` couples cell (i, j) to cell
+    (i - 1, j), wrapping around in x (so ``west[0]`` vanishes for non-cyclic grids);
+    ``south`` is the same for y, where ``south[:, 0]`` always vanishes.
+    """
+    def __init__(self, diag, west, south, active):
+        self.diag = diag
+        self.west = west
+        self.south = south
+        self.east = numpy.roll(west, -1, axis=0)
+        self.north = numpy.roll(south, -1, axis=1)
+        self.active = active
+        self.inverse_diag = 1. / diag
+
+        # red-black ordering (on cyclic grids with odd nx, two red cells are adjacent)
+        idx_x, idx_y = numpy.indices(diag.shape)
+        self.colors = [(idx_x + idx_y) % 2 == color for color in (0, 1)]
+
+        self.coarse_map = self.coarse_shape = self.coarse_size = self.coarse_index = None
+        self.factorization = None
+
+    @property
+    def shape(self):
+        return self.diag.shape
+
+    @property
+    def size(self):
+        return self.diag.size
+
+    def neighbor_sum(self, x):
+        res = self.west * numpy.roll(x, 1, axis=0)
+        res[:-1] += self.east[:-1] * x[1:]
+        res[-1] += self.east[-1] * x[0]
+        res[:, 1:] += self.south[:, 1:] * x[:, :-1]
+        res[:, :-1] += self.north[:, :-1] * x[:, 1:]
+        return res
+
+    def residual(self, x, rhs):
+        return rhs - self.diag * x + self.neighbor_sum(x)
+
+    def smooth(self, x, rhs, reverse=False):
+        colors = self.colors[::-1] if reverse else self.colors
+        for _ in range(SMOOTHING_STEPS):
+            for color in colors:
+                numpy.copyto(x, (rhs + self.neighbor_sum(x)) * self.inverse_diag, where=color)
+
+    def restrict(self, arr):
+        return numpy.bincount(
+            self.coarse_index, weights=arr.reshape(-1), minlength=self.coarse_size
+        ).reshape(self.coarse_shape)
+
+    def interpolate(self, arr):
+        idx_x, idx_y = self.coarse_map
+        return arr[numpy.ix_(idx_x, idx_y)]
+
+    def coarsen(self):
+        """Galerkin coarse level with piecewise constant interpolation from aggregates of
+        2x2 cells (the last aggregate in each dimension absorbs any remaining cell, and
+        dimensions with less than 4 cells are not coarsened). Returns ``None`` if the
+        grid cannot be coarsened any further."""
+        def aggregate(n):
+            if n < 4:
+                return numpy.arange(n)
+            return numpy.minimum(numpy.arange(n) // 2, n // 2 - 1)
+
+        idx_x, idx_y = aggregate(self.shape[0]), aggregate(self.shape[1])
+        if len(idx_x) == idx_x.max() + 1 and len(idx_y) == idx_y.max() + 1:
+            return None
+
+        self.coarse_map = (idx_x, idx_y)
+        self.coarse_shape = (idx_x.max() + 1, idx_y.max() + 1)
+        self.coarse_size = self.coarse_shape[0] * self.coarse_shape[1]
+        self.coarse_index = (idx_x[:, numpy.newaxis] * self.coarse_shape[1] + idx_y[numpy.newaxis, :]).reshape(-1)
+
+        # faces between cells in the same aggregate drop out of the coarse operator
+        internal_x = (idx_x == numpy.roll(idx_x, 1))[:, numpy.newaxis]
+        internal_y = (idx_y == numpy.roll(idx_y, 1))[numpy.newaxis, :]
+
+        active = self.restrict(self.active) > 0
+        diag = self.restrict(
+            numpy.where(self.active, self.diag, 0.)
+            - 2 * self.west * internal_x - 2 * self.south * internal_y
+        )
+        west = self.restrict(self.west * ~internal_x)
+        south = self.restrict(self.south * ~internal_y)
+        return _GridLevel(numpy.where(active, diag, 1.), west, south, active)
+
+    def factorize(self):
+        nx, ny = self.shape
+        idx = numpy.arange(self.size).reshape(self.shape)
+        rows, cols, values = [idx.reshape(-1)], [idx.reshape(-1)], [self.diag.reshape(-1)]
+        for coeff, shift, axis in ((self.west, 1, 0), (self.south, 1, 1)):
+            neighbor = numpy.roll(idx, shift, axis=axis)
+            rows += [idx.reshape(-1), neighbor.reshape(-1)]
+            cols += [neighbor.reshape(-1), idx.reshape(-1)]
+            values += [-coeff.reshape(-1), -coeff.reshape(-1)]
+
+        matrix = scipy.sparse.coo_matrix(
+            (numpy.concatenate(values), (numpy.concatenate(rows), numpy.concatenate(cols))),
+            shape=(nx * ny, nx * ny)
+        )
+        self.factorization = spalg.splu(matrix.tocsc())
+
+    def solve(self, rhs):
+        return self.factorization.solve(rhs.reshape(-1)).reshape(self.shape)
+
+
+def _vcycle(levels, rhs):
+    level, coarser = levels[0], levels[1:]
+    if not coarser:
+        return level.solve(rhs)
+
+    x = numpy.zeros_like(rhs)
+    level.smooth(x, rhs)
+    coarse_correction = _vcycle(coarser, level.restrict(level.residual(x, rhs)))
+    x += OVERCORRECTION * level.interpolate(coarse_correction)
+    level.smooth(x, rhs, reverse=True)
+    return x
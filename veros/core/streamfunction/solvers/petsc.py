@@ -2,13 +2,17 @@ from petsc4py import PETSc
 from loguru import logger
 
 from .base import LinearSolver
+from ..utilities import poisson_stencil
 from ... import utilities
-from .... import veros_method, runtime_settings as rs, runtime_state as rst
+from .... import veros_method, distributed, runtime_settings as rs, runtime_state as rst
 
 
 class PETScSolver(LinearSolver):
     @veros_method
     def __init__(self, vs):
+        if rs.land_blocks:
+            raise RuntimeError('PETSc linear solver requires a process for every block of the decomposition')
+
         if vs.enable_cyclic_x:
             boundary_type = ('periodic', 'ghosted')
         else:
@@ -21,10 +25,7 @@ class PETScSolver(LinearSolver):
             comm=rs.mpi_comm,
             proc_sizes=rs.num_proc,
             boundary_type=boundary_type,
-            ownership_ranges=[
-                (vs.nx // rs.num_proc[0],) * rs.num_proc[0],
-                (vs.ny // rs.num_proc[1],) * rs.num_proc[1],
-            ]
+            ownership_ranges=distributed.get_chunk_sizes(vs)
         )
 
         self._matrix, self._boundary_fac = self._assemble_poisson_matrix(vs)
@@ -114,20 +115,7 @@ class PETScSolver(LinearSolver):
 
         boundary_mask = np.logical_and.reduce(~vs.boundary_mask[2:-2, 2:-2], axis=2)
 
-        # assemble diagonals
-        main_diag = -vs.hvr[3:-1, 2:-2] / vs.dxu[2:-2, np.newaxis] / vs.dxt[3:-1, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2 \
-            - vs.hvr[2:-2, 2:-2] / vs.dxu[2:-2, np.newaxis] / vs.dxt[2:-2, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2 \
-            - vs.hur[2:-2, 2:-2] / vs.dyu[np.newaxis, 2:-2] / vs.dyt[np.newaxis, 2:-2] * vs.cost[np.newaxis, 2:-2] / vs.cosu[np.newaxis, 2:-2] \
-            - vs.hur[2:-2, 3:-1] / vs.dyu[np.newaxis, 2:-2] / vs.dyt[np.newaxis, 3:-1] * \
-            vs.cost[np.newaxis, 3:-1] / vs.cosu[np.newaxis, 2:-2]
-        east_diag = vs.hvr[3:-1, 2:-2] / vs.dxu[2:-2, np.newaxis] / \
-            vs.dxt[3:-1, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2
-        west_diag = vs.hvr[2:-2, 2:-2] / vs.dxu[2:-2, np.newaxis] / \
-            vs.dxt[2:-2, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2
-        north_diag = vs.hur[2:-2, 3:-1] / vs.dyu[np.newaxis, 2:-2] / \
-            vs.dyt[np.newaxis, 3:-1] * vs.cost[np.newaxis, 3:-1] / vs.cosu[np.newaxis, 2:-2]
-        south_diag = vs.hur[2:-2, 2:-2] / vs.dyu[np.newaxis, 2:-2] / \
-            vs.dyt[np.newaxis, 2:-2] * vs.cost[np.newaxis, 2:-2] / vs.cosu[np.newaxis, 2:-2]
+        main_diag, east_diag, west_diag, north_diag, south_diag = poisson_stencil(vs)
 
         # construct sparse matrix
         cf = tuple(diag for diag in (
@@ -146,7 +134,7 @@ class PETScSolver(LinearSolver):
         (i0, i1), (j0, j1) = self._da.getRanges()
         for j in range(j0, j1):
             for i in range(i0, i1):
-                iloc, jloc = i % (vs.nx // rs.num_proc[0]), j % (vs.ny // rs.num_proc[1])
+                iloc, jloc = i - i0, j - j0
                 row.index = (i, j)
 
                 for diag, offset in zip(cf, ij_offsets):
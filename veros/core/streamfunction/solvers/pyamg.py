@@ -1,14 +1,61 @@
 import pyamg
+from pyamg.relaxation.smoothing import change_smoothers
 
 from .scipy import SciPySolver
-from .... import veros_method, runtime_state as rst
+from .. import cache
+from .... import veros_method
+
+# default smoothers of pyamg.smoothed_aggregation_solver, also used for cached hierarchies
+_SMOOTHER = ('block_gauss_seidel', {'sweep': 'symmetric'})
 
 
 class PyAMGSolver(SciPySolver):
-    @veros_method
+    @veros_method(dist_safe=False, local_variables=[
+        'hvr', 'hur',
+        'dxu', 'dxt', 'dyu', 'dyt',
+        'cosu', 'cost',
+        'boundary_mask', 'kbot'
+    ])
     def __init__(self, vs):
         super(PyAMGSolver, self).__init__(vs)
+        ml = self._get_multilevel_solver(vs)
+        self._extra_args['M'] = ml.aspreconditioner()
+
+    @veros_method
+    def _get_multilevel_solver(self, vs):
+        """Smoothed aggregation hierarchy of the Poisson matrix, from the cache if possible"""
+        levels = cache.load(vs, 'amg_hierarchy', self._cache_key)
+        if levels is not None:
+            return _build_multilevel_solver(levels)
+
+        ml = pyamg.smoothed_aggregation_solver(self._matrix, presmoother=_SMOOTHER, postsmoother=_SMOOTHER)
+
+        # smoothers are closures that cannot be pickled, so only the operators are stored
+        levels = [
+            {attr: getattr(level, attr) for attr in ('A', 'P', 'R') if hasattr(level, attr)}
+            for level in ml.levels
+        ]
+        cache.store(vs, 'amg_hierarchy', self._cache_key, levels)
+        return ml
+
+
+def _build_multilevel_solver(levels):
+    """Multilevel solver from the operators of all levels"""
+    try:
+        MultilevelSolver = pyamg.multilevel.MultilevelSolver
+        Level = MultilevelSolver.Level
+    except AttributeError:
+        # pyAMG < 4.2
+        MultilevelSolver = pyamg.multilevel.multilevel_solver
+        Level = MultilevelSolver.level
+
+    ml_levels = []
+    for operators in levels:
+        level = Level()
+        for attr, operator in operators.items():
+            setattr(level, attr, operator)
+        ml_levels.append(level)
 
-        if rst.proc_rank == 0:
-            ml = pyamg.smoothed_aggregation_solver(self._matrix)
-            self._extra_args['M'] = ml.aspreconditioner()
+    ml = MultilevelSolver(ml_levels)
+    change_smoothers(ml, _SMOOTHER, _SMOOTHER)
+    return ml
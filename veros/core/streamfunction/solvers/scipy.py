@@ -3,6 +3,8 @@ import scipy.sparse
 import scipy.sparse.linalg as spalg
 
 from .base import LinearSolver
+from .. import cache
+from ..utilities import poisson_stencil
 from ... import utilities
 from .... import veros_method, runtime_settings as rs, distributed
 from ....variables import allocate
@@ -13,13 +15,21 @@ class SciPySolver(LinearSolver):
         'hvr', 'hur',
         'dxu', 'dxt', 'dyu', 'dyt',
         'cosu', 'cost',
-        'boundary_mask'
+        'boundary_mask', 'kbot'
     ])
     def __init__(self, vs):
         self._extra_args = {}
+        self._cache_key = cache.get_key(vs, 'poisson_matrix') if cache.is_enabled(vs) else None
+
+        cached = cache.load(vs, 'poisson_matrix', self._cache_key)
+        if cached is not None:
+            self._matrix, self._preconditioner = cached
+            return
+
         self._matrix = self._assemble_poisson_matrix(vs)
         self._preconditioner = self._jacobi_preconditioner(vs, self._matrix)
         self._matrix = self._preconditioner * self._matrix
+        cache.store(vs, 'poisson_matrix', self._cache_key, (self._matrix, self._preconditioner))
 
     @veros_method(dist_safe=False, local_variables=['boundary_mask'])
     def _scipy_solver(self, vs, rhs, sol, boundary_val):
@@ -55,6 +65,12 @@ class SciPySolver(LinearSolver):
 
         sol[...] = linear_solution.reshape(vs.nx + 4, vs.ny + 4)
 
+    @veros_method(dist_safe=False, local_variables=['boundary_mask'])
+    def _scipy_solver_many(self, vs, rhs, sol, boundary_val):
+        # matrix and preconditioner are shared by all right-hand sides
+        for i in range(rhs.shape[-1]):
+            self._scipy_solver(vs, rhs[..., i], sol[..., i], boundary_val=boundary_val[..., i])
+
     @veros_method
     def solve(self, vs, rhs, sol, boundary_val=None):
         """
@@ -78,6 +94,25 @@ class SciPySolver(LinearSolver):
 
         sol[...] = distributed.scatter(vs, sol_global, ('xt', 'yt'))
 
+    @veros_method
+    def solve_many(self, vs, rhs, sol, boundary_val=None):
+        """
+        Like :meth:`solve`, for several right-hand sides (along the last axis of all arrays).
+        Arrays are only gathered and scattered once for all of them.
+        """
+        dims = ('xt', 'yt', None)
+        rhs_global = distributed.gather(vs, rhs, dims)
+        sol_global = distributed.gather(vs, sol, dims)
+
+        if boundary_val is None:
+            boundary_val = sol_global
+        else:
+            boundary_val = distributed.gather(vs, boundary_val, dims)
+
+        self._scipy_solver_many(vs, rhs_global, sol_global, boundary_val=boundary_val)
+
+        sol[...] = distributed.scatter(vs, sol_global, dims)
+
     @staticmethod
     @veros_method(dist_safe=False, local_variables=[])
     def _jacobi_preconditioner(vs, matrix):
@@ -105,18 +140,8 @@ class SciPySolver(LinearSolver):
         # assemble diagonals
         main_diag = allocate(vs, ('xu', 'yu'), fill=1, local=False)
         east_diag, west_diag, north_diag, south_diag = (allocate(vs, ('xu', 'yu'), local=False) for _ in range(4))
-        main_diag[2:-2, 2:-2] = -vs.hvr[3:-1, 2:-2] / vs.dxu[2:-2, np.newaxis] / vs.dxt[3:-1, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2 \
-            - vs.hvr[2:-2, 2:-2] / vs.dxu[2:-2, np.newaxis] / vs.dxt[2:-2, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2 \
-            - vs.hur[2:-2, 2:-2] / vs.dyu[np.newaxis, 2:-2] / vs.dyt[np.newaxis, 2:-2] * vs.cost[np.newaxis, 2:-2] / vs.cosu[np.newaxis, 2:-2] \
-            - vs.hur[2:-2, 3:-1] / vs.dyu[np.newaxis, 2:-2] / vs.dyt[np.newaxis, 3:-1] * vs.cost[np.newaxis, 3:-1] / vs.cosu[np.newaxis, 2:-2]
-        east_diag[2:-2, 2:-2] = vs.hvr[3:-1, 2:-2] / vs.dxu[2:-2, np.newaxis] / \
-            vs.dxt[3:-1, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2
-        west_diag[2:-2, 2:-2] = vs.hvr[2:-2, 2:-2] / vs.dxu[2:-2, np.newaxis] / \
-            vs.dxt[2:-2, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2
-        north_diag[2:-2, 2:-2] = vs.hur[2:-2, 3:-1] / vs.dyu[np.newaxis, 2:-2] / \
-            vs.dyt[np.newaxis, 3:-1] * vs.cost[np.newaxis, 3:-1] / vs.cosu[np.newaxis, 2:-2]
-        south_diag[2:-2, 2:-2] = vs.hur[2:-2, 2:-2] / vs.dyu[np.newaxis, 2:-2] / \
-            vs.dyt[np.newaxis, 2:-2] * vs.cost[np.newaxis, 2:-2] / vs.cosu[np.newaxis, 2:-2]
+        (main_diag[2:-2, 2:-2], east_diag[2:-2, 2:-2], west_diag[2:-2, 2:-2],
+         north_diag[2:-2, 2:-2], south_diag[2:-2, 2:-2]) = poisson_stencil(vs)
 
         if vs.enable_cyclic_x:
             # couple edges of the domain
@@ -1,9 +1,9 @@
 from loguru import logger
 
-from ... import veros_method, runtime_settings as rs, runtime_state as rst
+from ... import veros_method, runtime_settings as rs, runtime_state as rst, distributed
 from ...variables import allocate
 from .. import utilities as mainutils
-from . import island, utilities
+from . import island, utilities, cache
 
 
 @veros_method(inline=True, dist_safe=False, local_variables=['kbot', 'land_map'])
@@ -14,27 +14,41 @@ def get_isleperim(vs):
     return int(vs.land_map.max())
 
 
-def _get_solver_class():
+#: Maximum number of grid cells for which the best solver is a direct solver
+DIRECT_SOLVER_MAX_SIZE = 100000
+
+
+def _get_solver_class(vs):
     ls = rs.linear_solver
 
     def _get_best_solver():
         if rst.proc_num > 1:
-            try:
-                from .solvers.petsc import PETScSolver
-            except ImportError:
-                logger.warning('PETSc linear solver not available, falling back to pyAMG')
-            else:
-                return PETScSolver
+            from ...local_comm import is_local_comm
+
+            if not rs.land_blocks and not is_local_comm(rs.mpi_comm):
+                try:
+                    from .solvers.petsc import PETScSolver
+                except ImportError:
+                    logger.warning('PETSc linear solver not available, falling back to distributed Krylov solver')
+                else:
+                    return PETScSolver
+
+            from .solvers.krylov import KrylovSolver
+            return KrylovSolver
+
+        if (vs.nx + 4) * (vs.ny + 4) <= DIRECT_SOLVER_MAX_SIZE:
+            from .solvers.direct import DirectSolver
+            return DirectSolver
 
         try:
             from .solvers.pyamg import PyAMGSolver
         except ImportError:
-            logger.warning('pyAMG linear solver not available, falling back to SciPy')
+            logger.warning('pyAMG linear solver not available, falling back to geometric multigrid')
         else:
             return PyAMGSolver
 
-        from .solvers.scipy import SciPySolver
-        return SciPySolver
+        from .solvers.multigrid import MultigridSolver
+        return MultigridSolver
 
     if ls == 'best':
         return _get_best_solver()
@@ -47,6 +61,15 @@ def _get_solver_class():
     elif ls == 'scipy':
         from .solvers.scipy import SciPySolver
         return SciPySolver
+    elif ls == 'krylov':
+        from .solvers.krylov import KrylovSolver
+        return KrylovSolver
+    elif ls == 'multigrid':
+        from .solvers.multigrid import MultigridSolver
+        return MultigridSolver
+    elif ls == 'direct':
+        from .solvers.direct import DirectSolver
+        return DirectSolver
 
     raise ValueError('unrecognized linear solver %s' % ls)
 
@@ -99,20 +122,28 @@ def streamfunction_init(vs):
             | vs.line_dir_south_mask[..., isle]
         )
 
-    vs.linear_solver = _get_solver_class()(vs)
+    vs.linear_solver = _get_solver_class(vs)(vs)
+
+    cache_key = cache.get_key(vs, type(vs.linear_solver).__name__) if cache.is_enabled(vs) else None
+    hit, cached = cache.load_on_root(vs, 'island_streamfunction', cache_key)
+    if hit:
+        # psin is global, so every process only receives its own chunk
+        psin, line_psin = cached if rst.proc_rank == 0 else (vs.psin, None)
+        vs.psin[...] = distributed.scatter(vs, psin, ('xu', 'yu', 'isle'))
+        mainutils.enforce_boundaries(vs, vs.psin)
+        vs.line_psin[...] = distributed.broadcast(vs, line_psin)
+        return
 
     """
     precalculate time independent boundary components of streamfunction
     """
-    forc = allocate(vs, ('xu', 'yu'))
+    forc = allocate(vs, ('xu', 'yu', 'isle'))
 
     # initialize with random noise to achieve uniform convergence
     vs.psin[...] = vs.maskZ[..., -1, np.newaxis]# np.random.rand(*vs.psin.shape) * vs.maskZ[..., -1, np.newaxis]
 
-    for isle in range(vs.nisle):
-        logger.info(' Solving for boundary contribution by island {:d}'.format(isle))
-        vs.linear_solver.solve(vs, forc, vs.psin[:, :, isle],
-                               boundary_val=vs.boundary_mask[:, :, isle])
+    logger.info(' Solving for boundary contributions by {:d} islands'.format(vs.nisle))
+    vs.linear_solver.solve_many(vs, forc, vs.psin, boundary_val=vs.boundary_mask)
 
     mainutils.enforce_boundaries(vs, vs.psin)
 
@@ -131,6 +162,15 @@ def streamfunction_init(vs):
         * vs.hvr[1:, 1:, np.newaxis]
     vs.line_psin[...] = utilities.line_integrals(vs, fpx, fpy, kind='full')
 
+    if cache_key is not None:
+        psin = distributed.gather(vs, vs.psin, ('xu', 'yu', 'isle'))
+        line_psin = vs.line_psin
+        try:
+            psin, line_psin = psin.copy2numpy(), line_psin.copy2numpy()
+        except AttributeError:
+            pass
+        cache.store(vs, 'island_streamfunction', cache_key, (psin, line_psin))
+
 
 @veros_method
 def _ascii_map(vs, boundary_map):
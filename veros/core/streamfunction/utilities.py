@@ -2,6 +2,27 @@ from ... import veros_method
 from veros.distributed import global_sum
 
 
+@veros_method
+def poisson_stencil(vs):
+    """
+    Coefficients of the 5-point stencil of the 2D Poisson equation for the streamfunction
+    in the interior of the (local) domain.
+
+    Returns the main, east, west, north, and south diagonals, each of shape
+    ``(nx, ny)`` without overlap. Boundary conditions are not applied.
+    """
+    east_diag = vs.hvr[3:-1, 2:-2] / vs.dxu[2:-2, np.newaxis] / \
+        vs.dxt[3:-1, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2
+    west_diag = vs.hvr[2:-2, 2:-2] / vs.dxu[2:-2, np.newaxis] / \
+        vs.dxt[2:-2, np.newaxis] / vs.cosu[np.newaxis, 2:-2]**2
+    north_diag = vs.hur[2:-2, 3:-1] / vs.dyu[np.newaxis, 2:-2] / \
+        vs.dyt[np.newaxis, 3:-1] * vs.cost[np.newaxis, 3:-1] / vs.cosu[np.newaxis, 2:-2]
+    south_diag = vs.hur[2:-2, 2:-2] / vs.dyu[np.newaxis, 2:-2] / \
+        vs.dyt[np.newaxis, 2:-2] * vs.cost[np.newaxis, 2:-2] / vs.cosu[np.newaxis, 2:-2]
+    main_diag = -east_diag - west_diag - south_diag - north_diag
+    return main_diag, east_diag, west_diag, north_diag, south_diag
+
+
 @veros_method
 def line_integrals(vs, uloc, vloc, kind='same'):
     """
@@ -1,5 +1,5 @@
 from .. import veros_method
-from ..distributed import global_sum
+from ..distributed import GlobalReduction
 from ..variables import allocate
 from . import advection, diffusion, isoneutral, density, utilities
 
@@ -69,8 +69,11 @@ def thermodynamics(vs):
         fxb = np.sum(vs.area_t[2:-2, 2:-2, np.newaxis] * vs.dzw[np.newaxis, np.newaxis, :-1] * vs.maskW[2:-2, 2:-2, :-1] * tke_mask) \
             + np.sum(0.5 * vs.area_t[2:-2, 2:-2] * vs.dzw[-1] * vs.maskW[2:-2, 2:-2, -1])
 
-        fxa = global_sum(vs, fxa)
-        fxb = global_sum(vs, fxb)
+        reduction = GlobalReduction(vs)
+        reduction.sum('fxa', fxa)
+        reduction.sum('fxb', fxb)
+        res = reduction.compute()
+        fxa, fxb = res['fxa'], res['fxb']
 
         vs.P_diss_adv[...] = 0.
         vs.P_diss_adv[2:-2, 2:-2, :-1] = fxa / fxb * tke_mask
@@ -155,13 +158,19 @@ def thermodynamics(vs):
                             vs.dsalt_vmix) / vs.dt_tracer
 
     """
-    boundary exchange
+    boundary exchange, overlapped with the equation of state in the interior
     """
-    utilities.enforce_boundaries(vs, vs.temp[..., vs.taup1])
-    utilities.enforce_boundaries(vs, vs.salt[..., vs.taup1])
+    exchange = utilities.start_enforce_boundaries(vs, [vs.temp[..., vs.taup1], vs.salt[..., vs.taup1]])
 
     with vs.timers['eq_of_state']:
-        calc_eq_of_state(vs, vs.taup1)
+        if exchange is None:
+            calc_eq_of_state(vs, vs.taup1)
+        else:
+            interior, boundary = utilities.partition_columns()
+            calc_eq_of_state(vs, vs.taup1, interior)
+            utilities.finish_enforce_boundaries(vs, exchange)
+            for columns in boundary:
+                calc_eq_of_state(vs, vs.taup1, columns)
 
     """
     surface density flux
@@ -248,37 +257,42 @@ def advect_salinity(vs):
 
 
 @veros_method
-def calc_eq_of_state(vs, n):
+def calc_eq_of_state(vs, n, columns=(slice(None), slice(None))):
     """
     calculate density, stability frequency, dynamic enthalpy and derivatives
     for time level n from temperature and salinity
+
+    only water columns in ``columns`` (slices in x and y) are updated
     """
-    density_args = (vs, vs.salt[..., n], vs.temp[..., n], np.abs(vs.zt))
+    i, j = columns
+    salt, temp = vs.salt[i, j, :, n], vs.temp[i, j, :, n]
+    maskT = vs.maskT[i, j, :]
+    density_args = (vs, salt, temp, np.abs(vs.zt))
 
     """
     calculate new density
     """
-    vs.rho[..., n] = density.get_rho(*density_args) * vs.maskT
+    vs.rho[i, j, :, n] = density.get_rho(*density_args) * maskT
 
     """
     calculate new potential density
     """
-    vs.prho[...] = density.get_potential_rho(*density_args) * vs.maskT
+    vs.prho[i, j, :] = density.get_potential_rho(*density_args) * maskT
 
     if vs.enable_conserve_energy:
         """
         calculate new dynamic enthalpy and derivatives
         """
-        vs.Hd[..., n] = density.get_dyn_enthalpy(*density_args) * vs.maskT
-        vs.int_drhodT[..., n] = density.get_int_drhodT(*density_args)
-        vs.int_drhodS[..., n] = density.get_int_drhodS(*density_args)
+        vs.Hd[i, j, :, n] = density.get_dyn_enthalpy(*density_args) * maskT
+        vs.int_drhodT[i, j, :, n] = density.get_int_drhodT(*density_args)
+        vs.int_drhodS[i, j, :, n] = density.get_int_drhodS(*density_args)
 
     """
     new stability frequency
     """
-    fxa = -vs.grav / vs.rho_0 / vs.dzw[np.newaxis, np.newaxis, :-1] * vs.maskW[:, :, :-1]
-    vs.Nsqr[:, :, :-1, n] = fxa * (density.get_rho(
-                                        vs, vs.salt[:, :, 1:, n], vs.temp[:, :, 1:, n], np.abs(vs.zt[:-1])
-                                    ) - vs.rho[:, :, :-1, n]
+    fxa = -vs.grav / vs.rho_0 / vs.dzw[np.newaxis, np.newaxis, :-1] * vs.maskW[i, j, :-1]
+    vs.Nsqr[i, j, :-1, n] = fxa * (density.get_rho(
+                                        vs, salt[:, :, 1:], temp[:, :, 1:], np.abs(vs.zt[:-1])
+                                    ) - vs.rho[i, j, :-1, n]
                                   )
-    vs.Nsqr[:, :, -1, n] = vs.Nsqr[:, :, -2, n]
+    vs.Nsqr[i, j, -1, n] = vs.Nsqr[i, j, -2, n]
@@ -1,11 +1,25 @@
 import math
 
-from .. import veros_method
+from .. import veros_method, jit
 from ..variables import allocate
 from . import advection, utilities
 
 
-@veros_method
+@jit.kernel
+def _bound_mxl_kernel(mxl, dzt, mxl_min):
+    nx, ny, nz = mxl.shape
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz - 2, -1, -1):
+                mxl[i, j, k] = min(mxl[i, j, k], mxl[i, j, k + 1] + dzt[k + 1])
+            mxl[i, j, nz - 1] = min(mxl[i, j, nz - 1], mxl_min + dzt[nz - 1])
+            for k in range(1, nz):
+                mxl[i, j, k] = min(mxl[i, j, k], mxl[i, j, k - 1] + dzt[k])
+            for k in range(nz):
+                mxl[i, j, k] = max(mxl[i, j, k], mxl_min)
+
+
+@veros_method(workspace=True)
 def set_tke_diffusivities(vs):
     """
     set vertical diffusivities based on TKE model
@@ -37,15 +51,18 @@ def set_tke_diffusivities(vs):
             """
             bound length scale as in mitgcm/OPA code
 
-            Note that the following code doesn't vectorize. If critical for performance,
-            consider re-implementing it in Cython.
+            Note that the following code doesn't vectorize. A compiled version
+            is used with the numba backend.
             """
-            for k in range(vs.nz - 2, -1, -1):
-                vs.mxl[:, :, k] = np.minimum(vs.mxl[:, :, k], vs.mxl[:, :, k + 1] + vs.dzt[k + 1])
-            vs.mxl[:, :, -1] = np.minimum(vs.mxl[:, :, -1], vs.mxl_min + vs.dzt[-1])
-            for k in range(1, vs.nz):
-                vs.mxl[:, :, k] = np.minimum(vs.mxl[:, :, k], vs.mxl[:, :, k - 1] + vs.dzt[k])
-            vs.mxl[...] = np.maximum(vs.mxl, vs.mxl_min)
+            if jit.is_enabled():
+                _bound_mxl_kernel(vs.mxl, vs.dzt, vs.mxl_min)
+            else:
+                for k in range(vs.nz - 2, -1, -1):
+                    vs.mxl[:, :, k] = np.minimum(vs.mxl[:, :, k], vs.mxl[:, :, k + 1] + vs.dzt[k + 1])
+                vs.mxl[:, :, -1] = np.minimum(vs.mxl[:, :, -1], vs.mxl_min + vs.dzt[-1])
+                for k in range(1, vs.nz):
+                    vs.mxl[:, :, k] = np.minimum(vs.mxl[:, :, k], vs.mxl[:, :, k - 1] + vs.dzt[k])
+                vs.mxl[...] = np.maximum(vs.mxl, vs.mxl_min)
         else:
             raise ValueError('unknown mixing length choice in tke_mxl_choice')
 
@@ -3,15 +3,13 @@ from .. import veros_method, runtime_settings as rs, runtime_state as rst
 
 @veros_method
 def enforce_boundaries(vs, arr, local=False):
-    from ..distributed import exchange_cyclic_boundaries, exchange_overlap
+    from ..distributed import exchange_overlap
     from ..decorators import CONTEXT
 
-    if vs.enable_cyclic_x:
-        if rs.num_proc[0] == 1 or not CONTEXT.is_dist_safe or local:
-            arr[-2:, ...] = arr[2:4, ...]
-            arr[:2, ...] = arr[-4:-2, ...]
-        else:
-            exchange_cyclic_boundaries(vs, arr)
+    # across processes, cyclic boundaries are part of the overlap exchange
+    if vs.enable_cyclic_x and (rs.num_proc[0] == 1 or not CONTEXT.is_dist_safe or local):
+        arr[-2:, ...] = arr[2:4, ...]
+        arr[:2, ...] = arr[-4:-2, ...]
 
     if local or rst.proc_num == 1:
         return
@@ -19,6 +17,60 @@ def enforce_boundaries(vs, arr, local=False):
     exchange_overlap(vs, arr, ['xt', 'yt'])
 
 
+@veros_method
+def enforce_boundaries_many(vs, arrays, local=False):
+    """Like :func:`enforce_boundaries`, but exchanges the overlap of all arrays at once"""
+    exchange = start_enforce_boundaries(vs, arrays, local=local)
+    finish_enforce_boundaries(vs, exchange)
+
+
+@veros_method
+def start_enforce_boundaries(vs, arrays, local=False):
+    """Applies cyclic boundary conditions and starts exchanging the overlap of all arrays.
+
+    Computations that only touch the interior of the arrays can proceed until
+    :func:`finish_enforce_boundaries` is called with the returned handle.
+    Returns ``None`` if there is no exchange in flight.
+    """
+    from ..distributed import start_exchange_overlap
+    from ..decorators import CONTEXT
+
+    if vs.enable_cyclic_x and (rs.num_proc[0] == 1 or not CONTEXT.is_dist_safe or local):
+        for arr in arrays:
+            arr[-2:, ...] = arr[2:4, ...]
+            arr[:2, ...] = arr[-4:-2, ...]
+
+    if local or rst.proc_num == 1:
+        return None
+
+    return start_exchange_overlap(vs, arrays, [['xt', 'yt']] * len(arrays))
+
+
+@veros_method
+def finish_enforce_boundaries(vs, exchange):
+    from ..distributed import finish_exchange_overlap
+    finish_exchange_overlap(vs, exchange)
+
+
+def partition_columns(stencil=0, start=0):
+    """Splits the water columns from index ``start`` on (in x and y) into those that can
+    be computed before the overlap is exchanged, and strips along the boundary that
+    have to be computed afterwards.
+
+    ``stencil`` is the number of western / southern neighbors a computation reads.
+    Returns a tuple of the interior slices, and a list of slices of the boundary strips.
+    """
+    lower = 2 + stencil
+    interior = (slice(lower, -2), slice(lower, -2))
+    boundary = [
+        (slice(start, lower), slice(start, None)),
+        (slice(-2, None), slice(start, None)),
+        (slice(lower, -2), slice(start, lower)),
+        (slice(lower, -2), slice(-2, None)),
+    ]
+    return interior, boundary
+
+
 @veros_method(inline=True)
 def where(vs, cond, arr1, arr2):
     assert cond.dtype == np.bool
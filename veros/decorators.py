@@ -5,15 +5,26 @@ import threading
 
 from loguru import logger
 
+from .kernel_profile import PROFILE as KERNEL_PROFILE
+from .memory_profile import PROFILE as MEMORY_PROFILE
+
 try:
     getargspec = inspect.getfullargspec
 except AttributeError:  # python 2
     getargspec = inspect.getargspec
 
 
-CONTEXT = threading.local()
-CONTEXT.is_dist_safe = True
-CONTEXT.stack_level = 0
+class _Context(threading.local):
+    # class attributes act as defaults for every thread
+    is_dist_safe = True
+    stack_level = 0
+    in_slab = False
+    workspace = None
+
+
+CONTEXT = _Context()
+
+_SENTINEL = object()
 
 
 def veros_method(function=None, **kwargs):
@@ -33,6 +44,20 @@ def veros_method(function=None, **kwargs):
        >>>     def set_topography(self):
        >>>         self.kbot[...] = np.random.randint(0, self.nz, size=self.kbot.shape)
 
+    Kernels that only consist of local stencil operations can opt in to thread-parallel
+    execution on slabs of the x-dimension (used by the ``numpy-threaded`` backend) by passing
+    ``slab_outputs``, a list of all state variables and arguments that the kernel writes to,
+    and ``slab_halo``, the number of neighboring x-columns needed to compute a column
+    (see :mod:`veros.slabs`).
+
+    Kernels that do not keep references to their temporary arrays can pass ``workspace=True``
+    to re-use temporaries allocated through :func:`veros.variables.allocate` between calls
+    (see :mod:`veros.workspace`).
+
+    If the runtime setting ``profile_kernels`` is set, the wall time of every call is recorded
+    (see :mod:`veros.kernel_profile`). Likewise, ``profile_memory`` records the peak memory
+    usage of every call (see :mod:`veros.memory_profile`).
+
     """
     if function is not None:
         narg = 1 if _is_method(function) else 0
@@ -46,12 +71,19 @@ def veros_method(function=None, **kwargs):
 
     local_vars = kwargs.pop('local_variables', [])
     dist_only = kwargs.pop('dist_only', False)
+    slab_outputs = kwargs.pop('slab_outputs', None)
+    slab_halo = kwargs.pop('slab_halo', 2)
+    workspace = kwargs.pop('workspace', False)
+
+    if workspace and inline:
+        raise ValueError('inline functions use the workspace of their caller')
 
     def inner_decorator(function):
         narg = 1 if _is_method(function) else 0
         return _veros_method(
             function, inline=inline, narg=narg,
-            dist_safe=dist_safe, local_vars=local_vars, dist_only=dist_only
+            dist_safe=dist_safe, local_vars=local_vars, dist_only=dist_only,
+            slab_outputs=slab_outputs, slab_halo=slab_halo, workspace=workspace
         )
 
     return inner_decorator
@@ -62,38 +94,130 @@ def _is_method(function):
     return spec.args and spec.args[0] == 'self'
 
 
+class _Runtime:
+    """Lazily imported runtime objects (importing them at module level would be circular)"""
+    loaded = False
+
+
+_RUNTIME = _Runtime()
+
+
+def _load_runtime():
+    from . import runtime_settings, runtime_state
+    from .state import VerosState
+    from .state_dist import DistributedVerosState
+    from .distributed import broadcast
+
+    _RUNTIME.settings = runtime_settings
+    _RUNTIME.state = runtime_state
+    _RUNTIME.VerosState = VerosState
+    _RUNTIME.DistributedVerosState = DistributedVerosState
+    _RUNTIME.broadcast = broadcast
+    _RUNTIME.loaded = True
+    return _RUNTIME
+
+
+class _Dispatch:
+    """Everything a veros_method needs to know about the runtime configuration.
+
+    Resolved once per function and re-used until the runtime settings change
+    (or on every call in ``debug`` dispatch mode).
+    """
+    __slots__ = ('generation', 'backend', 'flush', 'gather', 'is_root', 'trace', 'debug', 'slabs',
+                 'workspace', 'profile', 'profile_memory')
+
+    def __init__(self):
+        self.generation = None
+
+    def resolve(self, rs, rst, dist_safe):
+        from .backend import get_backend, get_flush, is_sync_point
+
+        self.generation = rs.__generation__
+        self.backend = get_backend(rs.backend)
+        self.flush = get_flush(rs.backend) if is_sync_point('call') else None
+        self.gather = not dist_safe and rst.proc_num > 1
+        self.is_root = rst.proc_rank == 0
+        self.trace = rs.loglevel == 'trace'
+        self.debug = rs.dispatch_mode == 'debug'
+        self.slabs = rs.backend == 'numpy-threaded' and rs.num_threads > 1
+        # lazy backends manage their own memory
+        self.workspace = rs.backend != 'bohrium'
+        self.profile = rs.profile_kernels
+        self.profile_memory = rs.profile_memory
+
+
+_SLAB_BACKEND_LOCK = threading.Lock()
+_SLAB_BACKEND_BINDINGS = {}
+
+
+def _bind_slab_backend(func_globals, backend):
+    """Sets ``np`` in the globals of a module for a function called from a slab thread.
+
+    Bindings are counted per module, and the previous value is restored once the last
+    thread leaves. Returns whether :func:`_release_slab_backend` has to be called.
+    """
+    with _SLAB_BACKEND_LOCK:
+        binding = _SLAB_BACKEND_BINDINGS.get(id(func_globals))
+        if binding is None:
+            oldvalue = func_globals.get('np', _SENTINEL)
+            if oldvalue is backend:
+                return False
+            binding = _SLAB_BACKEND_BINDINGS[id(func_globals)] = [0, oldvalue]
+            func_globals['np'] = backend
+        binding[0] += 1
+        return True
+
+
+def _release_slab_backend(func_globals):
+    with _SLAB_BACKEND_LOCK:
+        binding = _SLAB_BACKEND_BINDINGS[id(func_globals)]
+        binding[0] -= 1
+        if binding[0] > 0:
+            return
+
+        del _SLAB_BACKEND_BINDINGS[id(func_globals)]
+        if binding[1] is _SENTINEL:
+            del func_globals['np']
+        else:
+            func_globals['np'] = binding[1]
+
+
 def _veros_method(function, inline=False, dist_safe=True, local_vars=None,
-                  dist_only=False, narg=0):
+                  dist_only=False, narg=0, slab_outputs=None, slab_halo=2, workspace=False):
+    func_name = '{}:{}'.format(function.__module__, function.__name__)
+    func_globals = function.__globals__
+    dispatch = _Dispatch()
+
+    if slab_outputs is not None:
+        from .slabs import get_argument_names
+        arg_names = get_argument_names(function)
+
     @functools.wraps(function)
     def veros_method_wrapper(*args, **kwargs):
-        from . import runtime_settings as rs, runtime_state as rst
-        from .backend import flush, get_backend
-        from .state import VerosState
-        from .state_dist import DistributedVerosState
-        from .distributed import broadcast
+        runtime = _RUNTIME if _RUNTIME.loaded else _load_runtime()
+        rs = runtime.settings
+
+        if dispatch.generation != rs.__generation__ or dispatch.debug:
+            dispatch.resolve(rs, runtime.state, dist_safe)
 
         if not inline:
-            logger.trace(
-                '{}> {}:{}',
-                '-' * CONTEXT.stack_level,
-                inspect.getmodule(function).__name__,
-                function.__name__
-            )
+            if dispatch.trace:
+                logger.trace('{}> {}', '-' * CONTEXT.stack_level, func_name)
             CONTEXT.stack_level += 1
 
         veros_state = args[narg]
 
-        if not isinstance(veros_state, VerosState):
+        if not isinstance(veros_state, runtime.VerosState):
             raise TypeError('first argument to a veros_method must be subclass of VerosState')
 
         reset_dist_safe = False
         if not CONTEXT.is_dist_safe:
-            assert isinstance(veros_state, DistributedVerosState)
-        elif not dist_safe and rst.proc_num > 1:
+            assert isinstance(veros_state, runtime.DistributedVerosState)
+        elif dispatch.gather:
             reset_dist_safe = True
 
         if reset_dist_safe:
-            dist_state = DistributedVerosState(veros_state)
+            dist_state = runtime.DistributedVerosState(veros_state, kernel=func_name)
             dist_state.gather_arrays(local_vars)
             func_state = dist_state
             CONTEXT.is_dist_safe = False
@@ -102,21 +226,50 @@ def _veros_method(function, inline=False, dist_safe=True, local_vars=None,
 
         execute = True
         if not CONTEXT.is_dist_safe:
-            execute = rst.proc_rank == 0
-
-        g = function.__globals__
-        sentinel = object()
+            execute = dispatch.is_root
+
+        oldvalue = func_globals.get('np', _SENTINEL)
+        restore_np = False
+        release_np = False
+        if CONTEXT.in_slab:
+            # threads executing slabs share the module globals
+            release_np = _bind_slab_backend(func_globals, dispatch.backend)
+        elif oldvalue is not dispatch.backend:
+            func_globals['np'] = dispatch.backend
+            restore_np = True
+
+        if func_state is not veros_state:
+            args = list(args)
+            args[narg] = func_state
 
-        oldvalue = g.get('np', sentinel)
-        g['np'] = get_backend(rs.backend)
-
-        newargs = list(args)
-        newargs[narg] = func_state
+        if not inline:
+            # open a new workspace scope, or hide the caller's scope from this function
+            outer_workspace = CONTEXT.workspace
+            if workspace and dispatch.workspace:
+                CONTEXT.workspace = []
+            elif outer_workspace is not None:
+                CONTEXT.workspace = None
+
+        # slab threads are accounted to the calling kernel
+        profile_token = None
+        profile_memory = False
+        if not inline and not CONTEXT.in_slab:
+            if dispatch.profile_memory:
+                MEMORY_PROFILE.enter(func_name)
+                profile_memory = True
+            if dispatch.profile:
+                profile_token = KERNEL_PROFILE.enter(func_name)
 
         res = None
         try:
             if execute:
-                res = function(*newargs, **kwargs)
+                if (slab_outputs is not None and dispatch.slabs
+                        and CONTEXT.is_dist_safe and not CONTEXT.in_slab):
+                    from .slabs import run_in_slabs
+                    res = run_in_slabs(func_state, function, args, kwargs, slab_outputs,
+                                       slab_halo, narg, arg_names)
+                else:
+                    res = function(*args, **kwargs)
         except:
             if reset_dist_safe:
                 CONTEXT.is_dist_safe = True
@@ -124,17 +277,34 @@ def _veros_method(function, inline=False, dist_safe=True, local_vars=None,
         else:
             if reset_dist_safe:
                 CONTEXT.is_dist_safe = True
-                res = broadcast(veros_state, res)
+                res = runtime.broadcast(veros_state, res)
                 dist_state.scatter_arrays()
         finally:
-            if oldvalue is sentinel:
-                del g['np']
-            else:
-                g['np'] = oldvalue
+            if restore_np:
+                if oldvalue is _SENTINEL:
+                    del func_globals['np']
+                else:
+                    func_globals['np'] = oldvalue
+            elif release_np:
+                _release_slab_backend(func_globals)
 
             if not inline:
                 CONTEXT.stack_level -= 1
-                flush()
+
+                scope = CONTEXT.workspace
+                CONTEXT.workspace = outer_workspace
+                if scope:
+                    from .workspace import close_scope
+                    close_scope(scope, res)
+
+                if dispatch.flush is not None:
+                    dispatch.flush()
+
+                if profile_token is not None:
+                    KERNEL_PROFILE.exit(profile_token)
+
+                if profile_memory:
+                    MEMORY_PROFILE.exit()
 
         return res
 
@@ -2,7 +2,7 @@ from loguru import logger
 
 from .diagnostic import VerosDiagnostic
 from .. import veros_method
-from ..distributed import global_max
+from ..distributed import GlobalReduction
 
 
 class CFLMonitor(VerosDiagnostic):
@@ -25,38 +25,44 @@ class CFLMonitor(VerosDiagnostic):
         """
         check for CFL violation
         """
-        cfl = global_max(vs, max(
+        reduction = GlobalReduction(vs)
+        reduction.max('cfl', max(
             np.max(np.abs(vs.u[2:-2, 2:-2, :, vs.tau]) * vs.maskU[2:-2, 2:-2, :]
                    / (vs.cost[np.newaxis, 2:-2, np.newaxis] * vs.dxt[2:-2, np.newaxis, np.newaxis])
                    * vs.dt_tracer),
             np.max(np.abs(vs.v[2:-2, 2:-2, :, vs.tau]) * vs.maskV[2:-2, 2:-2, :]
                    / vs.dyt[np.newaxis, 2:-2, np.newaxis] * vs.dt_tracer)
         ))
-        wcfl = global_max(vs, np.max(
+        reduction.max('wcfl', np.max(
             np.abs(vs.w[2:-2, 2:-2, :, vs.tau]) * vs.maskW[2:-2, 2:-2, :]
                       / vs.dzt[np.newaxis, np.newaxis, :] * vs.dt_tracer
         ))
 
-        if np.isnan(cfl) or np.isnan(wcfl):
-            raise RuntimeError('CFL number is NaN at iteration {}'.format(vs.itt))
-
-        logger.warning(' Maximal hor. CFL number = {}'.format(float(cfl)))
-        logger.warning(' Maximal ver. CFL number = {}'.format(float(wcfl)))
-
         if vs.enable_eke or vs.enable_tke or vs.enable_idemix:
-            cfl = global_max(vs, max(
+            reduction.max('cfl_wgrid', max(
                 np.max(np.abs(vs.u_wgrid[2:-2, 2:-2, :]) * vs.maskU[2:-2, 2:-2, :]
                        / (vs.cost[np.newaxis, 2:-2, np.newaxis] * vs.dxt[2:-2, np.newaxis, np.newaxis])
                        * vs.dt_tracer),
                 np.max(np.abs(vs.v_wgrid[2:-2, 2:-2, :]) * vs.maskV[2:-2, 2:-2, :]
                        / vs.dyt[np.newaxis, 2:-2, np.newaxis] * vs.dt_tracer)
             ))
-            wcfl = global_max(vs, np.max(
+            reduction.max('wcfl_wgrid', np.max(
                 np.abs(vs.w_wgrid[2:-2, 2:-2, :]) * vs.maskW[2:-2, 2:-2, :]
                     / vs.dzt[np.newaxis, np.newaxis, :] * vs.dt_tracer
             ))
-            logger.warning(' Maximal hor. CFL number on w grid = {}'.format(float(cfl)))
-            logger.warning(' Maximal ver. CFL number on w grid = {}'.format(float(wcfl)))
+
+        res = reduction.compute()
+        cfl, wcfl = res['cfl'], res['wcfl']
+
+        if np.isnan(cfl) or np.isnan(wcfl):
+            raise RuntimeError('CFL number is NaN at iteration {}'.format(vs.itt))
+
+        logger.warning(' Maximal hor. CFL number = {}'.format(float(cfl)))
+        logger.warning(' Maximal ver. CFL number = {}'.format(float(wcfl)))
+
+        if vs.enable_eke or vs.enable_tke or vs.enable_idemix:
+            logger.warning(' Maximal hor. CFL number on w grid = {}'.format(float(res['cfl_wgrid'])))
+            logger.warning(' Maximal ver. CFL number on w grid = {}'.format(float(res['wcfl_wgrid'])))
 
     def read_restart(self, vs, infile):
         pass
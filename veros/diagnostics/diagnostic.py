@@ -124,9 +124,7 @@ class VerosDiagnostic:
 
             kwargs = dict(
                 exact=True,
-                chunks=tuple(
-                    distributed.get_local_size(vs, var.shape, var_meta[key].dims, include_overlap=False)
-                )
+                chunks=distributed.get_file_chunks(vs, var.shape, var_meta[key].dims)
             )
             if vs.enable_hdf5_gzip_compression and runtime_state.proc_num == 1:
                 kwargs.update(
@@ -3,7 +3,7 @@ import os
 from .diagnostic import VerosDiagnostic
 from .. import veros_method
 from ..variables import Variable
-from ..distributed import global_sum
+from ..distributed import GlobalReduction
 
 
 ENERGY_VARIABLES = dict(
@@ -116,53 +116,54 @@ class Energy(VerosDiagnostic):
 
     @veros_method
     def diagnose(self, vs):
+        reduction = GlobalReduction(vs)
+
         # changes of dynamic enthalpy
         vol_t = vs.area_t[2:-2, 2:-2, np.newaxis] \
             * vs.dzt[np.newaxis, np.newaxis, :] \
             * vs.maskT[2:-2, 2:-2, :]
-        dP_iso = global_sum(vs,
+        reduction.sum('dP_iso',
             np.sum(vol_t * vs.grav / vs.rho_0
                          * (-vs.int_drhodT[2:-2, 2:-2, :, vs.tau]
                            * vs.dtemp_iso[2:-2, 2:-2, :]
                            - vs.int_drhodS[2:-2, 2:-2, :, vs.tau]
                            * vs.dsalt_iso[2:-2, 2:-2, :]))
         )
-        dP_hmix = global_sum(vs,
+        reduction.sum('dP_hmix',
             np.sum(vol_t * vs.grav / vs.rho_0
                          * (-vs.int_drhodT[2:-2, 2:-2, :, vs.tau]
                             * vs.dtemp_hmix[2:-2, 2:-2, :]
                             - vs.int_drhodS[2:-2, 2:-2, :, vs.tau]
                             * vs.dsalt_hmix[2:-2, 2:-2, :]))
         )
-        dP_vmix = global_sum(vs,
+        reduction.sum('dP_vmix',
             np.sum(vol_t * vs.grav / vs.rho_0
                          * (-vs.int_drhodT[2:-2, 2:-2, :, vs.tau]
                             * vs.dtemp_vmix[2:-2, 2:-2, :]
                             - vs.int_drhodS[2:-2, 2:-2, :, vs.tau]
                             * vs.dsalt_vmix[2:-2, 2:-2, :]))
         )
-        dP_m = global_sum(vs,
+        reduction.sum('dP_m',
             np.sum(vol_t * vs.grav / vs.rho_0
                       * (-vs.int_drhodT[2:-2, 2:-2, :, vs.tau]
                           * vs.dtemp[2:-2, 2:-2, :, vs.tau]
                           - vs.int_drhodS[2:-2, 2:-2, :, vs.tau]
                           * vs.dsalt[2:-2, 2:-2, :, vs.tau]))
         )
-        dP_m_all = dP_m + dP_vmix + dP_hmix + dP_iso
 
         # changes of kinetic energy
         vol_u = vs.area_u[2:-2, 2:-2, np.newaxis] \
             * vs.dzt[np.newaxis, np.newaxis, :]
         vol_v = vs.area_v[2:-2, 2:-2, np.newaxis] \
             * vs.dzt[np.newaxis, np.newaxis, :]
-        k_m = global_sum(vs,
+        reduction.sum('k_m',
             np.sum(vol_t * 0.5 * (0.5 * (vs.u[2:-2, 2:-2, :, vs.tau] ** 2
                                            + vs.u[1:-3, 2:-2, :, vs.tau] ** 2)
                                     + 0.5 * (vs.v[2:-2, 2:-2, :, vs.tau] ** 2)
                                     + vs.v[2:-2, 1:-3, :, vs.tau] ** 2))
         )
-        p_m = global_sum(vs, np.sum(vol_t * vs.Hd[2:-2, 2:-2, :, vs.tau]))
-        dk_m = global_sum(vs,
+        reduction.sum('p_m', np.sum(vol_t * vs.Hd[2:-2, 2:-2, :, vs.tau]))
+        reduction.sum('dk_m',
             np.sum(vs.u[2:-2, 2:-2, :, vs.tau] * vs.du[2:-2, 2:-2, :, vs.tau] * vol_u
                       + vs.v[2:-2, 2:-2, :, vs.tau]
                       * vs.dv[2:-2, 2:-2, :, vs.tau] * vol_v
@@ -175,23 +176,23 @@ class Energy(VerosDiagnostic):
             * vs.maskW[2:-2, 2:-2, :]
         vol_w[:, :, -1] *= 0.5
 
-        def mean_w(var):
-            return global_sum(vs, np.sum(var[2:-2, 2:-2, :] * vol_w))
+        def mean_w(name, var):
+            reduction.sum(name, np.sum(var[2:-2, 2:-2, :] * vol_w))
 
-        mdiss_vmix = mean_w(vs.P_diss_v)
-        mdiss_nonlin = mean_w(vs.P_diss_nonlin)
-        mdiss_adv = mean_w(vs.P_diss_adv)
-        mdiss_hmix = mean_w(vs.P_diss_hmix)
-        mdiss_iso = mean_w(vs.P_diss_iso)
-        mdiss_skew = mean_w(vs.P_diss_skew)
-        mdiss_sources = mean_w(vs.P_diss_sources)
+        mean_w('mdiss_vmix', vs.P_diss_v)
+        mean_w('mdiss_nonlin', vs.P_diss_nonlin)
+        mean_w('mdiss_adv', vs.P_diss_adv)
+        mean_w('mdiss_hmix', vs.P_diss_hmix)
+        mean_w('mdiss_iso', vs.P_diss_iso)
+        mean_w('mdiss_skew', vs.P_diss_skew)
+        mean_w('mdiss_sources', vs.P_diss_sources)
 
-        mdiss_h = mean_w(vs.K_diss_h)
-        mdiss_v = mean_w(vs.K_diss_v)
-        mdiss_gm = mean_w(vs.K_diss_gm)
-        mdiss_bot = mean_w(vs.K_diss_bot)
+        mean_w('mdiss_h', vs.K_diss_h)
+        mean_w('mdiss_v', vs.K_diss_v)
+        mean_w('mdiss_gm', vs.K_diss_gm)
+        mean_w('mdiss_bot', vs.K_diss_bot)
 
-        wrhom = global_sum(vs, 
+        reduction.sum('wrhom',
             np.sum(-vs.area_t[2:-2, 2:-2, np.newaxis] * vs.maskW[2:-2, 2:-2, :-1]
                        * (vs.p_hydro[2:-2, 2:-2, 1:] - vs.p_hydro[2:-2, 2:-2, :-1])
                        * vs.w[2:-2, 2:-2, :-1, vs.tau])
@@ -199,16 +200,14 @@ class Energy(VerosDiagnostic):
 
         # wind work
         if vs.pyom_compatibility_mode:
-            wind = global_sum(
-                vs,
+            reduction.sum('wind',
                 np.sum(vs.u[2:-2, 2:-2, -1, vs.tau] * vs.surface_taux[2:-2, 2:-2]
                        * vs.maskU[2:-2, 2:-2, -1] * vs.area_u[2:-2, 2:-2]
                        + vs.v[2:-2, 2:-2, -1, vs.tau] * vs.surface_tauy[2:-2, 2:-2]
                        * vs.maskV[2:-2, 2:-2, -1] * vs.area_v[2:-2, 2:-2])
             )
         else:
-            wind = global_sum(
-                vs,
+            reduction.sum('wind',
                 np.sum(vs.u[2:-2, 2:-2, -1, vs.tau] * vs.surface_taux[2:-2, 2:-2] / vs.rho_0
                        * vs.maskU[2:-2, 2:-2, -1] * vs.area_u[2:-2, 2:-2]
                        + vs.v[2:-2, 2:-2, -1, vs.tau] * vs.surface_tauy[2:-2, 2:-2] / vs.rho_0
@@ -217,53 +216,87 @@ class Energy(VerosDiagnostic):
 
         # meso-scale energy
         if vs.enable_eke:
-            eke_m = mean_w(vs.eke[..., vs.tau])
-            deke_m = global_sum(vs,
+            mean_w('eke_m', vs.eke[..., vs.tau])
+            reduction.sum('deke_m',
                 np.sum(vol_w * (vs.eke[2:-2, 2:-2, :, vs.taup1]
                                 - vs.eke[2:-2, 2:-2, :, vs.tau])
                        / vs.dt_tracer)
             )
-            eke_diss = mean_w(vs.eke_diss_iw)
-            eke_diss_tke = mean_w(vs.eke_diss_tke)
-        else:
-            eke_m = deke_m = eke_diss_tke = 0.
-            eke_diss = mdiss_gm + mdiss_h + mdiss_skew
-            if not vs.enable_store_cabbeling_heat:
-                eke_diss += -mdiss_hmix - mdiss_iso
+            mean_w('eke_diss', vs.eke_diss_iw)
+            mean_w('eke_diss_tke', vs.eke_diss_tke)
 
         # small-scale energy
         if vs.enable_tke:
             dt_tke = vs.dt_mom
-            tke_m = mean_w(vs.tke[..., vs.tau])
-            dtke_m = mean_w((vs.tke[..., vs.taup1]
-                             - vs.tke[..., vs.tau])
-                            / dt_tke)
-            tke_diss = mean_w(vs.tke_diss)
-            tke_forc = global_sum(vs,
+            mean_w('tke_m', vs.tke[..., vs.tau])
+            mean_w('dtke_m', (vs.tke[..., vs.taup1]
+                              - vs.tke[..., vs.tau])
+                             / dt_tke)
+            mean_w('tke_diss', vs.tke_diss)
+            reduction.sum('tke_forc',
                 np.sum(vs.area_t[2:-2, 2:-2] * vs.maskW[2:-2, 2:-2, -1]
                               * (vs.forc_tke_surface[2:-2, 2:-2] + vs.tke_surf_corr[2:-2, 2:-2]))
             )
-        else:
-            tke_m = dtke_m = tke_diss = tke_forc = 0.
 
         # internal wave energy
         if vs.enable_idemix:
-            iw_m = mean_w(vs.E_iw[..., vs.tau])
-            diw_m = global_sum(vs,
+            mean_w('iw_m', vs.E_iw[..., vs.tau])
+            reduction.sum('diw_m',
                 np.sum(vol_w * (vs.E_iw[2:-2, 2:-2, :, vs.taup1]
                                     - vs.E_iw[2:-2, 2:-2, :, vs.tau])
                            / vs.dt_tracer)
             )
-            iw_diss = mean_w(vs.iw_diss)
+            mean_w('iw_diss', vs.iw_diss)
 
             k = np.maximum(1, vs.kbot[2:-2, 2:-2]) - 1
             mask = k[:, :, np.newaxis] == np.arange(vs.nz)[np.newaxis, np.newaxis, :]
-            iwforc = global_sum(vs, 
+            reduction.sum('iwforc',
                 np.sum(vs.area_t[2:-2, 2:-2]
                             * (vs.forc_iw_surface[2:-2, 2:-2] * vs.maskW[2:-2, 2:-2, -1]
                                + np.sum(mask * vs.forc_iw_bottom[2:-2, 2:-2, np.newaxis]
                                         * vs.maskW[2:-2, 2:-2, :], axis=2)))
             )
+
+        # all global sums are done at once
+        res = reduction.compute()
+
+        dP_iso, dP_hmix, dP_vmix, dP_m = res['dP_iso'], res['dP_hmix'], res['dP_vmix'], res['dP_m']
+        dP_m_all = dP_m + dP_vmix + dP_hmix + dP_iso
+        k_m, p_m, dk_m = res['k_m'], res['p_m'], res['dk_m']
+
+        mdiss_vmix = res['mdiss_vmix']
+        mdiss_nonlin = res['mdiss_nonlin']
+        mdiss_adv = res['mdiss_adv']
+        mdiss_hmix = res['mdiss_hmix']
+        mdiss_iso = res['mdiss_iso']
+        mdiss_skew = res['mdiss_skew']
+        mdiss_sources = res['mdiss_sources']
+
+        mdiss_h = res['mdiss_h']
+        mdiss_v = res['mdiss_v']
+        mdiss_gm = res['mdiss_gm']
+        mdiss_bot = res['mdiss_bot']
+
+        wrhom, wind = res['wrhom'], res['wind']
+
+        if vs.enable_eke:
+            eke_m, deke_m = res['eke_m'], res['deke_m']
+            eke_diss, eke_diss_tke = res['eke_diss'], res['eke_diss_tke']
+        else:
+            eke_m = deke_m = eke_diss_tke = 0.
+            eke_diss = mdiss_gm + mdiss_h + mdiss_skew
+            if not vs.enable_store_cabbeling_heat:
+                eke_diss += -mdiss_hmix - mdiss_iso
+
+        if vs.enable_tke:
+            tke_m, dtke_m = res['tke_m'], res['dtke_m']
+            tke_diss, tke_forc = res['tke_diss'], res['tke_forc']
+        else:
+            tke_m = dtke_m = tke_diss = tke_forc = 0.
+
+        if vs.enable_idemix:
+            iw_m, diw_m = res['iw_m'], res['diw_m']
+            iw_diss, iwforc = res['iw_diss'], res['iwforc']
         else:
             iw_m = diw_m = iwforc = 0.
             iw_diss = eke_diss
@@ -12,6 +12,12 @@ def threaded_io(vs, filepath, mode):
     If using IO threads, start a new thread to write the HDF5 data to disk.
     """
     import h5py
+    from ...local_comm import is_local_comm
+
+    if runtime_state.proc_num > 1 and is_local_comm(runtime_settings.mpi_comm):
+        raise RuntimeError('File I/O on local processes is not supported (requires MPI and parallel HDF5), '
+                           'use diskless_mode')
+
     if vs.use_io_threads:
         _wait_for_disk(vs, filepath)
         _io_locks[filepath].clear()
@@ -59,7 +59,7 @@ def initialize_variable(vs, key, var, ncfile):
         )
 
     global_shape = [ncfile.dimensions[dim] or 1 for dim in dims]
-    chunksize = distributed.get_local_size(vs, global_shape, dims, include_overlap=False)
+    chunksize = distributed.get_file_chunks(vs, global_shape, dims)
 
     # transpose all dimensions in netCDF output (convention in most ocean models)
     v = ncfile.create_variable(
@@ -125,6 +125,11 @@ def threaded_io(vs, filepath, mode):
     If using IO threads, start a new thread to write the netCDF data to disk.
     """
     import h5netcdf
+    from ...local_comm import is_local_comm
+
+    if runtime_state.proc_num > 1 and is_local_comm(rs.mpi_comm):
+        raise RuntimeError('File I/O on local processes is not supported (requires MPI and parallel HDF5), '
+                           'use diskless_mode')
 
     if vs.use_io_threads:
         _wait_for_disk(vs, filepath)
@@ -3,11 +3,11 @@ import os
 
 from loguru import logger
 
-from .. import veros_method
+from .. import veros_method, jit
 from .diagnostic import VerosDiagnostic
 from ..core import density
 from ..variables import Variable, allocate
-from ..distributed import global_sum
+from ..distributed import global_sum, GlobalReduction
 
 
 SIGMA = Variable(
@@ -41,6 +41,35 @@ ISONEUTRAL_VARIABLES = OrderedDict([
 ])
 
 
+@jit.kernel
+def _isopycnal_transport_kernel(sig_loc_face, sigma, v, dxt, cosu, dzt, maskV, trans, z_sig):
+    nx, ny, nz = sig_loc_face.shape
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                area = dzt[k] * dxt[i] * cosu[j] * maskV[i, j, k]
+                flux = v[i, j, k] * dxt[i] * cosu[j] * dzt[k] * maskV[i, j, k]
+                for m in range(sigma.shape[0]):
+                    if sig_loc_face[i, j, k] > sigma[m]:
+                        trans[j, m] += flux
+                        z_sig[j, m] += area
+
+
+@jit.kernel
+def _isopycnal_bolus_kernel(sig_loc_face, sigma, B1_gm, dxt, cosu, maskV, bolus_trans):
+    nx, ny, nz = sig_loc_face.shape
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                if k == 0:
+                    flux = B1_gm[i, j, 0] * dxt[i] * cosu[j] * maskV[i, j, 0]
+                else:
+                    flux = (B1_gm[i, j, k] - B1_gm[i, j, k - 1]) * dxt[i] * cosu[j] * maskV[i, j, k]
+                for m in range(sigma.shape[0]):
+                    if sig_loc_face[i, j, k] > sigma[m]:
+                        bolus_trans[j, m] += flux
+
+
 class Overturning(VerosDiagnostic):
     """Isopycnal overturning diagnostic. Computes and writes vertical streamfunctions
     (zonally averaged).
@@ -115,39 +144,53 @@ class Overturning(VerosDiagnostic):
         trans = allocate(vs, ('yu', self.nlevel))
         z_sig = allocate(vs, ('yu', self.nlevel))
 
-        for m in range(self.nlevel):
-            # NOTE: vectorized version would be O(N^4) in memory
-            # consider cythonizing if performance-critical
-            mask = sig_loc_face > self.sigma[m]
-            trans[2:-2, m] = global_sum(vs, np.sum(
-                vs.v[2:-2, 2:-2, :, vs.tau]
-                * vs.dxt[2:-2, np.newaxis, np.newaxis]
-                * vs.cosu[np.newaxis, 2:-2, np.newaxis]
-                * vs.dzt[np.newaxis, np.newaxis, :]
-                * vs.maskV[2:-2, 2:-2, :] * mask, axis=(0, 2)))
-            z_sig[2:-2, m] = global_sum(vs, np.sum(
-                vs.dzt[np.newaxis, np.newaxis, :]
-                * vs.dxt[2:-2, np.newaxis, np.newaxis]
-                * vs.cosu[np.newaxis, 2:-2, np.newaxis]
-                * vs.maskV[2:-2, 2:-2, :] * mask, axis=(0, 2)))
-        self.trans += trans
+        if jit.is_enabled():
+            _isopycnal_transport_kernel(
+                sig_loc_face, self.sigma, vs.v[2:-2, 2:-2, :, vs.tau], vs.dxt[2:-2],
+                vs.cosu[2:-2], vs.dzt, vs.maskV[2:-2, 2:-2, :], trans[2:-2, :], z_sig[2:-2, :]
+            )
+        else:
+            for m in range(self.nlevel):
+                # NOTE: vectorized version would be O(N^4) in memory
+                # a compiled version is used with the numba backend
+                mask = sig_loc_face > self.sigma[m]
+                trans[2:-2, m] = np.sum(
+                    vs.v[2:-2, 2:-2, :, vs.tau]
+                    * vs.dxt[2:-2, np.newaxis, np.newaxis]
+                    * vs.cosu[np.newaxis, 2:-2, np.newaxis]
+                    * vs.dzt[np.newaxis, np.newaxis, :]
+                    * vs.maskV[2:-2, 2:-2, :] * mask, axis=(0, 2))
+                z_sig[2:-2, m] = np.sum(
+                    vs.dzt[np.newaxis, np.newaxis, :]
+                    * vs.dxt[2:-2, np.newaxis, np.newaxis]
+                    * vs.cosu[np.newaxis, 2:-2, np.newaxis]
+                    * vs.maskV[2:-2, 2:-2, :] * mask, axis=(0, 2))
+
+        # all global sums are done at once
+        reduction = GlobalReduction(vs)
+        reduction.sum('trans', trans[2:-2, :])
+        reduction.sum('z_sig', z_sig[2:-2, :])
 
         if vs.enable_neutral_diffusion and vs.enable_skew_diffusion:
             bolus_trans = allocate(vs, ('yu', self.nlevel))
             # eddy-driven transports below isopycnals
-            for m in range(self.nlevel):
-                # NOTE: see above
-                mask = sig_loc_face > self.sigma[m]
-                bolus_trans[2:-2, m] = global_sum(vs,
-                    np.sum(
+            if jit.is_enabled():
+                _isopycnal_bolus_kernel(
+                    sig_loc_face, self.sigma, vs.B1_gm[2:-2, 2:-2, :], vs.dxt[2:-2],
+                    vs.cosu[2:-2], vs.maskV[2:-2, 2:-2, :], bolus_trans[2:-2, :]
+                )
+            else:
+                for m in range(self.nlevel):
+                    # NOTE: see above
+                    mask = sig_loc_face > self.sigma[m]
+                    bolus_trans[2:-2, m] = np.sum(
                         (vs.B1_gm[2:-2, 2:-2, 1:] - vs.B1_gm[2:-2, 2:-2, :-1])
                         * vs.dxt[2:-2, np.newaxis, np.newaxis]
                         * vs.cosu[np.newaxis, 2:-2, np.newaxis]
                         * vs.maskV[2:-2, 2:-2, 1:]
                         * mask[:, :, 1:],
                         axis=(0, 2)
-                    )
-                    + np.sum(
+                    ) + np.sum(
                         vs.B1_gm[2:-2, 2:-2, 0]
                         * vs.dxt[2:-2, np.newaxis]
                         * vs.cosu[np.newaxis, 2:-2]
@@ -155,21 +198,34 @@ class Overturning(VerosDiagnostic):
                         * mask[:, :, 0],
                         axis=0
                     )
-                )
+
+            reduction.sum('bolus_trans', bolus_trans[2:-2, :])
+
+            # streamfunction for eddy driven velocity on geopotentials
+            reduction.sum('bolus_depth', np.sum(
+                vs.dxt[2:-2, np.newaxis, np.newaxis]
+                * vs.cosu[np.newaxis, 2:-2, np.newaxis]
+                * vs.B1_gm[2:-2, 2:-2, :], axis=0))
 
         # streamfunction on geopotentials
-        self.vsf_depth[2:-2, :] += np.cumsum(global_sum(vs, np.sum(
+        reduction.sum('vsf_depth', np.sum(
             vs.dxt[2:-2, np.newaxis, np.newaxis]
             * vs.cosu[np.newaxis, 2:-2, np.newaxis]
             * vs.v[2:-2, 2:-2, :, vs.tau]
-            * vs.maskV[2:-2, 2:-2, :], axis=0)) * vs.dzt[np.newaxis, :], axis=1)
+            * vs.maskV[2:-2, 2:-2, :], axis=0))
+
+        res = reduction.compute()
+
+        trans[2:-2, :] = res['trans']
+        z_sig[2:-2, :] = res['z_sig']
+        self.trans += trans
+
+        self.vsf_depth[2:-2, :] += np.cumsum(res['vsf_depth'] * vs.dzt[np.newaxis, :], axis=1)
 
         if vs.enable_neutral_diffusion and vs.enable_skew_diffusion:
-            # streamfunction for eddy driven velocity on geopotentials
-            self.bolus_depth[2:-2, :] += global_sum(vs, np.sum(
-                vs.dxt[2:-2, np.newaxis, np.newaxis]
-                * vs.cosu[np.newaxis, 2:-2, np.newaxis]
-                * vs.B1_gm[2:-2, 2:-2, :], axis=0))
+            bolus_trans[2:-2, :] = res['bolus_trans']
+            self.bolus_depth[2:-2, :] += res['bolus_depth']
+
         # interpolate from isopycnals to depth
         self.vsf_iso[2:-2, :] += self._interpolate_along_axis(vs,
                                                               z_sig[2:-2, :], trans[2:-2, :],
@@ -2,7 +2,7 @@ from loguru import logger
 
 from .diagnostic import VerosDiagnostic
 from .. import veros_method
-from ..distributed import global_sum
+from ..distributed import GlobalReduction
 
 
 class TracerMonitor(VerosDiagnostic):
@@ -31,11 +31,16 @@ class TracerMonitor(VerosDiagnostic):
         """
         cell_volume = vs.area_t[2:-2, 2:-2, np.newaxis] * vs.dzt[np.newaxis, np.newaxis, :] \
             * vs.maskT[2:-2, 2:-2, :]
-        volm = global_sum(vs, np.sum(cell_volume))
-        tempm = global_sum(vs, np.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau]))
-        saltm = global_sum(vs, np.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau]))
-        vtemp = global_sum(vs, np.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau]**2))
-        vsalt = global_sum(vs, np.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau]**2))
+        reduction = GlobalReduction(vs)
+        reduction.sum('volm', np.sum(cell_volume))
+        reduction.sum('tempm', np.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau]))
+        reduction.sum('saltm', np.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau]))
+        reduction.sum('vtemp', np.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau]**2))
+        reduction.sum('vsalt', np.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau]**2))
+        res = reduction.compute()
+
+        volm, tempm, saltm = res['volm'], res['tempm'], res['saltm']
+        vtemp, vsalt = res['vtemp'], res['vsalt']
 
         logger.warning(' Mean temperature {} change to last {}'
                        .format(float(tempm / volm), float((tempm - self.tempm1) / volm)))
@@ -1,5 +1,11 @@
+import functools
+import operator
+
+from loguru import logger
+
 from . import runtime_settings as rs, runtime_state as rst
 from .decorators import veros_method, dist_context_only
+from .comm_profile import PROFILE as COMM_PROFILE
 
 
 SCATTERED_DIMENSIONS = (
@@ -16,11 +22,26 @@ def ascontiguousarray(arr):
     return arr
 
 
-@veros_method(inline=True)
-def get_array_buffer(vs, arr):
+def get_mpi_module():
+    """Module with the MPI constants and request types that belong to the current
+    communicator (``mpi4py.MPI``, or :mod:`veros.local_comm` for local processes)"""
+    from .local_comm import is_local_comm
+
+    if is_local_comm(rs.mpi_comm):
+        from . import local_comm
+        return local_comm
+
     from mpi4py import MPI
+    return MPI
 
-    MPI_TYPE_MAP = {
+
+def _get_mpi_type_map():
+    MPI = get_mpi_module()
+
+    if MPI.__name__ in _MPI_TYPE_MAPS:
+        return _MPI_TYPE_MAPS[MPI.__name__]
+
+    type_map = _MPI_TYPE_MAPS[MPI.__name__] = {
         'int8': MPI.CHAR,
         'int16': MPI.SHORT,
         'int32': MPI.INT,
@@ -30,7 +51,14 @@ def get_array_buffer(vs, arr):
         'float64': MPI.DOUBLE,
         'bool': MPI.BOOL,
     }
+    return type_map
+
+
+_MPI_TYPE_MAPS = {}
 
+
+@veros_method(inline=True)
+def get_array_buffer(vs, arr):
     if rs.backend == 'bohrium':
         if np.check(arr):
             buf = np.interop_numpy.get_array(arr)
@@ -39,31 +67,357 @@ def get_array_buffer(vs, arr):
     else:
         buf = arr
 
-    return [buf, arr.size, MPI_TYPE_MAP[str(arr.dtype)]]
+    return [buf, arr.size, _get_mpi_type_map()[str(arr.dtype)]]
+
+
+#: Smallest number of grid points a process may hold in a split direction
+#: (processes exchange overlaps of this width)
+MIN_CHUNK_SIZE = 2
 
 
 @veros_method
 def validate_decomposition(vs):
+    for dim, (n, chunk_sizes) in enumerate(zip((vs.nx, vs.ny), get_chunk_sizes(vs))):
+        direction = 'xy'[dim]
+        if len(chunk_sizes) != rs.num_proc[dim]:
+            raise ValueError('number of chunks in {}-direction ({}) does not match number of processes ({})'
+                             .format(direction, len(chunk_sizes), rs.num_proc[dim]))
+
+        if sum(chunk_sizes) != n:
+            raise ValueError('chunks in {}-direction do not add up to domain size ({} != {})'
+                             .format(direction, sum(chunk_sizes), n))
+
+        if len(chunk_sizes) > 1 and min(chunk_sizes) < MIN_CHUNK_SIZE:
+            raise ValueError('processes must hold at least {} grid points in {}-direction'
+                             .format(MIN_CHUNK_SIZE, direction))
+
     if rs.mpi_comm is None:
         if (rs.num_proc[0] > 1 or rs.num_proc[1] > 1):
             raise RuntimeError('mpi4py is required for distributed execution')
         return
 
     comm_size = rs.mpi_comm.Get_size()
-    proc_num = rs.num_proc[0] * rs.num_proc[1]
+    proc_num = rs.num_proc[0] * rs.num_proc[1] - len(rs.land_blocks)
     if proc_num != comm_size:
         raise RuntimeError('number of processes ({}) does not match size of communicator ({})'
                            .format(proc_num, comm_size))
 
-    if vs.nx % rs.num_proc[0]:
-        raise ValueError('processes do not divide domain evenly in x-direction')
 
-    if vs.ny % rs.num_proc[1]:
-        raise ValueError('processes do not divide domain evenly in y-direction')
+@functools.lru_cache(maxsize=None)
+def get_uniform_chunk_sizes(n, num_chunks):
+    """Splits ``n`` grid points into ``num_chunks`` chunks whose sizes differ by at most one"""
+    return tuple(n * (i + 1) // num_chunks - n * i // num_chunks for i in range(num_chunks))
+
+
+def get_balanced_chunk_sizes(weights, num_chunks, min_size=MIN_CHUNK_SIZE):
+    """Splits a sequence of ``weights`` into ``num_chunks`` contiguous chunks of similar
+    total weight, each holding at least ``min_size`` elements. Returns the chunk sizes."""
+    import bisect
+    import itertools
+
+    n = len(weights)
+    cumulative = list(itertools.accumulate(weights))
+    total = cumulative[-1] if cumulative else 0
+
+    if total <= 0:
+        return get_uniform_chunk_sizes(n, num_chunks)
+
+    bounds = [0]
+    for i in range(1, num_chunks):
+        target = total * i / num_chunks
+        # first bound that includes the target, or the one before if that is closer
+        bound = bisect.bisect_left(cumulative, target) + 1
+        if bound > 1 and target - cumulative[bound - 2] < cumulative[bound - 1] - target:
+            bound -= 1
+        bound = max(bound, bounds[-1] + min_size)
+        bound = min(bound, n - (num_chunks - i) * min_size)
+        bounds.append(bound)
+    bounds.append(n)
+
+    return tuple(upper - lower for lower, upper in zip(bounds[:-1], bounds[1:]))
+
+
+def get_chunk_sizes(vs):
+    """Number of grid points held by each process in x and y-direction"""
+    chunk_sizes = getattr(vs, 'chunk_sizes', None)
+    if chunk_sizes is not None:
+        return chunk_sizes
+    return (get_uniform_chunk_sizes(vs.nx, rs.num_proc[0]), get_uniform_chunk_sizes(vs.ny, rs.num_proc[1]))
+
+
+def get_chunk_size(vs, proc_idx=None):
+    if proc_idx is None:
+        proc_idx = proc_rank_to_index(rst.proc_rank)
+
+    chunks_x, chunks_y = get_chunk_sizes(vs)
+    return (chunks_x[proc_idx[0]], chunks_y[proc_idx[1]])
+
+
+@veros_method
+def balance_decomposition(vs, kbot=None):
+    """Chooses chunk sizes such that all processes hold a similar number of wet grid
+    cells, and stores them in ``vs.chunk_sizes``.
+
+    Wet cells are derived from ``kbot`` of the whole domain (including overlap), which
+    is gathered from ``vs.kbot`` if not given. Process boundaries are shared by entire
+    rows and columns of processes, so the number of wet cells is balanced separately
+    for all columns and all rows of the domain. Returns whether the decomposition changed.
+    """
+    if rs.num_proc == (1, 1):
+        return False
+
+    if kbot is None:
+        kbot = gather(vs, vs.kbot, ('xt', 'yt'))
+
+    if rst.proc_rank == 0:
+        wet_cells = _get_wet_cells(vs, kbot)
+        chunk_sizes = (
+            get_balanced_chunk_sizes(wet_cells.sum(axis=1).tolist(), rs.num_proc[0]),
+            get_balanced_chunk_sizes(wet_cells.sum(axis=0).tolist(), rs.num_proc[1]),
+        )
+    else:
+        chunk_sizes = None
+
+    chunk_sizes = broadcast(vs, chunk_sizes)
+    changed = chunk_sizes != get_chunk_sizes(vs)
+    vs.chunk_sizes = chunk_sizes
+    return changed
+
+
+def get_land_blocks(vs, kbot):
+    """Blocks of the decomposition that contain only land (including their overlap),
+    given ``kbot`` of the whole domain (including overlap).
+
+    Land within two cells of the ocean (e.g. island boundaries) is never part of such
+    a block. Every row and column of blocks keeps at least one block, so that variables
+    that only depend on x or y can be gathered from the remaining blocks.
+    """
+    return _find_land_blocks(kbot > 0, get_chunk_sizes(vs))
+
+
+def _find_land_blocks(wet, chunk_sizes):
+    """Land blocks for the given chunk sizes, where ``wet`` marks the wet cells of the
+    whole domain (including overlap)"""
+    import numpy
+
+    chunks_x, chunks_y = chunk_sizes
+    land_blocks = []
+    active_x = [len(chunks_y)] * len(chunks_x)
+    active_y = [len(chunks_x)] * len(chunks_y)
+
+    # wet cells in every block (including overlap), from a summed-area table
+    table = numpy.zeros((wet.shape[0] + 1, wet.shape[1] + 1), dtype='int64')
+    table[1:, 1:] = numpy.asarray(wet).cumsum(axis=0).cumsum(axis=1)
+    start_x = numpy.array(_get_offsets(chunks_x))
+    start_y = numpy.array(_get_offsets(chunks_y))
+    end_x, end_y = start_x + numpy.array(chunks_x) + 4, start_y + numpy.array(chunks_y) + 4
+    wet_blocks = (
+        table[numpy.ix_(end_x, end_y)] - table[numpy.ix_(start_x, end_y)]
+        - table[numpy.ix_(end_x, start_y)] + table[numpy.ix_(start_x, start_y)]
+    )
+
+    for iy in range(len(chunks_y)):
+        for ix in range(len(chunks_x)):
+            if wet_blocks[ix, iy] or active_x[ix] == 1 or active_y[iy] == 1:
+                continue
+
+            land_blocks.append((ix, iy))
+            active_x[ix] -= 1
+            active_y[iy] -= 1
+
+    return tuple(land_blocks)
+
+
+def eliminate_land_blocks(vs, kbot):
+    """Removes all blocks that contain only land from the decomposition (see
+    :func:`get_land_blocks`), so that no process is assigned to them.
+
+    Overlaps facing a removed block are never exchanged, so they keep the values they
+    had when the array was scattered. Gathered arrays are zero on removed blocks.
+    Land cells this far from the ocean do not influence the solution.
+    """
+    land_blocks = get_land_blocks(vs, kbot)
+    num_blocks = rs.num_proc[0] * rs.num_proc[1] - len(land_blocks)
+
+    if rs.mpi_comm is not None and num_blocks != rs.mpi_comm.Get_size():
+        raise RuntimeError(
+            'decomposition into {}x{} blocks has {} blocks that contain only land, '
+            'start with {} processes to run without them (got {})'
+            .format(*rs.num_proc, len(land_blocks), num_blocks, rs.mpi_comm.Get_size())
+        )
+
+    rs.land_blocks = land_blocks
+
+
+#: Estimated cost of exchanging the overlap of one grid point, relative to the
+#: computation on one wet grid point (used to choose decompositions automatically)
+HALO_COST_FACTOR = 4.
+
+
+def _get_offsets(chunk_sizes):
+    offsets = [0]
+    for size in chunk_sizes[:-1]:
+        offsets.append(offsets[-1] + size)
+    return offsets
+
+
+@veros_method(inline=True)
+def _get_wet_cells(vs, kbot):
+    """Number of wet grid cells in every column, given ``kbot`` of the whole domain
+    (including overlap)"""
+    kbot = kbot[2:-2, 2:-2]
+    wet_cells = np.where(kbot > 0, vs.nz + 1 - kbot, 0)
+
+    try:
+        wet_cells = wet_cells.copy2numpy()
+    except AttributeError:
+        pass
+
+    return wet_cells
+
 
+def get_decomposition_cost(wet_cells, nz, chunk_sizes, land_blocks=(), cyclic_x=False):
+    """Estimated cost of a time step on the slowest process of a decomposition.
 
-def get_chunk_size(vs):
-    return (vs.nx // rs.num_proc[0], vs.ny // rs.num_proc[1])
+    Returns ``(cost, work, halo, imbalance)``: ``work`` is the number of wet grid
+    points of that process, ``halo`` the number of grid points it exchanges in the
+    overlap exchange of a 3D array, and ``cost = work + HALO_COST_FACTOR * halo``.
+    ``imbalance`` is the ratio of the largest to the mean number of wet grid points.
+    """
+    import numpy
+
+    chunks_x, chunks_y = chunk_sizes
+    px, py = len(chunks_x), len(chunks_y)
+
+    work = numpy.add.reduceat(wet_cells, _get_offsets(chunks_x), axis=0)
+    work = numpy.add.reduceat(work, _get_offsets(chunks_y), axis=1)
+
+    def is_active(ix, iy):
+        if cyclic_x and px > 1:
+            ix %= px
+        return 0 <= ix < px and 0 <= iy < py and (ix, iy) not in land_blocks
+
+    blocks = []
+    for iy in range(py):
+        for ix in range(px):
+            if not is_active(ix, iy):
+                continue
+
+            num_neighbors_x = is_active(ix - 1, iy) + is_active(ix + 1, iy)
+            num_neighbors_y = is_active(ix, iy - 1) + is_active(ix, iy + 1)
+            halo = 2 * nz * (num_neighbors_x * chunks_y[iy] + num_neighbors_y * chunks_x[ix])
+            block_work = int(work[ix, iy])
+            blocks.append((block_work + HALO_COST_FACTOR * halo, block_work, halo))
+
+    cost, block_work, halo = max(blocks)
+    mean_work = sum(b[1] for b in blocks) / len(blocks)
+    imbalance = max(b[1] for b in blocks) / mean_work if mean_work > 0 else 1.
+    return cost, block_work, halo, imbalance
+
+
+def find_decomposition(num_procs, wet_cells, nz, cyclic_x=False, balanced=False, wet=None):
+    """Finds the decomposition into ``num_procs`` processes with the lowest estimated
+    cost (see :func:`get_decomposition_cost`).
+
+    ``wet_cells`` is the number of wet cells in every column of the domain (without
+    overlap). If ``balanced`` is given, chunk sizes are balanced by wet cells (see
+    :func:`balance_decomposition`). If ``wet`` (a mask of wet cells including overlap)
+    is given, blocks that contain only land are not assigned a process (see
+    :func:`eliminate_land_blocks`), and more blocks than processes are considered.
+
+    Returns ``(num_proc, chunk_sizes, land_blocks, cost)``, where ``cost`` is the
+    return value of :func:`get_decomposition_cost`.
+    """
+    nx, ny = wet_cells.shape
+    max_blocks = num_procs if wet is None else 2 * num_procs
+
+    candidates = []
+    for px in range(1, min(nx, max_blocks) + 1):
+        for py in range(1, min(ny, max_blocks // px) + 1):
+            if px * py < num_procs:
+                continue
+
+            if (px > 1 and nx // px < MIN_CHUNK_SIZE) or (py > 1 and ny // py < MIN_CHUNK_SIZE):
+                continue
+
+            if balanced:
+                chunk_sizes = (
+                    get_balanced_chunk_sizes(wet_cells.sum(axis=1).tolist(), px),
+                    get_balanced_chunk_sizes(wet_cells.sum(axis=0).tolist(), py),
+                )
+            else:
+                chunk_sizes = (get_uniform_chunk_sizes(nx, px), get_uniform_chunk_sizes(ny, py))
+
+            land_blocks = ()
+            if wet is not None:
+                land_blocks = _find_land_blocks(wet, chunk_sizes)
+
+            if px * py - len(land_blocks) != num_procs:
+                continue
+
+            cost = get_decomposition_cost(wet_cells, nz, chunk_sizes, land_blocks, cyclic_x)
+            candidates.append((cost, (px, py), chunk_sizes, land_blocks))
+
+    if not candidates:
+        raise RuntimeError('could not find a decomposition of a {}x{} domain into {} processes'
+                           .format(nx, ny, num_procs))
+
+    cost, num_proc, chunk_sizes, land_blocks = min(candidates)
+    return num_proc, chunk_sizes, land_blocks, cost
+
+
+@veros_method
+def choose_decomposition(vs, kbot=None):
+    """Chooses the number of processes in x and y-direction (for ``num_proc='auto'``)
+    such that the estimated cost of a time step on the slowest process is minimal,
+    and stores it in ``rs.num_proc``. The chunk sizes (if balanced) and land blocks
+    (if eliminated) of the chosen decomposition are stored as well.
+
+    ``kbot`` of the whole domain (including overlap) is used to estimate the work of
+    every process; if it is not given, all grid points are assumed to be wet. It is
+    only needed on the first process, which searches for the decomposition and
+    broadcasts it to all others.
+    """
+    num_procs = 1 if rs.mpi_comm is None else rs.mpi_comm.Get_size()
+
+    if num_procs == 1:
+        rs.num_proc = (1, 1)
+        return
+
+    decomposition = None
+    if rst.proc_rank == 0:
+        if kbot is None:
+            kbot = np.ones((vs.nx + 4, vs.ny + 4), dtype='int')
+
+        wet = None
+        if vs.enable_land_block_elimination:
+            wet = np.asarray(kbot) > 0
+
+        decomposition = find_decomposition(
+            num_procs, _get_wet_cells(vs, kbot), vs.nz, cyclic_x=vs.enable_cyclic_x,
+            balanced=vs.enable_balanced_decomposition, wet=wet
+        )
+
+    num_proc, chunk_sizes, land_blocks, (cost, work, halo, imbalance) = broadcast(vs, decomposition)
+
+    logger.info(
+        ' Decomposing domain into {}x{} blocks ({} land blocks), estimated cost per process: '
+        '{} wet grid points, {} overlap grid points per exchange (imbalance {:.2f})',
+        *num_proc, len(land_blocks), work, halo, imbalance
+    )
+    rs.num_proc = num_proc
+
+    if vs.enable_balanced_decomposition:
+        vs.chunk_sizes = chunk_sizes
+
+    if vs.enable_land_block_elimination:
+        rs.land_blocks = land_blocks
+
+
+def get_chunk_offset(vs, proc_idx):
+    """Global index of the first grid point held by process ``proc_idx`` in x and y-direction"""
+    chunks_x, chunks_y = get_chunk_sizes(vs)
+    return (sum(chunks_x[:proc_idx[0]]), sum(chunks_y[:proc_idx[1]]))
 
 
 def get_global_size(vs, arr_shp, dim_grid, include_overlap=False):
@@ -79,24 +433,52 @@ def get_global_size(vs, arr_shp, dim_grid, include_overlap=False):
     return shape
 
 
-def get_local_size(vs, arr_shp, dim_grid, include_overlap=False):
+def get_local_size(vs, arr_shp, dim_grid, include_overlap=False, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = get_chunk_size(vs)
+
     ovl = 4 if include_overlap else 0
     shape = []
     for s, dim in zip(arr_shp, dim_grid):
         if dim in SCATTERED_DIMENSIONS[0]:
-            shape.append(vs.nx // rs.num_proc[0] + ovl)
+            shape.append(chunk_size[0] + ovl)
         elif dim in SCATTERED_DIMENSIONS[1]:
-            shape.append(vs.ny // rs.num_proc[1] + ovl)
+            shape.append(chunk_size[1] + ovl)
         else:
             shape.append(s)
     return shape
 
 
+def get_file_chunks(vs, arr_shp, dim_grid):
+    """Chunk layout for output files (identical on all processes)"""
+    chunk_size = tuple(max(chunks) for chunks in get_chunk_sizes(vs))
+    return tuple(get_local_size(vs, arr_shp, dim_grid, chunk_size=chunk_size))
+
+
+@functools.lru_cache()
+def _get_active_blocks(num_proc, land_blocks):
+    """Blocks that are assigned to a process, ordered by rank"""
+    return tuple(
+        (ix, iy) for iy in range(num_proc[1]) for ix in range(num_proc[0])
+        if (ix, iy) not in land_blocks
+    )
+
+
+@functools.lru_cache()
+def _get_block_ranks(num_proc, land_blocks):
+    return {block: rank for rank, block in enumerate(_get_active_blocks(num_proc, land_blocks))}
+
+
 def proc_rank_to_index(rank):
+    if rs.land_blocks:
+        return _get_active_blocks(rs.num_proc, rs.land_blocks)[rank]
     return (rank % rs.num_proc[0], rank // rs.num_proc[0])
 
 
 def proc_index_to_rank(ix, iy):
+    """Rank of the process holding block ``(ix, iy)``, or ``None`` for eliminated blocks"""
+    if rs.land_blocks:
+        return _get_block_ranks(rs.num_proc, rs.land_blocks).get((ix, iy))
     return ix + iy * rs.num_proc[0]
 
 
@@ -105,7 +487,8 @@ def get_chunk_slices(vs, dim_grid, proc_idx=None, include_overlap=False):
         proc_idx = proc_rank_to_index(rst.proc_rank)
 
     px, py = proc_idx
-    nx, ny = get_chunk_size(vs)
+    nx, ny = get_chunk_size(vs, proc_idx)
+    ox, oy = get_chunk_offset(vs, proc_idx)
 
     if include_overlap:
         sxl = 0 if px == 0 else 2
@@ -121,10 +504,10 @@ def get_chunk_slices(vs, dim_grid, proc_idx=None, include_overlap=False):
 
     for dim in dim_grid:
         if dim in SCATTERED_DIMENSIONS[0]:
-            global_slice.append(slice(sxl + px * nx, sxu + px * nx))
+            global_slice.append(slice(sxl + ox, sxu + ox))
             local_slice.append(slice(sxl, sxu))
         elif dim in SCATTERED_DIMENSIONS[1]:
-            global_slice.append(slice(syl + py * ny, syu + py * ny))
+            global_slice.append(slice(syl + oy, syu + oy))
             local_slice.append(slice(syl, syu))
         else:
             global_slice.append(slice(None))
@@ -133,13 +516,47 @@ def get_chunk_slices(vs, dim_grid, proc_idx=None, include_overlap=False):
     return tuple(global_slice), tuple(local_slice)
 
 
+def _get_chunk_window(vs, dim_grid, proc_idx):
+    """Global slice of the whole local array of process ``proc_idx``, including its overlap"""
+    nx, ny = get_chunk_size(vs, proc_idx)
+    ox, oy = get_chunk_offset(vs, proc_idx)
+
+    window = []
+    for dim in dim_grid:
+        if dim in SCATTERED_DIMENSIONS[0]:
+            window.append(slice(ox, ox + nx + 4))
+        elif dim in SCATTERED_DIMENSIONS[1]:
+            window.append(slice(oy, oy + ny + 4))
+        else:
+            window.append(slice(None))
+    return tuple(window)
+
+
 def get_process_neighbors(vs):
-    this_x, this_y = proc_rank_to_index(rst.proc_rank)
+    """Ranks of the neighbors of this process, in the order west, south, east, north,
+    south-west, south-east, north-east, north-west (``None`` if there is no neighbor).
+
+    With cyclic boundary conditions, processes at the western and eastern edge of the
+    domain are neighbors of each other (unless there is only one process in x-direction,
+    in which case the cyclic boundaries are copied locally).
+    """
+    cyclic_x = vs.enable_cyclic_x and rs.num_proc[0] > 1
+    return _get_process_neighbors(rst.proc_rank, rs.num_proc, rs.land_blocks, cyclic_x)
+
+
+@functools.lru_cache()
+def _get_process_neighbors(rank, num_proc, land_blocks, cyclic_x=False):
+    this_x, this_y = _get_active_blocks(num_proc, land_blocks)[rank]
+
+    if cyclic_x:
+        west = (this_x - 1) % num_proc[0]
+        east = (this_x + 1) % num_proc[0]
+    else:
+        west = this_x - 1 if this_x > 0 else None
+        east = this_x + 1 if (this_x + 1) < num_proc[0] else None
 
-    west = this_x - 1 if this_x > 0 else None
     south = this_y - 1 if this_y > 0 else None
-    east = this_x + 1 if (this_x + 1) < rs.num_proc[0] else None
-    north = this_y + 1 if (this_y + 1) < rs.num_proc[1] else None
+    north = this_y + 1 if (this_y + 1) < num_proc[1] else None
 
     neighbors = [
         # direct neighbors
@@ -154,15 +571,67 @@ def get_process_neighbors(vs):
         (west, north),
     ]
 
-    global_neighbors = [
-        proc_index_to_rank(*i) if None not in i else None for i in neighbors
-    ]
+    block_ranks = _get_block_ranks(num_proc, land_blocks)
+    global_neighbors = tuple(
+        block_ranks.get((ix, iy)) if None not in (ix, iy) else None for ix, iy in neighbors
+    )
     return global_neighbors
 
 
-@dist_context_only
-@veros_method
-def exchange_overlap(vs, arr, var_grid):
+# overlap strips in the order of get_process_neighbors
+_OVERLAP_SLICES_FROM_XY = (
+    (slice(2, 4), slice(0, None), Ellipsis), # west
+    (slice(0, None), slice(2, 4), Ellipsis), # south
+    (slice(-4, -2), slice(0, None), Ellipsis), # east
+    (slice(0, None), slice(-4, -2), Ellipsis), # north
+    (slice(2, 4), slice(2, 4), Ellipsis), # south-west
+    (slice(-4, -2), slice(2, 4), Ellipsis), # south-east
+    (slice(-4, -2), slice(-4, -2), Ellipsis), # north-east
+    (slice(2, 4), slice(-4, -2), Ellipsis), # north-west
+)
+
+_OVERLAP_SLICES_TO_XY = (
+    (slice(0, 2), slice(0, None), Ellipsis), # west
+    (slice(0, None), slice(0, 2), Ellipsis), # south
+    (slice(-2, None), slice(0, None), Ellipsis), # east
+    (slice(0, None), slice(-2, None), Ellipsis), # north
+    (slice(0, 2), slice(0, 2), Ellipsis), # south-west
+    (slice(-2, None), slice(0, 2), Ellipsis), # south-east
+    (slice(-2, None), slice(-2, None), Ellipsis), # north-east
+    (slice(0, 2), slice(-2, None), Ellipsis), # north-west
+)
+
+# flipped indices of overlap (n <-> s, w <-> e)
+_SEND_TO_RECV_XY = [2, 3, 0, 1, 6, 7, 4, 5]
+
+
+_OVERLAP_SLICES_FROM_1D = (
+    (slice(2, 4), Ellipsis),
+    (slice(-4, -2), Ellipsis),
+)
+
+_OVERLAP_SLICES_TO_1D = (
+    (slice(0, 2), Ellipsis),
+    (slice(-2, None), Ellipsis),
+)
+
+_SEND_TO_RECV_1D = [1, 0]
+
+# tag offset of packed messages, to keep them apart from messages of exchange_overlap
+_PACKED_TAG = 100
+
+
+def _is_xy_grid(var_grid):
+    return (
+        len(var_grid) >= 2
+        and var_grid[0] in SCATTERED_DIMENSIONS[0] and var_grid[1] in SCATTERED_DIMENSIONS[1]
+    )
+
+
+def _get_overlap_layout(vs, var_grid):
+    """Kind of exchange, neighbors, slices to send from / receive to, and the index of the
+    matching message at the receiver for every neighbor of an array on ``var_grid``.
+    Returns ``None`` if the array is not distributed."""
     if len(var_grid) < 2:
         d1, d2 = var_grid[0], None
     else:
@@ -170,55 +639,485 @@ def exchange_overlap(vs, arr, var_grid):
 
     if d1 not in SCATTERED_DIMENSIONS[0] and d1 not in SCATTERED_DIMENSIONS[1] and d2 not in SCATTERED_DIMENSIONS[1]:
         # neither x nor y dependent, nothing to do
-        return arr
+        return None
 
     if d1 in SCATTERED_DIMENSIONS[0] and d2 in SCATTERED_DIMENSIONS[1]:
-        proc_neighbors = get_process_neighbors(vs)
-
-        overlap_slices_from = (
-            (slice(2, 4), slice(0, None), Ellipsis), # west
-            (slice(0, None), slice(2, 4), Ellipsis), # south
-            (slice(-4, -2), slice(0, None), Ellipsis), # east
-            (slice(0, None), slice(-4, -2), Ellipsis), # north
-            (slice(2, 4), slice(2, 4), Ellipsis), # south-west
-            (slice(-4, -2), slice(2, 4), Ellipsis), # south-east
-            (slice(-4, -2), slice(-4, -2), Ellipsis), # north-east
-            (slice(2, 4), slice(-4, -2), Ellipsis), # north-west
+        return (
+            'xy', get_process_neighbors(vs),
+            _OVERLAP_SLICES_FROM_XY, _OVERLAP_SLICES_TO_XY, _SEND_TO_RECV_XY
         )
 
-        overlap_slices_to = (
-            (slice(0, 2), slice(0, None), Ellipsis), # west
-            (slice(0, None), slice(0, 2), Ellipsis), # south
-            (slice(-2, None), slice(0, None), Ellipsis), # east
-            (slice(0, None), slice(-2, None), Ellipsis), # north
-            (slice(0, 2), slice(0, 2), Ellipsis), # south-west
-            (slice(-2, None), slice(0, 2), Ellipsis), # south-east
-            (slice(-2, None), slice(-2, None), Ellipsis), # north-east
-            (slice(0, 2), slice(-2, None), Ellipsis), # north-west
-        )
+    if d1 in SCATTERED_DIMENSIONS[0]:
+        kind, proc_neighbors = 'x', get_process_neighbors(vs)[0:4:2] # west and east
+    elif d1 in SCATTERED_DIMENSIONS[1]:
+        kind, proc_neighbors = 'y', get_process_neighbors(vs)[1:4:2] # south and north
+    else:
+        raise NotImplementedError()
+
+    return kind, proc_neighbors, _OVERLAP_SLICES_FROM_1D, _OVERLAP_SLICES_TO_1D, _SEND_TO_RECV_1D
+
+
+def _get_strip_shape(shape, idx):
+    """Shape of ``arr[idx]`` for an array of shape ``shape`` and an overlap slice ``idx``"""
+    strip_shape = [len(range(*s.indices(n))) for n, s in zip(shape, idx[:-1])]
+    return tuple(strip_shape) + tuple(shape[len(idx) - 1:])
+
+
+def _get_strip_size(shapes, idx):
+    """Total number of elements in the overlap strips ``arr[idx]`` of arrays with the
+    given shapes"""
+    return sum(
+        functools.reduce(operator.mul, _get_strip_shape(shape, idx), 1) for shape in shapes
+    )
+
+
+def _get_strip_views(buf, shapes, idx, offset=0):
+    """Views into the flat buffer ``buf`` (from ``offset`` on) that hold the overlap
+    strips ``arr[idx]`` of arrays with the given shapes"""
+    views = []
+    for shape in shapes:
+        strip_shape = _get_strip_shape(shape, idx)
+        strip_size = functools.reduce(operator.mul, strip_shape, 1)
+        views.append(buf[offset:offset + strip_size].reshape(strip_shape))
+        offset += strip_size
+    return views
+
+
+class _HaloPlan:
+    """Persistent MPI requests and buffers for exchanging the overlap of arrays with
+    fixed shapes and data type.
+
+    Overlap strips of all arrays are packed into a single message per neighbor.
+    """
+    def __init__(self, shapes, dtype, layout, tag):
+        MPI = get_mpi_module()
+
+        _, proc_neighbors, _, _, _ = layout
+
+        self.in_use = False
+        self.requests = []
+        self.sends = []
+        self.receives = []
+
+        for i_s, other_proc in enumerate(proc_neighbors):
+            if other_proc is None:
+                continue
+            self._add_message_neighbor(shapes, dtype, layout, tag, i_s)
+
+        self._startall = MPI.Prequest.Startall
+        self._waitall = MPI.Request.Waitall
+
+    def _add_message_neighbor(self, shapes, dtype, layout, tag, i_s):
+        self._add_message_receive(shapes, dtype, layout, tag, i_s)
+        self._add_message_send(shapes, dtype, layout, tag, i_s)
+
+    def _add_message_receive(self, shapes, dtype, layout, tag, i_s):
+        from .backend import get_backend
+
+        numpy = get_backend('numpy')
+        mpi_type = _get_mpi_type_map()[str(dtype)]
+        _, proc_neighbors, _, slices_to, send_to_recv = layout
+
+        recv_idx = slices_to[i_s]
+        recv_buf = numpy.empty(_get_strip_size(shapes, recv_idx), dtype=dtype)
+        recv_views = _get_strip_views(recv_buf, shapes, recv_idx)
+        self.requests.append(rs.mpi_comm.Recv_init(
+            [recv_buf, recv_buf.size, mpi_type], source=proc_neighbors[i_s], tag=tag + send_to_recv[i_s]
+        ))
+        self.receives.append((recv_idx, recv_views))
+
+    def _add_message_send(self, shapes, dtype, layout, tag, i_s):
+        from .backend import get_backend
+
+        numpy = get_backend('numpy')
+        mpi_type = _get_mpi_type_map()[str(dtype)]
+        _, proc_neighbors, slices_from, _, _ = layout
+
+        send_idx = slices_from[i_s]
+        send_buf = numpy.empty(_get_strip_size(shapes, send_idx), dtype=dtype)
+        send_views = _get_strip_views(send_buf, shapes, send_idx)
+        self.requests.append(rs.mpi_comm.Send_init(
+            [send_buf, send_buf.size, mpi_type], dest=proc_neighbors[i_s], tag=tag + i_s
+        ))
+        self.sends.append((send_idx, send_views, send_buf.nbytes))
 
-        # flipped indices of overlap (n <-> s, w <-> e)
-        send_to_recv = [2, 3, 0, 1, 6, 7, 4, 5]
+    def start(self, arrays):
+        for send_idx, send_views, nbytes in self.sends:
+            for send_view, arr in zip(send_views, arrays):
+                send_view[...] = arr[send_idx]
+            COMM_PROFILE.add_message(nbytes)
 
+        if self.requests:
+            self._startall(self.requests)
+
+    def finish(self, arrays):
+        if self.requests:
+            with COMM_PROFILE.waiting():
+                self._waitall(self.requests)
+
+        for recv_idx, recv_views in self.receives:
+            for recv_view, arr in zip(recv_views, arrays):
+                arr[recv_idx] = recv_view
+
+    def free(self):
+        for request in self.requests:
+            request.Free()
+
+
+#: Size of the shared memory segment of every process in bytes, from which halo plans
+#: allocate their strips (exchanges with plans that do not fit use messages)
+SHARED_SEGMENT_SIZE = 64 * 1024 ** 2
+
+# tag offset of the messages that announce the location of shared strips
+_SHARED_SETUP_TAG = 200
+
+
+def _yield_processor():
+    import os
+    import time
+
+    if hasattr(os, 'sched_yield'):
+        os.sched_yield()
     else:
-        if d1 in SCATTERED_DIMENSIONS[0]:
-            proc_neighbors = get_process_neighbors(vs)[0:4:2] # west and east
-        elif d1 in SCATTERED_DIMENSIONS[1]:
-            proc_neighbors = get_process_neighbors(vs)[1:4:2] # south and north
+        time.sleep(0)
+
+
+class _SharedSegments:
+    """An MPI-3 shared memory window over all processes of a node, in which every
+    process holds one segment.
+
+    The window is created together with the node communicator, and both are freed
+    once the halo plan cache is cleared and the last plan using them is freed. Halo
+    plans allocate their strips from the segment of their process without
+    communication (memory is only reclaimed when the window is freed). The window is
+    locked for its whole lifetime, so processes synchronize through flag words and
+    ``Win.Sync``.
+    """
+    def __init__(self, node_comm, size=SHARED_SEGMENT_SIZE):
+        from mpi4py import MPI
+
+        self.node_comm = node_comm
+        self.win = MPI.Win.Allocate_shared(size, 8, comm=node_comm)
+        self.win.Lock_all()
+        self.size = size
+        self.used = 0
+        self.users = 0
+        self.retired = False
+        self._segments = {}
+
+    def allocate(self, nbytes):
+        """Offset of ``nbytes`` in the own segment, or ``None`` if it is full"""
+        offset = self.used
+        if offset + nbytes > self.size:
+            return None
+        # keep flag words aligned
+        self.used += -(-nbytes // 8) * 8
+        return offset
+
+    def get_segment(self, node_rank):
+        """The segment of a process on this node as flat byte array"""
+        from .backend import get_backend
+
+        segment = self._segments.get(node_rank)
+        if segment is None:
+            buf, _ = self.win.Shared_query(node_rank)
+            segment = self._segments[node_rank] = get_backend('numpy').frombuffer(buf, dtype='uint8')
+        return segment
+
+    def wait(self, flag, value):
+        """Waits until another process sets ``flag`` (an int64 array) to at least ``value``"""
+        while flag[0] < value:
+            # keep messages of other exchanges moving, and let the neighbor run on
+            # oversubscribed nodes
+            self.node_comm.Iprobe()
+            _yield_processor()
+            self.win.Sync()
+        self.win.Sync()
+
+    def retain(self):
+        self.users += 1
+
+    def release(self):
+        self.users -= 1
+        if self.retired and not self.users:
+            self._free()
+
+    def retire(self):
+        """Frees the window once no plan uses it anymore"""
+        self.retired = True
+        if not self.users:
+            self._free()
+
+    def _free(self):
+        self._segments = {}
+        self.win.Unlock_all()
+        self.win.Free()
+        self.node_comm.Free()
+
+
+class _SharedStrip:
+    """Overlap strips sent to an on-node neighbor, in the segment of the sender.
+
+    Two int64 flag words precede the strips: the number of the last exchange whose
+    strips were written (set by the sender), and the number of the last exchange
+    whose strips were read (set by the receiver).
+    """
+    HEADER_SIZE = 16
+
+    def __init__(self, segment, offset, shapes, dtype, idx):
+        size = _get_strip_size(shapes, idx) * dtype.itemsize
+        header = segment[offset:offset + self.HEADER_SIZE].view('int64')
+        self.written = header[0:1]
+        self.read = header[1:2]
+        data = segment[offset + self.HEADER_SIZE:offset + self.HEADER_SIZE + size].view(dtype)
+        self.views = _get_strip_views(data, shapes, idx)
+
+    @classmethod
+    def get_size(cls, shapes, dtype, idx):
+        return cls.HEADER_SIZE + _get_strip_size(shapes, idx) * dtype.itemsize
+
+
+class _SharedHaloPlan(_HaloPlan):
+    """Halo plan that exchanges overlap strips with neighbors on the same node through
+    a shared memory window (see :class:`_SharedSegments`), and with all other neighbors
+    through messages.
+
+    Every process writes the strips for its on-node neighbors into its own segment, and
+    the neighbors copy them from there. Processes only wait for their neighbors: a
+    receiver waits until the strips of the current exchange are written, and a sender
+    waits until the strips of the previous exchange are read before overwriting them.
+
+    On creation, the plan tells its on-node neighbors where its strips are (or that they
+    are sent as messages) and waits for the same information from them, so neighbors
+    have to exchange the same sequence of arrays (as for message matching). Creating
+    and freeing plans is not collective.
+    """
+    def __init__(self, shapes, dtype, layout, tag, segments):
+        from mpi4py import MPI
+
+        _, proc_neighbors, slices_from, slices_to, send_to_recv = layout
+
+        node_comm = segments.node_comm
+        neighbor_ranks = [other_proc for other_proc in proc_neighbors if other_proc is not None]
+        node_ranks = MPI.Group.Translate_ranks(
+            rs.mpi_comm.Get_group(), neighbor_ranks, node_comm.Get_group()
+        )
+        on_node = {
+            other_proc: node_rank for other_proc, node_rank in zip(neighbor_ranks, node_ranks)
+            if node_rank != MPI.UNDEFINED
+        }
+
+        self.in_use = False
+        self.requests = []
+        self.sends = []
+        self.receives = []
+        self.shared_sends = []
+        self.shared_receives = []
+        self.segments = segments
+        self.count = 0
+        segments.retain()
+
+        own_segment = segments.get_segment(node_comm.Get_rank())
+        announcements = []
+        for i_s, other_proc in enumerate(proc_neighbors):
+            if other_proc is None or other_proc in on_node:
+                continue
+            self._add_message_neighbor(shapes, dtype, layout, tag, i_s)
+
+        for i_s, other_proc in enumerate(proc_neighbors):
+            if other_proc not in on_node:
+                continue
+
+            send_idx = slices_from[i_s]
+            offset = segments.allocate(_SharedStrip.get_size(shapes, dtype, send_idx))
+            if offset is None:
+                logger.debug('Shared memory segment is full, sending overlap as message')
+                self._add_message_send(shapes, dtype, layout, tag, i_s)
+            else:
+                strip = _SharedStrip(own_segment, offset, shapes, dtype, send_idx)
+                # shared memory is not initialized
+                strip.written[0] = strip.read[0] = 0
+                segments.win.Sync()
+                self.shared_sends.append((send_idx, strip))
+
+            announcements.append(rs.mpi_comm.isend(offset, dest=other_proc, tag=_SHARED_SETUP_TAG + tag + i_s))
+
+        for i_s, other_proc in enumerate(proc_neighbors):
+            if other_proc not in on_node:
+                continue
+
+            recv_idx = slices_to[i_s]
+            with COMM_PROFILE.waiting():
+                offset = rs.mpi_comm.recv(source=other_proc, tag=_SHARED_SETUP_TAG + tag + send_to_recv[i_s])
+            if offset is None:
+                self._add_message_receive(shapes, dtype, layout, tag, i_s)
+            else:
+                other_segment = segments.get_segment(on_node[other_proc])
+                self.shared_receives.append((recv_idx, _SharedStrip(other_segment, offset, shapes, dtype, recv_idx)))
+
+        MPI.Request.Waitall(announcements)
+
+        self._startall = MPI.Prequest.Startall
+        self._waitall = MPI.Request.Waitall
+
+    def start(self, arrays):
+        self.count += 1
+
+        for send_idx, strip in self.shared_sends:
+            if strip.read[0] < self.count - 1:
+                with COMM_PROFILE.waiting():
+                    self.segments.wait(strip.read, self.count - 1)
+
+            for send_view, arr in zip(strip.views, arrays):
+                send_view[...] = arr[send_idx]
+
+        if self.shared_sends:
+            # strips have to be visible before the flags
+            self.segments.win.Sync()
+            for _, strip in self.shared_sends:
+                strip.written[0] = self.count
+
+        super().start(arrays)
+
+    def finish(self, arrays):
+        for recv_idx, strip in self.shared_receives:
+            with COMM_PROFILE.waiting():
+                self.segments.wait(strip.written, self.count)
+
+            for recv_view, arr in zip(strip.views, arrays):
+                arr[recv_idx] = recv_view
+
+        if self.shared_receives:
+            self.segments.win.Sync()
+            for _, strip in self.shared_receives:
+                strip.read[0] = self.count
+
+        super().finish(arrays)
+
+    def free(self):
+        super().free()
+        self.shared_sends = self.shared_receives = None
+        self.segments.release()
+
+
+def _get_node_comm():
+    """Communicator of all processes that can share memory with this one"""
+    from mpi4py import MPI
+    return rs.mpi_comm.Split_type(MPI.COMM_TYPE_SHARED)
+
+
+def _supports_shared_memory():
+    MPI = get_mpi_module()
+    return getattr(MPI, 'VERSION', 0) >= 3
+
+
+class _HaloPlanCache:
+    def __init__(self):
+        self.generation = None
+        self.plans = {}
+        self.retired = []
+        self.segments = None
+        self._registered = False
+
+    def acquire(self, vs, arrays, layout, tag):
+        """Returns an idle plan for exchanging ``arrays``"""
+        if self.generation != rs.__generation__:
+            # decomposition or communicator may have changed
+            self.clear()
+            self.generation = rs.__generation__
+
+            if rs.halo_transport == 'shared_memory':
+                if _supports_shared_memory():
+                    node_comm = _get_node_comm()
+                    if node_comm.Get_size() > 1:
+                        self.segments = _SharedSegments(node_comm)
+                    else:
+                        node_comm.Free()
+                else:
+                    logger.warning('Communicator does not support shared memory windows, '
+                                   'exchanging overlap through messages')
+
+        if not self._registered:
+            # persistent requests have to be freed before MPI is finalized
+            import atexit
+            atexit.register(self.finalize)
+            self._registered = True
+
+        dtype = arrays[0].dtype
+        key = (layout[0], layout[1], tag, dtype.str) + tuple(arr.shape for arr in arrays)
+        plans = self.plans.setdefault(key, [])
+
+        for plan in plans:
+            if not plan.in_use:
+                break
         else:
-            raise NotImplementedError()
+            # all existing plans for these arrays are in flight
+            shapes = [arr.shape for arr in arrays]
+            if self.segments is not None:
+                plan = _SharedHaloPlan(shapes, dtype, layout, tag, self.segments)
+            else:
+                plan = _HaloPlan(shapes, dtype, layout, tag)
+            plans.append(plan)
+
+        plan.in_use = True
+        return plan
+
+    def release(self, plan):
+        """Marks a plan as idle again, and frees it if the cache was cleared in the meantime"""
+        plan.in_use = False
+        if plan in self.retired:
+            self.retired.remove(plan)
+            plan.free()
+
+    def clear(self):
+        """Frees all plans. Plans that are in flight are freed once they are released."""
+        for plans in self.plans.values():
+            for plan in plans:
+                if plan.in_use:
+                    self.retired.append(plan)
+                else:
+                    plan.free()
+        self.plans = {}
+
+        if self.segments is not None:
+            self.segments.retire()
+            self.segments = None
+
+    def finalize(self):
+        """Frees all plans, including those of exchanges that will never be finished"""
+        self.clear()
+        for plan in self.retired:
+            plan.free()
+        self.retired = []
+
+
+_HALO_PLANS = _HaloPlanCache()
+
+
+def _use_halo_plans():
+    # buffers of lazy backends cannot be re-used
+    return rs.backend != 'bohrium'
 
-        overlap_slices_from = (
-            (slice(2, 4), Ellipsis),
-            (slice(-4, -2), Ellipsis),
-        )
 
-        overlap_slices_to = (
-            (slice(0, 2), Ellipsis),
-            (slice(-2, None), Ellipsis),
-        )
+@dist_context_only
+@COMM_PROFILE.record('halo')
+@veros_method
+def exchange_overlap(vs, arr, var_grid):
+    layout = _get_overlap_layout(vs, var_grid)
 
-        send_to_recv = [1, 0]
+    if layout is None:
+        return arr
+
+    if _use_halo_plans():
+        plan = _HALO_PLANS.acquire(vs, [arr], layout, tag=0)
+        try:
+            plan.start([arr])
+            plan.finish([arr])
+        finally:
+            _HALO_PLANS.release(plan)
+        return arr
+
+    _, proc_neighbors, overlap_slices_from, overlap_slices_to, send_to_recv = layout
 
     receive_futures = []
     for i_s, other_proc in enumerate(proc_neighbors):
@@ -239,47 +1138,148 @@ def exchange_overlap(vs, arr, var_grid):
         send_idx = overlap_slices_from[i_s]
         send_arr = ascontiguousarray(arr[send_idx])
 
-        rs.mpi_comm.Send(get_array_buffer(vs, send_arr), dest=other_proc, tag=i_s)
+        COMM_PROFILE.add_message(send_arr.nbytes)
+        with COMM_PROFILE.waiting():
+            rs.mpi_comm.Send(get_array_buffer(vs, send_arr), dest=other_proc, tag=i_s)
 
     for future, recv_idx, recv_arr in receive_futures:
-        future.wait()
+        with COMM_PROFILE.waiting():
+            future.wait()
         arr[recv_idx] = recv_arr
 
+    return arr
+
+
+class OverlapExchange:
+    """A halo exchange in progress, as returned by :func:`start_exchange_overlap`"""
+    def __init__(self):
+        self.plans = []
+        self.requests = []
+        self.send_buffers = []
+        self.receives = []
+
 
 @dist_context_only
+@COMM_PROFILE.record('halo')
 @veros_method
-def exchange_cyclic_boundaries(vs, arr):
-    if rs.num_proc[0] == 1:
-        arr[-2:, ...] = arr[2:4, ...]
-        arr[:2, ...] = arr[-4:-2, ...]
-        return
+def exchange_overlap_many(vs, arrays, grids):
+    """Exchanges the overlap of several arrays at once.
+
+    The overlap strips of all arrays that depend on x and y are packed into a single
+    message per neighbor. All other arrays are exchanged separately.
+    """
+    exchange = start_exchange_overlap(vs, arrays, grids)
+    finish_exchange_overlap(vs, exchange)
+    return arrays
+
+
+@COMM_PROFILE.record('halo')
+@veros_method
+def start_exchange_overlap(vs, arrays, grids):
+    """Starts exchanging the overlap of several arrays, and returns without waiting
+    for the exchange to complete.
+
+    The overlap regions of the arrays must not be read or written to until the
+    exchange is completed via :func:`finish_exchange_overlap`, and the interior
+    must not be written to. Returns ``None`` if there is nothing to exchange.
+    """
+    from .decorators import CONTEXT
+
+    if len(arrays) != len(grids):
+        raise ValueError('got {} arrays but {} grids'.format(len(arrays), len(grids)))
+
+    if rst.proc_num == 1 or not CONTEXT.is_dist_safe:
+        return None
+
+    packed_arrays = []
+    for arr, var_grid in zip(arrays, grids):
+        if _is_xy_grid(var_grid):
+            packed_arrays.append(arr)
+        else:
+            exchange_overlap(vs, arr, var_grid)
+
+    # messages only hold a single data type
+    dtypes = []
+    for arr in packed_arrays:
+        if arr.dtype not in dtypes:
+            dtypes.append(arr.dtype)
+
+    exchange = OverlapExchange()
+    for dtype in dtypes:
+        dtype_arrays = [arr for arr in packed_arrays if arr.dtype == dtype]
+
+        if _use_halo_plans():
+            plan = _HALO_PLANS.acquire(vs, dtype_arrays, _get_overlap_layout(vs, ['xt', 'yt']), tag=_PACKED_TAG)
+            plan.start(dtype_arrays)
+            exchange.plans.append((plan, dtype_arrays))
+        else:
+            _post_packed_exchange(vs, exchange, dtype_arrays)
+
+    return exchange
 
-    ix, iy = proc_rank_to_index(rst.proc_rank)
 
-    if 0 < ix < (rs.num_proc[0] - 1):
+@COMM_PROFILE.record('halo_wait')
+@veros_method
+def finish_exchange_overlap(vs, exchange):
+    """Waits for an exchange started by :func:`start_exchange_overlap` and writes
+    the received overlap"""
+    if exchange is None:
         return
 
-    if ix == 0:
-        other_proc = proc_index_to_rank(rs.num_proc[0] - 1, iy)
-        send_idx = (slice(2, 4), Ellipsis)
-        recv_idx = (slice(0, 2), Ellipsis)
-    else:
-        other_proc = proc_index_to_rank(0, iy)
-        send_idx = (slice(-4, -2), Ellipsis)
-        recv_idx = (slice(-2, None), Ellipsis)
+    for plan, arrays in exchange.plans:
+        plan.finish(arrays)
+        _HALO_PLANS.release(plan)
 
-    recv_arr = np.empty_like(arr[recv_idx])
-    send_arr = ascontiguousarray(arr[send_idx])
+    if exchange.requests:
+        MPI = get_mpi_module()
 
-    rs.mpi_comm.Sendrecv(
-        sendbuf=get_array_buffer(vs, send_arr), dest=other_proc, sendtag=10,
-        recvbuf=get_array_buffer(vs, recv_arr), source=other_proc, recvtag=10
-    )
+        with COMM_PROFILE.waiting():
+            MPI.Request.Waitall(exchange.requests)
+
+    for arrays, recv_idx, recv_buf in exchange.receives:
+        offset = 0
+        for arr in arrays:
+            recv_view = arr[recv_idx]
+            recv_view[...] = recv_buf[offset:offset + recv_view.size].reshape(recv_view.shape)
+            offset += recv_view.size
+
+    exchange.plans = exchange.requests = exchange.send_buffers = exchange.receives = None
+
+
+@veros_method(inline=True)
+def _post_packed_exchange(vs, exchange, arrays):
+    proc_neighbors = get_process_neighbors(vs)
 
-    arr[recv_idx] = recv_arr
+    for i_s, other_proc in enumerate(proc_neighbors):
+        if other_proc is None:
+            continue
+
+        i_r = _SEND_TO_RECV_XY[i_s]
+        recv_idx = _OVERLAP_SLICES_TO_XY[i_s]
+        recv_size = sum(arr[recv_idx].size for arr in arrays)
+        recv_buf = np.empty(recv_size, dtype=arrays[0].dtype)
+
+        exchange.requests.append(rs.mpi_comm.Irecv(
+            get_array_buffer(vs, recv_buf), source=other_proc, tag=_PACKED_TAG + i_r
+        ))
+        exchange.receives.append((arrays, recv_idx, recv_buf))
+
+    for i_s, other_proc in enumerate(proc_neighbors):
+        if other_proc is None:
+            continue
+
+        send_idx = _OVERLAP_SLICES_FROM_XY[i_s]
+        send_buf = np.concatenate([arr[send_idx].reshape(-1) for arr in arrays])
+
+        COMM_PROFILE.add_message(send_buf.nbytes)
+        exchange.requests.append(rs.mpi_comm.Isend(
+            get_array_buffer(vs, send_buf), dest=other_proc, tag=_PACKED_TAG + i_s
+        ))
+        exchange.send_buffers.append(send_buf)
 
 
 @dist_context_only
+@COMM_PROFILE.record('allreduce')
 @veros_method(inline=True)
 def _reduce(vs, arr, op):
     if np.isscalar(arr):
@@ -291,11 +1291,13 @@ def _reduce(vs, arr, op):
     arr = ascontiguousarray(arr)
     res = np.empty_like(arr)
 
-    rs.mpi_comm.Allreduce(
-        get_array_buffer(vs, arr),
-        get_array_buffer(vs, res),
-        op=op
-    )
+    COMM_PROFILE.add_message(arr.nbytes)
+    with COMM_PROFILE.waiting():
+        rs.mpi_comm.Allreduce(
+            get_array_buffer(vs, arr),
+            get_array_buffer(vs, res),
+            op=op
+        )
 
     if squeeze:
         res = res[0]
@@ -306,76 +1308,240 @@ def _reduce(vs, arr, op):
 @dist_context_only
 @veros_method
 def global_and(vs, arr):
-    from mpi4py import MPI
+    MPI = get_mpi_module()
     return _reduce(vs, arr, MPI.LAND)
 
 
 @dist_context_only
 @veros_method
 def global_or(vs, arr):
-    from mpi4py import MPI
+    MPI = get_mpi_module()
     return _reduce(vs, arr, MPI.LOR)
 
 
 @dist_context_only
 @veros_method
 def global_max(vs, arr):
-    from mpi4py import MPI
+    MPI = get_mpi_module()
     return _reduce(vs, arr, MPI.MAX)
 
 
 @dist_context_only
 @veros_method
 def global_min(vs, arr):
-    from mpi4py import MPI
+    MPI = get_mpi_module()
     return _reduce(vs, arr, MPI.MIN)
 
 
 @dist_context_only
 @veros_method
 def global_sum(vs, arr):
-    from mpi4py import MPI
+    MPI = get_mpi_module()
     return _reduce(vs, arr, MPI.SUM)
 
 
+@dist_context_only
+@veros_method(inline=True)
+def _reduce_many(vs, arrays, op):
+    """Reduces a list of scalars and arrays with a single Allreduce"""
+    MPI = get_mpi_module()
+    mpi_op = {'sum': MPI.SUM, 'max': MPI.MAX, 'min': MPI.MIN}[op]
+
+    buffer = np.concatenate([np.ravel(arr) for arr in arrays])
+    buffer = _reduce(vs, buffer, mpi_op)
+
+    res = []
+    offset = 0
+    for arr in arrays:
+        size = np.size(arr)
+        chunk = buffer[offset:offset + size]
+        res.append(chunk.reshape(np.shape(arr)) if np.ndim(arr) else chunk[0])
+        offset += size
+
+    return res
+
+
+class GlobalReduction:
+    """Collects global reductions of several scalars or arrays, and performs them with a
+    single Allreduce per reduction operation in :meth:`compute`.
+
+    Example:
+
+        >>> reduction = GlobalReduction(vs)
+        >>> reduction.sum('volume', np.sum(cell_volume))
+        >>> reduction.max('cfl', np.max(cfl))
+        >>> res = reduction.compute()
+        >>> res['volume'], res['cfl']
+
+    All values of one operation are packed into a buffer of a common data type.
+    """
+    def __init__(self, vs):
+        self.vs = vs
+        self._names = {op: [] for op in ('sum', 'max', 'min')}
+        self._values = {op: [] for op in ('sum', 'max', 'min')}
+
+    def _add(self, op, name, arr):
+        if any(name in names for names in self._names.values()):
+            raise ValueError('reduction {} already exists'.format(name))
+        self._names[op].append(name)
+        self._values[op].append(arr)
+
+    def sum(self, name, arr):
+        self._add('sum', name, arr)
+
+    def max(self, name, arr):
+        self._add('max', name, arr)
+
+    def min(self, name, arr):
+        self._add('min', name, arr)
+
+    def compute(self):
+        """Performs all reductions and returns their results as dict"""
+        res = {}
+        for op, values in self._values.items():
+            if not values:
+                continue
+            res.update(zip(self._names[op], _reduce_many(self.vs, values, op)))
+        return res
+
+
+@functools.lru_cache()
+def _get_line_heads(num_proc, land_blocks, dim):
+    """Ranks of the first process in every column (``dim=0``) or row (``dim=1``) of
+    blocks, which hold all data that only depends on x (or y)"""
+    heads = {}
+    for rank, block in enumerate(_get_active_blocks(num_proc, land_blocks)):
+        heads.setdefault(block[dim], rank)
+    return frozenset(heads.values())
+
+
+def _get_slice_shape(arr_shape, idx):
+    return tuple(len(range(*i.indices(n))) for i, n in zip(idx, arr_shape)) + arr_shape[len(idx):]
+
+
+def _as_c_array(arr):
+    # subarray types assume C order, and Bohrium only exposes arrays that own their data
+    if not arr.flags['C_CONTIGUOUS'] or (rs.backend == 'bohrium' and not arr.flags['OWNDATA']):
+        return arr.copy()
+    return arr
+
+
+@veros_method(inline=True)
+def _alltoallw(vs, sendbuf, send_windows, recvbuf, recv_windows):
+    """Sends ``sendbuf[send_windows[p]]`` to and receives ``recvbuf[recv_windows[p]]`` from
+    every process ``p`` (nothing where the window is ``None``), with a single Alltoallw.
+
+    Windows are described by subarray data types, so they are read from and written to
+    the arrays in place (without packing all chunks into another buffer), and counts and
+    displacements stay small for arrays of any size.
+    """
+    datatypes = []
+
+    def get_vector_buffer(arr, windows):
+        buf, _, base_type = get_array_buffer(vs, arr)
+        counts, types = [], []
+        for window in windows:
+            if window is None or 0 in _get_slice_shape(arr.shape, window):
+                counts.append(0)
+                types.append(base_type)
+                continue
+
+            starts = [i.indices(n)[0] for i, n in zip(window, arr.shape)]
+            starts.extend([0] * (arr.ndim - len(starts)))
+            datatype = base_type.Create_subarray(
+                arr.shape, _get_slice_shape(arr.shape, window), starts
+            ).Commit()
+            datatypes.append(datatype)
+            counts.append(1)
+            types.append(datatype)
+
+        return [buf, (counts, [0] * len(windows)), types]
+
+    try:
+        sendspec = get_vector_buffer(sendbuf, send_windows)
+        recvspec = get_vector_buffer(recvbuf, recv_windows)
+        with COMM_PROFILE.waiting():
+            rs.mpi_comm.Alltoallw(sendspec, recvspec)
+    finally:
+        for datatype in datatypes:
+            datatype.Free()
+
+
+@veros_method(inline=True)
+def _gatherv(vs, arr, out, dim_grid, senders):
+    """Gathers the chunks (including outer overlap) of all ``senders`` into ``out``
+    on the main process"""
+    no_windows = [None] * rst.proc_num
+
+    send_windows = list(no_windows)
+    if rst.proc_rank in senders:
+        arr = _as_c_array(arr)
+        _, idx = get_chunk_slices(vs, dim_grid, include_overlap=True)
+        send_windows[0] = idx
+        COMM_PROFILE.add_message(int(np.prod(_get_slice_shape(arr.shape, idx))) * arr.itemsize)
+
+    if rst.proc_rank != 0:
+        _alltoallw(vs, arr, send_windows, np.empty(0, dtype=arr.dtype), no_windows)
+        return
+
+    recv_windows = list(no_windows)
+    for proc in senders:
+        # chunks of other processes may differ in size
+        recv_windows[proc], _ = get_chunk_slices(
+            vs, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc)
+        )
+
+    _alltoallw(vs, arr, send_windows, out, recv_windows)
+
+
+@veros_method(inline=True)
+def _scatterv(vs, arr, dim_grid):
+    """Sends every process its whole local array (including overlap) from the global
+    array ``arr`` on the main process"""
+    no_windows = [None] * rst.proc_num
+
+    if rst.proc_rank != 0:
+        recvbuf = np.empty_like(arr)
+        recv_windows = list(no_windows)
+        recv_windows[0] = (slice(None),) * arr.ndim
+        _alltoallw(vs, np.empty(0, dtype=arr.dtype), no_windows, recvbuf, recv_windows)
+        return recvbuf
+
+    arr = _as_c_array(arr)
+    send_windows = [_get_chunk_window(vs, dim_grid, proc_rank_to_index(proc)) for proc in range(rst.proc_num)]
+
+    # arr changes shape in main process
+    recvbuf = np.empty(_get_slice_shape(arr.shape, send_windows[0]), dtype=arr.dtype)
+    recv_windows = list(no_windows)
+    recv_windows[0] = (slice(None),) * arr.ndim
+
+    COMM_PROFILE.add_message(sum(
+        int(np.prod(_get_slice_shape(arr.shape, window))) for window in send_windows[1:]
+    ) * arr.itemsize)
+    _alltoallw(vs, arr, send_windows, recvbuf, recv_windows)
+
+    return recvbuf
+
+
 @dist_context_only
 @veros_method(inline=True)
 def _gather_1d(vs, arr, dim):
     assert dim in (0, 1)
 
-    otherdim = 1 - dim
-    pi = proc_rank_to_index(rst.proc_rank)
-    if pi[otherdim] != 0:
-        return arr
-
     dim_grid = ['xt' if dim == 0 else 'yt'] + [None] * (arr.ndim - 1)
-    gidx, idx = get_chunk_slices(vs, dim_grid, include_overlap=True)
-    sendbuf = ascontiguousarray(arr[idx])
+    senders = _get_line_heads(rs.num_proc, rs.land_blocks, dim)
 
+    out = None
     if rst.proc_rank == 0:
-        buffer_list = []
-        for proc in range(1, rst.proc_num):
-            pi = proc_rank_to_index(proc)
-            if pi[otherdim] != 0:
-                continue
-            idx_g, idx_l = get_chunk_slices(vs, dim_grid, include_overlap=True, proc_idx=pi)
-            recvbuf = np.empty_like(arr[idx_l])
-            future = rs.mpi_comm.Irecv(get_array_buffer(vs, recvbuf), source=proc, tag=20)
-            buffer_list.append((future, idx_g, recvbuf))
-
         out_shape = ((vs.nx + 4, vs.ny + 4)[dim],) + arr.shape[1:]
         out = np.empty(out_shape, dtype=arr.dtype)
-        out[gidx] = sendbuf
 
-        for future, idx, val in buffer_list:
-            future.wait()
-            out[idx] = val
+    _gatherv(vs, arr, out, dim_grid, senders)
 
+    if rst.proc_rank == 0:
         return out
 
-    else:
-        rs.mpi_comm.Send(get_array_buffer(vs, sendbuf), dest=0, tag=20)
-        return arr
+    return arr
 
 
 @dist_context_only
@@ -385,36 +1551,23 @@ def _gather_xy(vs, arr):
     assert arr.shape[:2] == (nxi + 4, nyi + 4), arr.shape
 
     dim_grid = ['xt', 'yt'] + [None] * (arr.ndim - 2)
-    gidx, idx = get_chunk_slices(vs, dim_grid, include_overlap=True)
-    sendbuf = ascontiguousarray(arr[idx])
 
+    out = None
     if rst.proc_rank == 0:
-        buffer_list = []
-        for proc in range(1, rst.proc_num):
-            idx_g, idx_l = get_chunk_slices(
-                vs, dim_grid, include_overlap=True,
-                proc_idx=proc_rank_to_index(proc)
-            )
-            recvbuf = np.empty_like(arr[idx_l])
-            future = rs.mpi_comm.Irecv(get_array_buffer(vs, recvbuf), source=proc, tag=30)
-            buffer_list.append((future, idx_g, recvbuf))
-
         out_shape = (vs.nx + 4, vs.ny + 4) + arr.shape[2:]
-        out = np.empty(out_shape, dtype=arr.dtype)
-        out[gidx] = sendbuf
+        # eliminated blocks are land
+        out = np.zeros(out_shape, dtype=arr.dtype)
 
-        for future, idx, val in buffer_list:
-            future.wait()
-            out[idx] = val
+    _gatherv(vs, arr, out, dim_grid, range(rst.proc_num))
 
+    if rst.proc_rank == 0:
         return out
-    else:
-        rs.mpi_comm.Send(get_array_buffer(vs, sendbuf), dest=0, tag=30)
 
     return arr
 
 
 @dist_context_only
+@COMM_PROFILE.record('gather')
 @veros_method
 def gather(vs, arr, var_grid):
     if len(var_grid) < 2:
@@ -443,16 +1596,21 @@ def gather(vs, arr, var_grid):
 
 
 @dist_context_only
+@COMM_PROFILE.record('bcast')
 @veros_method
 def broadcast(vs, obj):
-    return rs.mpi_comm.bcast(obj, root=0)
+    with COMM_PROFILE.waiting():
+        return rs.mpi_comm.bcast(obj, root=0)
 
 
 @dist_context_only
 @veros_method(inline=True)
 def _scatter_constant(vs, arr):
     arr = ascontiguousarray(arr)
-    rs.mpi_comm.Bcast(get_array_buffer(vs, arr), root=0)
+    if rst.proc_rank == 0:
+        COMM_PROFILE.add_message(arr.nbytes)
+    with COMM_PROFILE.waiting():
+        rs.mpi_comm.Bcast(get_array_buffer(vs, arr), root=0)
     return arr
 
 
@@ -460,62 +1618,19 @@ def _scatter_constant(vs, arr):
 @veros_method(inline=True)
 def _scatter_1d(vs, arr, dim):
     assert dim in (0, 1)
-
-    nx = get_chunk_size(vs)[dim]
     dim_grid = ['xt' if dim == 0 else 'yt'] + [None] * (arr.ndim - 1)
-    _, local_slice = get_chunk_slices(vs, dim_grid, include_overlap=True)
-
-    if rst.proc_rank == 0:
-        recvbuf = arr[local_slice]
-
-        for proc in range(1, rst.proc_num):
-            global_slice, _ = get_chunk_slices(vs, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc))
-            sendbuf = ascontiguousarray(arr[global_slice])
-            rs.mpi_comm.Send(get_array_buffer(vs, sendbuf), dest=proc, tag=40)
-
-        # arr changes shape in main process
-        arr = np.zeros((nx + 4,) + arr.shape[1:], dtype=arr.dtype)
-    else:
-        recvbuf = np.empty_like(arr[local_slice])
-        rs.mpi_comm.Recv(get_array_buffer(vs, recvbuf), source=0, tag=40)
-
-    arr[local_slice] = recvbuf
-
-    exchange_overlap(vs, arr, ['xt' if dim == 0 else 'yt'])
-
-    return arr
+    return _scatterv(vs, arr, dim_grid)
 
 
 @dist_context_only
 @veros_method(inline=True)
 def _scatter_xy(vs, arr):
-    nxi, nyi = get_chunk_size(vs)
-
     dim_grid = ['xt', 'yt'] + [None] * (arr.ndim - 2)
-    _, local_slice = get_chunk_slices(vs, dim_grid, include_overlap=True)
-
-    if rst.proc_rank == 0:
-        recvbuf = arr[local_slice]
-
-        for proc in range(1, rst.proc_num):
-            global_slice, _ = get_chunk_slices(vs, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc))
-            sendbuf = ascontiguousarray(arr[global_slice])
-            rs.mpi_comm.Send(get_array_buffer(vs, sendbuf), dest=proc, tag=50)
-
-        # arr changes shape in main process
-        arr = np.empty((nxi + 4, nyi + 4) + arr.shape[2:], dtype=arr.dtype)
-    else:
-        recvbuf = np.empty_like(arr[local_slice])
-        rs.mpi_comm.Recv(get_array_buffer(vs, recvbuf), source=0, tag=50)
-
-    arr[local_slice] = recvbuf
-
-    exchange_overlap(vs, arr, ['xt', 'yt'])
-
-    return arr
+    return _scatterv(vs, arr, dim_grid)
 
 
 @dist_context_only
+@COMM_PROFILE.record('scatter')
 @veros_method
 def scatter(vs, arr, var_grid):
     if len(var_grid) < 2:
@@ -0,0 +1,101 @@
+"""Optional Numba-compiled kernels.
+
+Used by the ``numba`` backend. Routines that do not vectorize well (explicit loops
+over levels) or that create many full-size temporaries have loop-fused versions
+that are compiled with Numba on first use. Compiled code is cached on disk (next to
+the source file, or in ``$NUMBA_CACHE_DIR`` if set), so subsequent runs only pay
+for loading it.
+
+If Numba is not installed, the ``numba`` backend behaves exactly like the ``numpy``
+backend.
+"""
+
+import threading
+
+from loguru import logger
+
+from . import runtime_settings as rs
+
+_NUMBA = None
+_NUMBA_LOCK = threading.Lock()
+
+
+def get_numba():
+    """Returns the Numba module, or None if it cannot be imported"""
+    global _NUMBA
+
+    with _NUMBA_LOCK:
+        if _NUMBA is None:
+            try:
+                import numba
+            except ImportError:
+                logger.warning('Could not import Numba (numba backend will use NumPy kernels)')
+                numba = False
+
+            _NUMBA = numba
+
+    return _NUMBA or None
+
+
+def is_enabled():
+    """Whether compiled kernels are used under the current runtime settings"""
+    return rs.backend == 'numba' and get_numba() is not None
+
+
+class _Kernel:
+    def __init__(self, py_func, compiler):
+        self.py_func = py_func
+        self.compiler = compiler
+        self.compiled = None
+        self.__name__ = py_func.__name__
+        self.__doc__ = py_func.__doc__
+
+    def compile(self):
+        if self.compiled is None:
+            logger.trace('Compiling {} with Numba', self.__name__)
+            self.compiled = self.compiler(get_numba())(self.py_func)
+        return self.compiled
+
+
+class _CompiledKernel(_Kernel):
+    def __call__(self, *args):
+        return self.compile()(*args)
+
+
+class _ElementwiseKernel(_Kernel):
+    def __call__(self, *args):
+        if is_enabled():
+            return self.compile()(*args)
+        return self.py_func(*args)
+
+
+def _njit(numba):
+    return numba.njit(cache=True, nogil=True)
+
+
+def _vectorize(numba):
+    return numba.vectorize(cache=True)
+
+
+def kernel(function):
+    """Decorator for kernels that are only ever executed in compiled form.
+
+    The caller is responsible for checking :func:`is_enabled` first and provides the
+    NumPy implementation itself.
+    """
+    return _CompiledKernel(function, _njit)
+
+
+def ufunc(function):
+    """Like :func:`kernel`, but ``function`` operates on scalars and is compiled to
+    a broadcasting ufunc."""
+    return _CompiledKernel(function, _vectorize)
+
+
+def elementwise(function):
+    """Decorator for element-wise functions that work on arrays and scalars alike.
+
+    If compiled kernels are enabled, the function is executed as a compiled ufunc
+    (without any temporary arrays), otherwise it is called as-is.
+    """
+    return _ElementwiseKernel(function, _vectorize)
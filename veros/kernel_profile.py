@@ -0,0 +1,149 @@
+"""Hierarchical wall-time profile of all veros methods.
+
+If the runtime setting ``profile_kernels`` is enabled, every (non-inline) call to a
+function decorated with :func:`veros.decorators.veros_method` is timed. Calls are
+aggregated into a call tree that follows the nesting of veros methods, so that the
+time of e.g. :func:`veros.core.thermodynamics.thermodynamics` is broken down into
+its sub-kernels.
+
+The tree can be exported as a text summary, and every single call as a trace event
+that can be viewed in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+Calls made from within slab threads (see :mod:`veros.slabs`) are accounted to the
+calling kernel.
+"""
+
+import json
+import threading
+import timeit
+
+from loguru import logger
+
+#: Maximum number of trace events that are kept in memory
+MAX_TRACE_EVENTS = 1000000
+
+
+class CallNode:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.calls = 0
+        self.total_time = 0.
+        self.children = {}
+
+    def get_child(self, name):
+        child = self.children.get(name)
+        if child is None:
+            child = self.children[name] = CallNode(name, parent=self)
+        return child
+
+    @property
+    def self_time(self):
+        return self.total_time - sum(child.total_time for child in self.children.values())
+
+
+class _CurrentNode(threading.local):
+    # innermost node of the call tree on this thread; CONTEXT.stack_level of
+    # veros.decorators only counts the nesting depth, which does not tell which node
+    # a call belongs to (and it also counts calls that started before profiling)
+    node = None
+
+
+class KernelProfile:
+    def __init__(self):
+        self._current = _CurrentNode()
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.root = CallNode('total')
+        self.events = []
+        self.dropped_events = 0
+        self._start_time = timeit.default_timer()
+        self._current.node = None
+
+    def enter(self, name):
+        """Starts timing a call to ``name``; returns a token to be passed to :meth:`exit`"""
+        parent = self._current.node or self.root
+        with self._lock:
+            node = parent.get_child(name)
+        self._current.node = node
+        return node, timeit.default_timer()
+
+    def exit(self, token):
+        node, start = token
+        end = timeit.default_timer()
+
+        with self._lock:
+            node.calls += 1
+            node.total_time += end - start
+
+            if len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append((node.name, start, end - start, threading.get_ident()))
+            else:
+                if not self.dropped_events:
+                    logger.warning(
+                        'Kernel profile holds more than {} trace events, dropping the rest',
+                        MAX_TRACE_EVENTS
+                    )
+                self.dropped_events += 1
+
+        self._current.node = node.parent if node.parent is not self.root else None
+
+    def get_summary(self, min_fraction=0.001):
+        """Text representation of the call tree, omitting calls that take less than
+        ``min_fraction`` of the total time"""
+        total_time = sum(child.total_time for child in self.root.children.values()) or 1.
+
+        lines = ['{:<60} {:>8} {:>11} {:>11} {:>6}'.format('kernel', 'calls', 'total [s]', 'self [s]', '%')]
+
+        def visit(node, depth):
+            children = sorted(node.children.values(), key=lambda n: n.total_time, reverse=True)
+            for child in children:
+                if child.total_time < min_fraction * total_time:
+                    continue
+                lines.append('{:<60} {:>8d} {:>11.3f} {:>11.3f} {:>6.1%}'.format(
+                    '  ' * depth + child.name, child.calls, child.total_time, child.self_time,
+                    child.total_time / total_time
+                ))
+                visit(child, depth + 1)
+
+        visit(self.root, 0)
+        return '\n'.join(lines)
+
+    def get_trace(self, pid=0):
+        """Call events in Chrome trace event format"""
+        thread_ids = {}
+        events = []
+        for name, start, duration, thread in self.events:
+            tid = thread_ids.setdefault(thread, len(thread_ids))
+            events.append({
+                'name': name.split(':')[-1],
+                'cat': name.split(':')[0],
+                'ph': 'X',
+                'ts': (start - self._start_time) * 1e6,
+                'dur': duration * 1e6,
+                'pid': pid,
+                'tid': tid,
+            })
+
+        events.append({
+            'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'rank {}'.format(pid)}
+        })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, basename, rank=0):
+        """Writes text summary and trace of rank ``rank`` to ``<basename>.<rank>.txt``
+        and ``<basename>.<rank>.json``"""
+        filename = '{}.{}'.format(basename, rank)
+
+        with open(filename + '.txt', 'w') as f:
+            f.write(self.get_summary(min_fraction=0) + '\n')
+
+        with open(filename + '.json', 'w') as f:
+            json.dump(self.get_trace(pid=rank), f)
+
+        return filename + '.txt', filename + '.json'
+
+
+PROFILE = KernelProfile()
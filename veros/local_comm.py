@@ -0,0 +1,347 @@
+"""A stand-in for MPI communicators, for distributed runs on a single machine without MPI.
+
+:func:`launch` starts a function on several local processes (via :mod:`multiprocessing`),
+each with a :class:`LocalComm` as ``runtime_settings.mpi_comm``. The communicator
+implements the subset of the ``mpi4py`` API that Veros uses. Messages are sent through
+pipes, and processes synchronize through shared semaphores. This module also provides
+the MPI constants and request types that :mod:`veros.distributed` needs, so it can be
+used in place of ``mpi4py.MPI``.
+
+Collective operations are composed of point-to-point messages through the first
+process, and reduce in order of rank (i.e., results are reproducible).
+
+Example:
+
+    >>> from veros.local_comm import launch
+    >>> def run():
+    ...     sim = MyVerosSetup()
+    ...     sim.setup()
+    ...     sim.run()
+    ...
+    >>> launch(run, 4)
+
+"""
+
+import os
+import sys
+import functools
+import collections
+
+import numpy
+
+# reduction operations
+SUM = numpy.add
+MAX = numpy.maximum
+MIN = numpy.minimum
+LAND = numpy.logical_and
+LOR = numpy.logical_or
+
+
+class Datatype:
+    """Type of the elements of a message. Messages carry their own element type, so
+    this only matters for subarray types, which select part of a C-ordered array."""
+    def __init__(self, name, subarray=None):
+        self.name = name
+        self.subarray = subarray
+
+    def Create_subarray(self, sizes, subsizes, starts):
+        window = tuple(slice(start, start + size) for start, size in zip(starts, subsizes))
+        return Datatype(self.name, (tuple(sizes), window))
+
+    def Commit(self):
+        return self
+
+    def Free(self):
+        pass
+
+
+# data types
+CHAR = Datatype('int8')
+SHORT = Datatype('int16')
+INT = Datatype('int32')
+LONG = Datatype('int64')
+LONG_LONG = Datatype('int128')
+FLOAT = Datatype('float32')
+DOUBLE = Datatype('float64')
+BOOL = Datatype('bool')
+
+# tags of messages that are part of collective operations
+_COLLECTIVE_TAG = -1
+
+
+def _get_array(buf):
+    """Flat array of a buffer specification like ``[array, count, type]``"""
+    if isinstance(buf, (list, tuple)):
+        buf = buf[0]
+    return numpy.asarray(buf).reshape(-1)
+
+
+def _get_vector(buf):
+    """Flat array, counts, and displacements of a buffer specification for Gatherv / Scatterv"""
+    arr = _get_array(buf)
+    counts, displs = buf[1]
+    return arr, counts, displs
+
+
+def _get_selection(arr, count, displ, datatype):
+    """Part of the flat array ``arr`` that ``count`` elements of ``datatype`` at byte
+    offset ``displ`` refer to"""
+    arr = arr[displ // arr.itemsize:]
+    if datatype.subarray is None:
+        return arr[:count]
+
+    assert count == 1
+    sizes, window = datatype.subarray
+    return arr[:int(numpy.prod(sizes))].reshape(sizes)[window]
+
+
+class Request:
+    """A pending operation that is completed by calling ``callback``"""
+    def __init__(self, callback=None):
+        self._callback = callback
+
+    def wait(self):
+        if self._callback is not None:
+            callback, self._callback = self._callback, None
+            callback()
+
+    Wait = wait
+
+    @staticmethod
+    def Waitall(requests):
+        for request in requests:
+            request.wait()
+
+
+class Prequest(Request):
+    """A persistent request, as created by ``Send_init`` and ``Recv_init``"""
+    def __init__(self, start, complete):
+        super().__init__()
+        self._start = start
+        self._complete = complete
+
+    def Start(self):
+        self._start()
+        self._callback = self._complete
+
+    @staticmethod
+    def Startall(requests):
+        for request in requests:
+            request.Start()
+
+    def Free(self):
+        self._callback = None
+
+
+def _do_nothing():
+    pass
+
+
+class LocalComm:
+    """Communicator between processes started by :func:`launch`.
+
+    Every process has an inbox (a queue) that all other processes send to. Messages that
+    arrive before they are received are kept until a matching receive is posted, so
+    sends never block.
+    """
+    def __init__(self, rank, inboxes, barrier):
+        self._rank = rank
+        self._inboxes = inboxes
+        self._barrier = barrier
+        self._pending = collections.defaultdict(collections.deque)
+
+    def Get_rank(self):
+        return self._rank
+
+    def Get_size(self):
+        return len(self._inboxes)
+
+    # point-to-point communication
+
+    def send(self, obj, dest, tag=0):
+        self._inboxes[dest].put((self._rank, tag, obj))
+
+    def recv(self, source, tag=0):
+        key = (source, tag)
+        pending = self._pending[key]
+        while not pending:
+            msg_source, msg_tag, obj = self._inboxes[self._rank].get()
+            self._pending[(msg_source, msg_tag)].append(obj)
+        return pending.popleft()
+
+    def Send(self, buf, dest, tag=0):
+        self.send(_get_array(buf).copy(), dest, tag)
+
+    def Recv(self, buf, source, tag=0):
+        _get_array(buf)[...] = self.recv(source, tag)
+
+    def Isend(self, buf, dest, tag=0):
+        self.Send(buf, dest, tag)
+        return Request()
+
+    def Irecv(self, buf, source, tag=0):
+        return Request(functools.partial(self.Recv, buf, source, tag))
+
+    def Sendrecv(self, sendbuf, dest, sendtag=0, recvbuf=None, source=None, recvtag=0):
+        self.Send(sendbuf, dest, sendtag)
+        self.Recv(recvbuf, source, recvtag)
+
+    def Send_init(self, buf, dest, tag=0):
+        return Prequest(functools.partial(self.Send, buf, dest, tag), _do_nothing)
+
+    def Recv_init(self, buf, source, tag=0):
+        return Prequest(_do_nothing, functools.partial(self.Recv, buf, source, tag))
+
+    # collective communication
+
+    def gather(self, obj, root=0):
+        if self._rank != root:
+            self.send(obj, root, _COLLECTIVE_TAG)
+            return None
+
+        return [
+            obj if other == root else self.recv(other, _COLLECTIVE_TAG)
+            for other in range(self.Get_size())
+        ]
+
+    def bcast(self, obj, root=0):
+        if self._rank != root:
+            return self.recv(root, _COLLECTIVE_TAG)
+
+        for other in range(self.Get_size()):
+            if other != root:
+                self.send(obj, other, _COLLECTIVE_TAG)
+        return obj
+
+    def allgather(self, obj):
+        return self.bcast(self.gather(obj))
+
+    def Allreduce(self, sendbuf, recvbuf, op=SUM):
+        arrays = self.gather(_get_array(sendbuf).copy())
+        if arrays is not None:
+            arrays = functools.reduce(op, arrays)
+        _get_array(recvbuf)[...] = self.bcast(arrays)
+
+    def Bcast(self, buf, root=0):
+        arr = _get_array(buf)
+        res = self.bcast(arr.copy() if self._rank == root else None, root)
+        if self._rank != root:
+            arr[...] = res
+
+    def Gatherv(self, sendbuf, recvbuf, root=0):
+        chunks = self.gather(_get_array(sendbuf).copy(), root)
+        if chunks is None:
+            return
+
+        arr, counts, displs = _get_vector(recvbuf)
+        for chunk, count, displ in zip(chunks, counts, displs):
+            arr[displ:displ + count] = chunk
+
+    def Scatterv(self, sendbuf, recvbuf, root=0):
+        if self._rank == root:
+            arr, counts, displs = _get_vector(sendbuf)
+            for other, (count, displ) in enumerate(zip(counts, displs)):
+                chunk = arr[displ:displ + count]
+                if other == root:
+                    _get_array(recvbuf)[...] = chunk
+                else:
+                    self.send(chunk.copy(), other, _COLLECTIVE_TAG)
+        else:
+            _get_array(recvbuf)[...] = self.recv(root, _COLLECTIVE_TAG)
+
+    def Alltoallw(self, sendbuf, recvbuf):
+        send_arr, send_counts, send_displs = _get_vector(sendbuf)
+        recv_arr, recv_counts, recv_displs = _get_vector(recvbuf)
+        send_types, recv_types = sendbuf[2], recvbuf[2]
+
+        own_chunk = None
+        for other, count in enumerate(send_counts):
+            if not count:
+                continue
+            chunk = _get_selection(send_arr, count, send_displs[other], send_types[other]).copy()
+            if other == self._rank:
+                own_chunk = chunk
+            else:
+                self.send(chunk, other, _COLLECTIVE_TAG)
+
+        for other, count in enumerate(recv_counts):
+            if not count:
+                continue
+            selection = _get_selection(recv_arr, count, recv_displs[other], recv_types[other])
+            chunk = own_chunk if other == self._rank else self.recv(other, _COLLECTIVE_TAG)
+            selection[...] = chunk.reshape(selection.shape)
+
+    def barrier(self):
+        self._barrier.wait()
+
+    Barrier = barrier
+
+    def Abort(self, errorcode=1):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(errorcode)
+
+
+def is_local_comm(comm):
+    return isinstance(comm, LocalComm)
+
+
+def _run_process(function, rank, inboxes, barrier, args, kwargs):
+    from . import runtime_settings as rs
+
+    comm = LocalComm(rank, inboxes, barrier)
+    rs.mpi_comm = comm
+
+    function(*args, **kwargs)
+
+    # all messages have been received once every process is done
+    comm.barrier()
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+
+def launch(function, num_procs, args=(), kwargs=None):
+    """Calls ``function(*args, **kwargs)`` on ``num_procs`` local processes that are
+    connected through a :class:`LocalComm`, and waits for all of them to finish.
+
+    If any process fails, all others are terminated, and a ``RuntimeError`` is raised.
+    Requires the ``fork`` start method (i.e., a POSIX system).
+    """
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    if kwargs is None:
+        kwargs = {}
+
+    context = multiprocessing.get_context('fork')
+    inboxes = [context.Queue() for _ in range(num_procs)]
+    barrier = context.Barrier(num_procs)
+
+    processes = [
+        context.Process(
+            target=_run_process, args=(function, rank, inboxes, barrier, args, kwargs),
+            name='veros-{}'.format(rank)
+        )
+        for rank in range(num_procs)
+    ]
+
+    for process in processes:
+        process.start()
+
+    failed = None
+    running = {process.sentinel: process for process in processes}
+    try:
+        while running and failed is None:
+            for sentinel in wait(list(running.keys())):
+                process = running.pop(sentinel)
+                process.join()
+                if process.exitcode != 0:
+                    failed = process
+                    break
+    finally:
+        for process in running.values():
+            process.terminate()
+            process.join()
+
+    if failed is not None:
+        raise RuntimeError('process {} exited with code {}'.format(failed.name, failed.exitcode))
@@ -0,0 +1,133 @@
+"""Attribution of peak memory usage to veros methods.
+
+If the runtime setting ``profile_memory`` is enabled, memory allocations are traced
+through :mod:`tracemalloc` (which includes the data of all NumPy arrays), and the
+high-water mark of every (non-inline) call to a function decorated with
+:func:`veros.decorators.veros_method` is recorded relative to the memory in use
+when the call started. This is the transient memory a kernel needs on top of the
+model state.
+
+Two numbers are kept for every kernel:
+
+- ``peak``: the largest transient memory observed during any call, including all
+  veros methods it calls
+- ``self peak``: same, but only counting the intervals in which the kernel itself
+  (and not one of the veros methods it calls) was executing
+
+Allocations of lazy backends (Bohrium) are not visible to :mod:`tracemalloc`.
+Calls made from within slab threads (see :mod:`veros.slabs`) are accounted to the
+calling kernel.
+"""
+
+import threading
+import tracemalloc
+
+from loguru import logger
+
+
+class _Frame:
+    __slots__ = ('name', 'start', 'peak', 'self_peak')
+
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start
+        self.peak = start
+        self.self_peak = start
+
+
+class KernelMemory:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.peak = 0
+        self.self_peak = 0
+
+
+class _Stack(threading.local):
+    def __init__(self):
+        self.frames = []
+
+
+class MemoryProfile:
+    def __init__(self):
+        self._stack = _Stack()
+        self.clear()
+
+    def clear(self):
+        self.kernels = {}
+        self.peak = 0
+        self.peak_location = ()
+        self._stack.frames = []
+
+    def _update_peak(self, frame):
+        """Accounts the peak since the last reset to ``frame``, which was executing
+        in the meantime, and resets it"""
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        frame.peak = max(frame.peak, peak)
+        frame.self_peak = max(frame.self_peak, peak)
+
+        if peak > self.peak:
+            self.peak = peak
+            self.peak_location = tuple(f.name for f in self._stack.frames)
+
+    def enter(self, name):
+        if not hasattr(tracemalloc, 'reset_peak'):
+            raise RuntimeError('memory profiling requires Python >= 3.9')
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        frames = self._stack.frames
+        if frames:
+            self._update_peak(frames[-1])
+        else:
+            tracemalloc.reset_peak()
+
+        current, _ = tracemalloc.get_traced_memory()
+        frames.append(_Frame(name, current))
+
+    def exit(self):
+        frames = self._stack.frames
+        frame = frames[-1]
+        self._update_peak(frame)
+        frames.pop()
+
+        if frames:
+            frames[-1].peak = max(frames[-1].peak, frame.peak)
+
+        kernel = self.kernels.get(frame.name)
+        if kernel is None:
+            kernel = self.kernels[frame.name] = KernelMemory(frame.name)
+
+        kernel.calls += 1
+        kernel.peak = max(kernel.peak, frame.peak - frame.start)
+        kernel.self_peak = max(kernel.self_peak, frame.self_peak - frame.start)
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def get_summary(self, num_kernels=20):
+        """Table of the ``num_kernels`` kernels with the highest peak memory usage"""
+        lines = [
+            'Peak traced memory: {:.1f} MB in {}'.format(
+                self.peak / 1024 ** 2, ' > '.join(self.peak_location) or '(none)'
+            ),
+            '{:<60} {:>8} {:>11} {:>15}'.format('kernel', 'calls', 'peak [MB]', 'self peak [MB]')
+        ]
+
+        kernels = sorted(self.kernels.values(), key=lambda k: (k.peak, k.self_peak), reverse=True)
+        for kernel in kernels[:num_kernels]:
+            lines.append('{:<60} {:>8d} {:>11.1f} {:>15.1f}'.format(
+                kernel.name, kernel.calls, kernel.peak / 1024 ** 2, kernel.self_peak / 1024 ** 2
+            ))
+
+        return '\n'.join(lines)
+
+    def log_summary(self, num_kernels=20):
+        logger.info('Memory profile:\n{}', self.get_summary(num_kernels=num_kernels))
+
+
+PROFILE = MemoryProfile()
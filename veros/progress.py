@@ -1,15 +1,12 @@
 import sys
 import functools
+import importlib.util
 from time import perf_counter
 
 from loguru import logger
 
-try:
-    import tqdm
-except ImportError:
-    has_tqdm = False
-else:
-    has_tqdm = True
+# tqdm is only imported when a progress bar is created
+has_tqdm = importlib.util.find_spec('tqdm') is not None
 
 from . import time, logs, runtime_settings as rs, runtime_state as rst
 
@@ -91,6 +88,8 @@ class FancyProgressBar:
         total_runlen, time_unit = time.format_time(total)
         self._time_unit = time_unit
 
+        import tqdm
+
         class _VerosTQDM(tqdm.tqdm):
             """Stripped down version of tqdm.tqdm
 
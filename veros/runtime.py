@@ -1,3 +1,11 @@
+def _default_num_threads():
+    import os
+    try:
+        return int(os.environ['VEROS_NUM_THREADS'])
+    except KeyError:
+        return os.cpu_count() or 1
+
+
 def _default_mpi_comm():
     try:
         from mpi4py import MPI
@@ -11,6 +19,16 @@ def twoints(v):
     return (int(v[0]), int(v[1]))
 
 
+def proc_grid(v):
+    if v == 'auto':
+        return v
+    return twoints(v)
+
+
+def blocks(v):
+    return tuple(sorted((int(ix), int(iy)) for ix, iy in v))
+
+
 def loglevel(v):
     loglevels = ('trace', 'debug', 'info', 'warning', 'error')
     if v not in loglevels:
@@ -18,31 +36,66 @@ def loglevel(v):
     return v
 
 
+def dispatch_mode(v):
+    dispatch_modes = ('production', 'debug')
+    if v not in dispatch_modes:
+        raise ValueError('dispatch_mode must be one of %r' % (dispatch_modes,))
+    return v
+
+
+def halo_transport(v):
+    halo_transports = ('messages', 'shared_memory')
+    if v not in halo_transports:
+        raise ValueError('halo_transport must be one of %r' % (halo_transports,))
+    return v
+
+
+def sync_policy(v):
+    from .backend import SYNC_LEVELS
+    if v not in SYNC_LEVELS:
+        raise ValueError('sync_policy must be one of %r' % (SYNC_LEVELS,))
+    return v
+
+
 AVAILABLE_SETTINGS = (
     # (name, type, default)
+    # callable defaults are evaluated on first access
     ('backend', str, 'numpy'),
     ('linear_solver', str, 'best'),
-    ('num_proc', twoints, (1, 1)),
+    ('num_proc', proc_grid, (1, 1)),
+    ('land_blocks', blocks, ()),
+    ('halo_transport', halo_transport, 'messages'),
     ('profile_mode', bool, False),
+    ('profile_kernels', bool, False),
+    ('profile_memory', bool, False),
+    ('profile_comm', bool, False),
     ('loglevel', loglevel, 'info'),
-    ('mpi_comm', None, _default_mpi_comm())
+    ('dispatch_mode', dispatch_mode, 'production'),
+    ('sync_policy', sync_policy, 'call'),
+    ('num_threads', int, _default_num_threads),
+    ('mpi_comm', None, _default_mpi_comm)
 )
 
 
 class RuntimeSettings:
     def __init__(self):
         self.__locked__ = False
+        self.__generation__ = 0
         self.__setting_types__ = {}
+        self.__lazy_defaults__ = {}
 
         for setting, typ, default in AVAILABLE_SETTINGS:
-            setattr(self, setting, default)
             self.__setting_types__[setting] = typ
+            if callable(default):
+                self.__lazy_defaults__[setting] = default
+            else:
+                setattr(self, setting, default)
 
         self.__settings__ = set(self.__setting_types__.keys())
         self.__locked__ = True
 
     def __setattr__(self, attr, val):
-        if attr == '__locked__' or not self.__locked__:
+        if attr in ('__locked__', '__generation__') or not self.__locked__:
             return super(RuntimeSettings, self).__setattr__(attr, val)
 
         # prevent adding new settings
@@ -54,8 +107,26 @@ class RuntimeSettings:
         if stype is not None:
             val = stype(val)
 
+        # invalidates everything that was resolved from the previous settings
+        self.__generation__ += 1
+        self.__lazy_defaults__.pop(attr, None)
+
         return super(RuntimeSettings, self).__setattr__(attr, val)
 
+    def __getattr__(self, attr):
+        # only called for settings that have not been set yet
+        lazy_defaults = self.__dict__.get('__lazy_defaults__', {})
+        if attr not in lazy_defaults:
+            raise AttributeError(attr)
+
+        val = lazy_defaults.pop(attr)()
+        stype = self.__setting_types__.get(attr)
+        if stype is not None:
+            val = stype(val)
+
+        super(RuntimeSettings, self).__setattr__(attr, val)
+        return val
+
     def __repr__(self):
         setval = ', '.join(
             '%s=%s' % (key, repr(getattr(self, key))) for key in self.__settings__
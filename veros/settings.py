@@ -17,6 +17,8 @@ SETTINGS = OrderedDict([
     # Logical switches for general model setup
     ('coord_degree', Setting(False, bool, 'either spherical (True) or cartesian (False) coordinates')),
     ('enable_cyclic_x', Setting(False, bool, 'enable cyclic boundary conditions')),
+    ('enable_balanced_decomposition', Setting(False, bool, 'Choose process boundaries such that all processes hold a similar number of wet grid cells (derived from kbot; the topography is computed twice during setup)')),
+    ('enable_land_block_elimination', Setting(False, bool, 'Do not assign processes to blocks of the decomposition that contain only land (the topography of the whole domain is computed on the first process during setup, and the number of processes has to match the remaining blocks)')),
     ('eq_of_state_type', Setting(1, int, 'equation of state: 1: linear, 3: nonlinear with comp., 5: TEOS')),
     ('enable_implicit_vert_friction', Setting(False, bool, 'enable implicit vertical friction')),
     ('enable_explicit_vert_friction', Setting(False, bool, 'enable explicit vertical friction')),
@@ -128,6 +130,7 @@ SETTINGS = OrderedDict([
     ('force_overwrite', Setting(False, bool, 'Overwrite existing output files')),
     ('pyom_compatibility_mode', Setting(False, bool, 'Force compatibility to pyOM2 (even reproducing bugs and other quirks). For testing purposes only.')),
     ('diskless_mode', Setting(False, bool, 'Suppress all output to disk. Mainly used for testing purposes.')),
+    ('setup_cache_dir', Setting('', str, 'Directory to cache the setup of the streamfunction solver in (Poisson matrix, preconditioners, and island streamfunctions). Runs on the same grid and topography re-use it. If not given, nothing is cached.')),
     ('default_float_type', Setting('float64', str, 'Default type to use for floating point arrays (e.g. ``float32`` or ``float64``).')),
 ])
 
@@ -0,0 +1,182 @@
+"""Thread-parallel execution of stencil kernels on slabs of the x-dimension.
+
+Used by the ``numpy-threaded`` backend. Kernels that opt in through the ``slab_outputs``
+argument of :func:`veros.veros_method` are evaluated on overlapping slabs of the local
+domain, one slab per thread. NumPy releases the GIL during array operations, so slabs
+are computed concurrently.
+
+Every slab sees a proxy state (:class:`SlabVerosState`) in which all x-dependent
+variables are restricted to the slab plus ``halo`` columns on each side. Arrays the
+kernel writes to (its outputs) are private copies; after all slabs are done, the part
+of each copy owned by the slab is written back. This is only valid for kernels that
+
+- write to no x-dependent array other than their declared outputs,
+- only access neighbors up to ``halo`` columns away (accumulated over all
+  intermediate steps of the kernel),
+- do not communicate or apply boundary conditions (e.g. ``enforce_boundaries``),
+- and return ``None``.
+"""
+
+import inspect
+import threading
+
+from . import runtime_settings as rs, runtime_state as rst
+from .state import VerosState
+from .distributed import get_chunk_size, get_chunk_sizes
+
+X_DIMENSIONS = ('xt', 'xu')
+
+#: slabs must contain at least this many x-columns (excluding halos)
+MIN_SLAB_WIDTH = 8
+
+#: slabs must contain at least this many array elements (excluding halos)
+MIN_SLAB_SIZE = 2 ** 15
+
+_POOL = None
+_POOL_SIZE = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_thread_pool():
+    global _POOL, _POOL_SIZE
+
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_SIZE != rs.num_threads:
+            from concurrent.futures import ThreadPoolExecutor
+
+            if _POOL is not None:
+                _POOL.shutdown()
+
+            _POOL = ThreadPoolExecutor(max_workers=rs.num_threads, thread_name_prefix='veros-slab')
+            _POOL_SIZE = rs.num_threads
+
+    return _POOL
+
+
+class SlabVerosState(VerosState):
+    """A proxy wrapper that exposes a slab of the x-dimension of a VerosState.
+
+    Variables given in ``outputs`` are private copies of the respective slab,
+    all other x-dependent variables are views into the parent arrays.
+    """
+    def __init__(self, parent_state, x_slice, outputs):
+        object.__setattr__(self, '_vs', parent_state)
+        object.__setattr__(self, '_slice', x_slice)
+        object.__setattr__(self, '_arrays', {
+            var: getattr(parent_state, var)[x_slice].copy() for var in outputs
+        })
+        # make sure that arrays allocated by the kernel match the size of the slab
+        chunks_x, chunks_y = get_chunk_sizes(parent_state)
+        px = rst.proc_idx[0]
+        chunks_x = chunks_x[:px] + (x_slice.stop - x_slice.start - 4,) + chunks_x[px + 1:]
+        object.__setattr__(self, '_chunk_sizes', (chunks_x, chunks_y))
+
+    def __getattribute__(self, attr):
+        if attr in ('_vs', '_slice', '_arrays', '_chunk_sizes'):
+            return object.__getattribute__(self, attr)
+
+        if attr == 'chunk_sizes':
+            return self._chunk_sizes
+
+        if attr == 'nx':
+            return sum(self._chunk_sizes[0])
+
+        arrays = self._arrays
+        if attr in arrays:
+            return arrays[attr]
+
+        parent_state = self._vs
+        var = parent_state.variables.get(attr)
+        if var is not None and var.dims and var.dims[0] in X_DIMENSIONS:
+            return getattr(parent_state, attr)[self._slice]
+
+        return getattr(parent_state, attr)
+
+    def __setattr__(self, attr, val):
+        raise AttributeError('Cannot set attribute %s on a slab of the model state' % attr)
+
+
+def get_num_slabs(vs, num_columns, halo):
+    """Number of slabs a local domain with ``num_columns`` x-columns is split into"""
+    if num_columns < 2 * MIN_SLAB_WIDTH:
+        return 1
+
+    column_size = (get_chunk_size(vs)[1] + 4) * max(vs.nz, 1)
+    num_slabs = min(
+        rs.num_threads,
+        num_columns // max(MIN_SLAB_WIDTH, halo),
+        num_columns * column_size // MIN_SLAB_SIZE
+    )
+    return max(num_slabs, 1)
+
+
+def get_slab_bounds(num_columns, num_slabs, halo):
+    """Returns (owned, with_halo) slices for every slab"""
+    edges = [num_columns * i // num_slabs for i in range(num_slabs + 1)]
+    bounds = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bounds.append((
+            slice(start, stop),
+            slice(max(start - halo, 0), min(stop + halo, num_columns))
+        ))
+    return bounds
+
+
+def get_argument_names(function):
+    return list(inspect.signature(function).parameters.keys())
+
+
+def run_in_slabs(vs, function, args, kwargs, outputs, halo, narg, arg_names):
+    """Execute ``function`` on slabs of the x-dimension in parallel.
+
+    Falls back to sequential execution if the domain is too small to be split.
+    """
+    num_columns = get_chunk_size(vs)[0] + 4
+    num_slabs = get_num_slabs(vs, num_columns, halo)
+
+    if num_slabs < 2:
+        return function(*args, **kwargs)
+
+    output_args = {
+        i for i, name in enumerate(arg_names) if name in outputs and i < len(args)
+    }
+    output_vars = [var for var in outputs if var not in arg_names]
+
+    def run_slab(x_slice):
+        from .decorators import CONTEXT
+        CONTEXT.in_slab = True
+
+        slab_args = list(args)
+        slab_args[narg] = SlabVerosState(vs, x_slice, output_vars)
+
+        for i, arg in enumerate(args):
+            if i == narg or not hasattr(arg, 'shape') or not arg.shape or arg.shape[0] != num_columns:
+                continue
+
+            if i in output_args:
+                slab_args[i] = arg[x_slice].copy()
+            else:
+                slab_args[i] = arg[x_slice]
+
+        res = function(*slab_args, **kwargs)
+        if res is not None:
+            raise RuntimeError('kernels executed in slabs must not return anything')
+
+        return slab_args
+
+    bounds = get_slab_bounds(num_columns, num_slabs, halo)
+    pool = get_thread_pool()
+    futures = [pool.submit(run_slab, with_halo) for _, with_halo in bounds]
+
+    # wait for all slabs to finish before writing anything back
+    results = [future.result() for future in futures]
+
+    for (owned, with_halo), slab_args in zip(bounds, results):
+        local = slice(owned.start - with_halo.start, owned.stop - with_halo.start)
+        slab_state = slab_args[narg]
+
+        for var in output_vars:
+            getattr(vs, var)[owned] = slab_state._arrays[var][local]
+
+        for i in output_args:
+            args[i][owned] = slab_args[i][local]
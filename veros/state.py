@@ -20,6 +20,7 @@ class VerosState:
         self.nisle = 0 # to be overriden during streamfunction_init
         self.taum1, self.tau, self.taup1 = 0, 1, 2 # pointers to last, current, and next time step
         self.time, self.itt = 0., 0 # current time and iteration
+        self.chunk_sizes = None # grid points per process in x and y-direction (default: uniform)
 
         settings.set_default_settings(self)
 
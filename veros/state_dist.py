@@ -1,48 +1,53 @@
 from loguru import logger
 
 from .state import VerosState
+from .comm_profile import PROFILE as COMM_PROFILE
 
 
 class DistributedVerosState(VerosState):
     """A proxy wrapper to temporarily synchronize a distributed state.
 
     Use `gather_arrays` to retrieve distributed variables from parent VerosState object,
-    and `scatter_arrays` to sync changes back.
+    and `scatter_arrays` to sync changes back. Communication is attributed to
+    `kernel` in the communication profile.
     """
-    def __init__(self, parent_state):
+    def __init__(self, parent_state, kernel=None):
         object.__setattr__(self, '_vs', parent_state)
         object.__setattr__(self, '_gathered', set())
+        object.__setattr__(self, '_call_site', '{} (gather / scatter)'.format(kernel))
 
     def gather_arrays(self, arrays):
         """Gather given variables from parent state object"""
         from .distributed import gather
-        for arr in arrays:
-            if not hasattr(self._vs, arr):
-                continue
-            self._gathered.add(arr)
-            logger.trace(' Gathering {}', arr)
-            gathered_arr = gather(
-                self._vs,
-                getattr(self._vs, arr),
-                self._vs.variables[arr].dims
-            )
-            setattr(self, arr, gathered_arr)
+        with COMM_PROFILE.call_site(self._call_site):
+            for arr in arrays:
+                if not hasattr(self._vs, arr):
+                    continue
+                self._gathered.add(arr)
+                logger.trace(' Gathering {}', arr)
+                gathered_arr = gather(
+                    self._vs,
+                    getattr(self._vs, arr),
+                    self._vs.variables[arr].dims
+                )
+                setattr(self, arr, gathered_arr)
 
     def scatter_arrays(self):
         """Sync all changes with parent state object"""
         from .distributed import scatter
-        for arr in sorted(self._gathered):
-            if not hasattr(self._vs, arr):
-                continue
-            logger.trace(' Scattering {}', arr)
-            getattr(self._vs, arr)[...] = scatter(
-                self._vs,
-                getattr(self, arr),
-                self._vs.variables[arr].dims
-            )
+        with COMM_PROFILE.call_site(self._call_site):
+            for arr in sorted(self._gathered):
+                if not hasattr(self._vs, arr):
+                    continue
+                logger.trace(' Scattering {}', arr)
+                getattr(self._vs, arr)[...] = scatter(
+                    self._vs,
+                    getattr(self, arr),
+                    self._vs.variables[arr].dims
+                )
 
     def __getattribute__(self, attr):
-        if attr in ('_vs', '_gathered', 'gather_arrays', 'scatter_arrays'):
+        if attr in ('_vs', '_gathered', '_call_site', 'gather_arrays', 'scatter_arrays'):
             return object.__getattribute__(self, attr)
 
         gathered = self._gathered
@@ -65,3 +70,39 @@ class DistributedVerosState(VerosState):
             return self._vs.__setattr__(attr, val)
 
         raise AttributeError('Cannot access distributed variable %s since it was not retrieved' % attr)
+
+
+class GlobalVerosState(DistributedVerosState):
+    """A proxy wrapper that holds variables of the whole domain on a single process.
+
+    Variables are allocated on first access, so only those that are actually used
+    take up memory. Use this to set up parts of a fresh state outside of the
+    distributed context (i.e., within a veros method with ``dist_safe=False``).
+    """
+    def __getattribute__(self, attr):
+        if attr in ('_vs', '_gathered', '_call_site', 'gather_arrays', 'scatter_arrays', '_allocate'):
+            return object.__getattribute__(self, attr)
+
+        gathered = self._gathered
+        if attr not in gathered and attr in self._vs.variables:
+            self._allocate(attr)
+
+        return DistributedVerosState.__getattribute__(self, attr)
+
+    def __setattr__(self, attr, val):
+        if attr in self._vs.variables:
+            self._gathered.add(attr)
+        return DistributedVerosState.__setattr__(self, attr, val)
+
+    def _allocate(self, attr):
+        from . import runtime_settings as rs
+        from .backend import get_backend
+        from .variables import get_dimensions
+
+        var = self._vs.variables[attr]
+        shape = get_dimensions(self, var.dims, local=False)
+        dtype = var.dtype or self._vs.default_float_type
+
+        # not taken from the workspace of the kernel that happens to access it first
+        self._gathered.add(attr)
+        object.__setattr__(self, attr, get_backend(rs.backend).zeros(shape, dtype=dtype))
@@ -2,25 +2,28 @@ import timeit
 
 
 class Timer:
-    def __init__(self, name):
+    """Measures accumulated wall time of a code block.
+
+    Lazy backends are synchronized on exit if the current sync policy allows
+    synchronization at ``sync_level``. If it does not, the timer only measures the
+    time it took to dispatch the computation and is marked as not synchronized.
+    """
+    def __init__(self, name, sync_level='stage'):
         self.name = name
+        self.sync_level = sync_level
         self.total_time = 0
         self.last_time = 0
-
-        try:
-            import bohrium as bh
-            flush = bh.flush
-        except ImportError:
-            def flush():
-                pass
-
-        self._flush = flush
+        self.synchronized = True
 
     def __enter__(self):
         self.start_time = timeit.default_timer()
 
     def __exit__(self, type, value, traceback):
-        self._flush()
+        from .backend import synchronize
+
+        if not synchronize(self.sync_level):
+            self.synchronized = False
+
         self.last_time = timeit.default_timer() - self.start_time
         self.total_time += self.last_time
 
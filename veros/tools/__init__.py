@@ -1,5 +1,40 @@
-from veros.tools.assets import get_assets
-from veros.tools.setup import (interpolate, fill_holes, get_periodic_interval, make_cyclic,
-                               get_coastline_distance, get_uniform_grid_steps, get_stretched_grid_steps,
-                               get_vinokur_grid_steps)
+import sys
+import types
+
 from veros.tools.cli import cli
+
+# assets and setup tools pull in heavy dependencies (requests, SciPy), so they are
+# only imported on first access
+
+_LAZY_ATTRIBUTES = {
+    'get_assets': 'veros.tools.assets',
+    'interpolate': 'veros.tools.setup',
+    'fill_holes': 'veros.tools.setup',
+    'get_periodic_interval': 'veros.tools.setup',
+    'make_cyclic': 'veros.tools.setup',
+    'get_coastline_distance': 'veros.tools.setup',
+    'get_uniform_grid_steps': 'veros.tools.setup',
+    'get_stretched_grid_steps': 'veros.tools.setup',
+    'get_vinokur_grid_steps': 'veros.tools.setup',
+}
+
+
+class _LazyTools(types.ModuleType):
+    def __getattr__(self, attr):
+        if attr not in _LAZY_ATTRIBUTES:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(self.__name__, attr))
+
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRIBUTES[attr])
+        val = getattr(module, attr)
+        setattr(self, attr, val)
+        return val
+
+    def __dir__(self):
+        return sorted(set(super(_LazyTools, self).__dir__()) | set(_LAZY_ATTRIBUTES))
+
+
+sys.modules[__name__].__class__ = _LazyTools
+
+del sys
+del types
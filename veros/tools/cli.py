@@ -4,8 +4,9 @@ import click
 
 from veros.settings import SETTINGS
 
-BACKENDS = ['numpy', 'bohrium']
+BACKENDS = ['numpy', 'numpy-threaded', 'numba', 'bohrium']
 LOGLEVELS = ['trace', 'debug', 'info', 'warning', 'error', 'critical']
+HALO_TRANSPORTS = ['messages', 'shared_memory']
 
 
 class VerosSetting(click.ParamType):
@@ -50,7 +51,8 @@ def cli(run):
         Usage: my_setup.py [OPTIONS]
 
         Options:
-        -b, --backend [numpy|bohrium]   Backend to use for computations (default:
+        -b, --backend [numpy|numpy-threaded|numba|bohrium]
+                                        Backend to use for computations (default:
                                         numpy)
         -v, --loglevel [trace|debug|info|warning|error|critical]
                                         Log level used for output (default: info)
@@ -58,8 +60,23 @@ def cli(run):
                                         multiple times
         -p, --profile-mode              Write a performance profile for debugging
                                         (default: false)
+        --profile-kernels               Record the wall time of every Veros kernel
+                                        and write a call tree and trace (default:
+                                        false)
+        --profile-memory                Record the peak memory usage of every Veros
+                                        kernel (default: false)
+        --profile-comm                  Record MPI communication and report it at
+                                        the end of the run (default: false)
         -n, --num-proc INTEGER...       Number of processes in x and y dimension
                                         (requires execution via mpirun)
+        --auto-num-proc                 Choose the number of processes in x and y
+                                        dimension automatically, based on grid size
+                                        and topography (overrides --num-proc)
+        --halo-transport [messages|shared_memory]
+                                        How processes exchange their overlap
+                                        (default: messages)
+        --local-procs INTEGER           Run on this many local processes that
+                                        communicate without MPI (default: 1)
         --help                          Show this message and exit.
 
     """
@@ -73,19 +90,47 @@ def cli(run):
                   help='Override default setting, may be specified multiple times')
     @click.option('-p', '--profile-mode', is_flag=True, default=False, type=click.BOOL, envvar='VEROS_PROFILE',
                   help='Write a performance profile for debugging (default: false)')
+    @click.option('--profile-kernels', is_flag=True, default=False, type=click.BOOL,
+                  envvar='VEROS_PROFILE_KERNELS',
+                  help='Record the wall time of every Veros kernel and write a call tree and trace '
+                       '(default: false)')
+    @click.option('--profile-memory', is_flag=True, default=False, type=click.BOOL,
+                  envvar='VEROS_PROFILE_MEMORY',
+                  help='Record the peak memory usage of every Veros kernel (default: false)')
+    @click.option('--profile-comm', is_flag=True, default=False, type=click.BOOL,
+                  envvar='VEROS_PROFILE_COMM',
+                  help='Record MPI communication and report it at the end of the run (default: false)')
     @click.option('-n', '--num-proc', nargs=2, default=[1, 1], type=click.INT,
                   help='Number of processes in x and y dimension (requires execution via mpirun)')
+    @click.option('--auto-num-proc', is_flag=True, default=False, type=click.BOOL,
+                  help='Choose the number of processes in x and y dimension automatically, based on '
+                       'grid size and topography (overrides --num-proc)')
+    @click.option('--halo-transport', default='messages', type=click.Choice(HALO_TRANSPORTS),
+                  envvar='VEROS_HALO_TRANSPORT',
+                  help='How processes exchange their overlap (default: messages)')
+    @click.option('--local-procs', default=1, type=click.IntRange(min=1), envvar='VEROS_LOCAL_PROCS',
+                  help='Run on this many local processes that communicate without MPI (default: 1)')
     @functools.wraps(run)
     def wrapped(*args, **kwargs):
         from veros import runtime_settings
 
         kwargs['override'] = dict(kwargs['override'])
 
-        for setting in ('backend', 'profile_mode', 'num_proc', 'loglevel'):
+        if kwargs.pop('auto_num_proc', False):
+            kwargs['num_proc'] = 'auto'
+
+        for setting in ('backend', 'profile_mode', 'profile_kernels', 'profile_memory',
+                        'profile_comm', 'num_proc', 'halo_transport', 'loglevel'):
             if setting not in kwargs:
                 continue
             setattr(runtime_settings, setting, kwargs.pop(setting))
 
+        local_procs = kwargs.pop('local_procs', 1)
+        if local_procs > 1:
+            from veros.local_comm import launch
+            launch(run, local_procs, args=args, kwargs=kwargs)
+            return
+
         run(*args, **kwargs)
 
     return wrapped
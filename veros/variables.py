@@ -1,6 +1,7 @@
 from collections import OrderedDict
 
-from . import veros_method, runtime_settings
+from . import veros_method
+from .distributed import get_chunk_size
 
 
 class Variable:
@@ -49,8 +50,6 @@ GHOST_DIMENSIONS = ('xt', 'yt', 'xu', 'yu')
 
 
 def get_dimensions(vs, grid, include_ghosts=True, local=True):
-    px, py = runtime_settings.num_proc
-
     dimensions = {
         'xt': vs.nx,
         'xu': vs.nx,
@@ -65,11 +64,12 @@ def get_dimensions(vs, grid, include_ghosts=True, local=True):
     }
 
     if local:
+        chunk_x, chunk_y = get_chunk_size(vs)
         dimensions.update({
-            'xt': dimensions['xt'] // px,
-            'xu': dimensions['xu'] // px,
-            'yt': dimensions['yt'] // py,
-            'yu': dimensions['yt'] // py
+            'xt': chunk_x,
+            'xu': chunk_x,
+            'yt': chunk_y,
+            'yu': chunk_y
         })
 
     if include_ghosts:
@@ -752,6 +752,25 @@ def allocate(vs, dimensions, dtype=None, include_ghosts=True, local=True, fill=0
         dtype = vs.default_float_type
 
     shape = get_dimensions(vs, dimensions, include_ghosts=include_ghosts, local=local)
-    out = np.empty(shape, dtype=dtype)
+    return _allocate_array(np, shape, dtype, fill)
+
+
+@veros_method(inline=True)
+def allocate_like(vs, arr, fill=0):
+    """Like ``np.zeros_like``, but uses the current workspace (see :mod:`veros.workspace`)"""
+    return _allocate_array(np, arr.shape, arr.dtype, fill)
+
+
+def _allocate_array(backend, shape, dtype, fill):
+    from .decorators import CONTEXT
+
+    scope = CONTEXT.workspace
+    if scope is None:
+        out = backend.empty(shape, dtype=dtype)
+    else:
+        from .workspace import POOL
+        out = POOL.acquire(backend, shape, dtype)
+        scope.append(out)
+
     out[...] = fill
     return out
@@ -4,10 +4,12 @@ import abc
 from loguru import logger
 
 from veros import (
-    settings, diagnostics, time, handlers, logs, distributed, progress,
+    settings, diagnostics, time, handlers, logs, distributed, progress, workspace, variables,
+    kernel_profile, memory_profile, comm_profile, veros_method,
     runtime_settings as rs, runtime_state as rst
 )
 from veros.state import VerosState
+from veros.state_dist import GlobalVerosState
 from veros.timer import Timer
 from veros.core import (
     momentum, numerics, thermodynamics, eke, tke, idemix,
@@ -26,8 +28,8 @@ class VerosSetup(metaclass=abc.ABCMeta):
 
     Arguments:
         backend (:obj:`bool`, optional): Backend to use for array operations.
-            Possible values are ``numpy`` and ``bohrium``. Defaults to ``None``, which
-            tries to read the backend from the command line (set via a flag
+            Possible values are ``numpy``, ``numpy-threaded``, ``numba``, and ``bohrium``. Defaults to ``None``,
+            which tries to read the backend from the command line (set via a flag
             ``-b``/``--backend``), and uses ``numpy`` if no command line argument is given.
         loglevel (one of {debug, info, warning, error, critical}, optional): Verbosity
             of the model. Tries to read value from command line if not given
@@ -54,11 +56,15 @@ class VerosSetup(metaclass=abc.ABCMeta):
         if state is None:
             self.state = VerosState()
 
-        self.state.timers = {k: Timer(k) for k in (
-            'setup', 'main', 'momentum', 'temperature', 'eke', 'idemix',
-            'tke', 'diagnostics', 'pressure', 'friction', 'isoneutral',
-            'vmix', 'eq_of_state'
+        # timers around whole time steps always synchronize, the others only
+        # if the sync policy allows it
+        self.state.timers = {k: Timer(k, sync_level='timestep') for k in (
+            'setup', 'main', 'diagnostics'
         )}
+        self.state.timers.update({k: Timer(k, sync_level='stage') for k in (
+            'momentum', 'temperature', 'eke', 'idemix', 'tke', 'pressure',
+            'friction', 'isoneutral', 'vmix', 'eq_of_state'
+        )})
 
     @abc.abstractmethod
     def set_parameter(self, vs):
@@ -172,6 +178,46 @@ class VerosSetup(metaclass=abc.ABCMeta):
         """
         pass
 
+    def _setup_topography(self, vs):
+        self.set_grid(vs)
+        numerics.calc_grid(vs)
+
+        self.set_coriolis(vs)
+        numerics.calc_beta(vs)
+
+        self.set_topography(vs)
+        numerics.calc_topo(vs)
+
+    @veros_method(dist_safe=False, local_variables=[])
+    def _get_global_topography(self, vs):
+        """Sets up grid and topography of the whole domain on the first process only,
+        and returns ``kbot`` (including overlap) on all processes.
+
+        Only the variables accessed by :meth:`set_grid`, :meth:`set_coriolis`, and
+        :meth:`set_topography` are allocated (usually the grid metrics, ``coriolis_t``,
+        and ``kbot``), so this fits into memory as long as a few horizontal arrays of
+        the whole domain do.
+        """
+        global_vs = GlobalVerosState(type(self.state)())
+        self.set_parameter(global_vs)
+        for setting, value in self.override_settings.items():
+            setattr(global_vs, setting, value)
+        global_vs.variables.update(variables.get_standard_variables(global_vs))
+
+        self.set_grid(global_vs)
+        numerics.calc_grid(global_vs)
+        self.set_coriolis(global_vs)
+        self.set_topography(global_vs)
+        numerics.close_domain(global_vs)
+
+        kbot = global_vs.kbot
+        try:
+            kbot = kbot.copy2numpy()
+        except AttributeError:
+            pass
+
+        return kbot
+
     def setup(self):
         vs = self.state
 
@@ -184,17 +230,33 @@ class VerosSetup(metaclass=abc.ABCMeta):
                 setattr(vs, setting, value)
 
             settings.check_setting_conflicts(vs)
-            distributed.validate_decomposition(vs)
-            vs.allocate_variables()
 
-            self.set_grid(vs)
-            numerics.calc_grid(vs)
+            kbot = None
+            if rs.num_proc == 'auto':
+                if rst.proc_num > 1:
+                    kbot = self._get_global_topography(vs)
+                # also chooses chunk sizes and land blocks
+                distributed.choose_decomposition(vs, kbot)
+
+            elif rs.num_proc != (1, 1) and vs.enable_land_block_elimination:
+                # processes are assigned to blocks before the domain is set up
+                kbot = self._get_global_topography(vs)
+                if vs.enable_balanced_decomposition:
+                    distributed.balance_decomposition(vs, kbot)
+                distributed.eliminate_land_blocks(vs, kbot)
+                logger.info(' Eliminated {} land blocks from decomposition', len(rs.land_blocks))
 
-            self.set_coriolis(vs)
-            numerics.calc_beta(vs)
+            distributed.validate_decomposition(vs)
+            vs.allocate_variables()
+            self._setup_topography(vs)
 
-            self.set_topography(vs)
-            numerics.calc_topo(vs)
+            if (vs.enable_balanced_decomposition and kbot is None
+                    and distributed.balance_decomposition(vs)):
+                logger.info(' Re-decomposing domain (grid points per process: x {}, y {})',
+                            *distributed.get_chunk_sizes(vs))
+                distributed.validate_decomposition(vs)
+                vs.allocate_variables()
+                self._setup_topography(vs)
 
             self.set_initial_conditions(vs)
             numerics.calc_initial_conditions(vs)
@@ -273,16 +335,24 @@ class VerosSetup(metaclass=abc.ABCMeta):
                                 if vs.enable_tke:
                                     tke.integrate_tke(vs)
 
-                            utilities.enforce_boundaries(vs, vs.u[:, :, :, vs.taup1])
-                            utilities.enforce_boundaries(vs, vs.v[:, :, :, vs.taup1])
+                            boundary_arrays = [vs.u[:, :, :, vs.taup1], vs.v[:, :, :, vs.taup1]]
                             if vs.enable_tke:
-                                utilities.enforce_boundaries(vs, vs.tke[:, :, :, vs.taup1])
+                                boundary_arrays.append(vs.tke[:, :, :, vs.taup1])
                             if vs.enable_eke:
-                                utilities.enforce_boundaries(vs, vs.eke[:, :, :, vs.taup1])
+                                boundary_arrays.append(vs.eke[:, :, :, vs.taup1])
                             if vs.enable_idemix:
-                                utilities.enforce_boundaries(vs, vs.E_iw[:, :, :, vs.taup1])
-
-                            momentum.vertical_velocity(vs)
+                                boundary_arrays.append(vs.E_iw[:, :, :, vs.taup1])
+
+                            # compute vertical velocity in the interior while the overlap is exchanged
+                            exchange = utilities.start_enforce_boundaries(vs, boundary_arrays)
+                            if exchange is None:
+                                momentum.vertical_velocity(vs)
+                            else:
+                                interior, boundary = utilities.partition_columns(stencil=1, start=1)
+                                momentum.vertical_velocity(vs, interior)
+                                utilities.finish_enforce_boundaries(vs, exchange)
+                                for columns in boundary:
+                                    momentum.vertical_velocity(vs, columns)
 
                         vs.itt += 1
                         vs.time += vs.dt_tracer
@@ -316,23 +386,61 @@ class VerosSetup(metaclass=abc.ABCMeta):
             finally:
                 diagnostics.write_restart(vs, force=True)
 
-                logger.debug('\n'.join([
-                    '',
-                    'Timing summary:',
-                    ' setup time               = {:.2f}s'.format(vs.timers['setup'].get_time()),
-                    ' main loop time           = {:.2f}s'.format(vs.timers['main'].get_time()),
-                    '   momentum               = {:.2f}s'.format(vs.timers['momentum'].get_time()),
-                    '     pressure             = {:.2f}s'.format(vs.timers['pressure'].get_time()),
-                    '     friction             = {:.2f}s'.format(vs.timers['friction'].get_time()),
-                    '   thermodynamics         = {:.2f}s'.format(vs.timers['temperature'].get_time()),
-                    '     lateral mixing       = {:.2f}s'.format(vs.timers['isoneutral'].get_time()),
-                    '     vertical mixing      = {:.2f}s'.format(vs.timers['vmix'].get_time()),
-                    '     equation of state    = {:.2f}s'.format(vs.timers['eq_of_state'].get_time()),
-                    '   EKE                    = {:.2f}s'.format(vs.timers['eke'].get_time()),
-                    '   IDEMIX                 = {:.2f}s'.format(vs.timers['idemix'].get_time()),
-                    '   TKE                    = {:.2f}s'.format(vs.timers['tke'].get_time()),
-                    ' diagnostics and I/O      = {:.2f}s'.format(vs.timers['diagnostics'].get_time()),
-                ]))
+                self._log_timing_summary(vs)
+                workspace.POOL.log_stats()
+
+                if rs.profile_kernels:
+                    self._write_kernel_profile(vs)
+
+                if rs.profile_memory:
+                    memory_profile.PROFILE.log_summary()
+                    memory_profile.PROFILE.stop()
+
+                if rs.profile_comm:
+                    # collective operation, must be reached by all ranks
+                    comm_profile.log_report(sum(
+                        vs.timers[timer].get_time() for timer in ('setup', 'main', 'diagnostics')
+                    ))
 
                 if profiler is not None:
                     diagnostics.stop_profiler(profiler)
+
+    @staticmethod
+    def _write_kernel_profile(vs):
+        profile = kernel_profile.PROFILE
+        logger.info('Kernel profile (rank {}):\n{}', rst.proc_rank, profile.get_summary())
+        summary_file, trace_file = profile.write(
+            '{}.kernel_profile'.format(vs.identifier), rank=rst.proc_rank
+        )
+        logger.info('Kernel profile written to {} and {}', summary_file, trace_file)
+
+    @staticmethod
+    def _log_timing_summary(vs):
+        summary = (
+            (' setup time', 'setup'),
+            (' main loop time', 'main'),
+            ('   momentum', 'momentum'),
+            ('     pressure', 'pressure'),
+            ('     friction', 'friction'),
+            ('   thermodynamics', 'temperature'),
+            ('     lateral mixing', 'isoneutral'),
+            ('     vertical mixing', 'vmix'),
+            ('     equation of state', 'eq_of_state'),
+            ('   EKE', 'eke'),
+            ('   IDEMIX', 'idemix'),
+            ('   TKE', 'tke'),
+            (' diagnostics and I/O', 'diagnostics'),
+        )
+
+        lines = ['', 'Timing summary:']
+        for label, timer_name in summary:
+            timer = vs.timers[timer_name]
+            lines.append('{:<26}= {:.2f}s{}'.format(
+                label, timer.get_time(), '' if timer.synchronized else ' (*)'
+            ))
+
+        if not all(timer.synchronized for timer in vs.timers.values()):
+            lines.append('(*) not synchronized under sync policy "{}", only includes dispatch time'
+                         .format(rs.sync_policy))
+
+        logger.debug('\n'.join(lines))
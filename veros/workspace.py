@@ -0,0 +1,122 @@
+"""Pool of scratch arrays that are recycled between calls.
+
+Functions decorated with ``veros_method(workspace=True)`` open a workspace scope.
+All temporaries created through :func:`veros.variables.allocate` (or
+:func:`veros.variables.allocate_like`) while the scope is active, including inside
+inline veros methods, are taken from a pool keyed by shape and dtype, and handed back
+when the function returns. Other (non-inline) veros methods called from within the
+scope allocate as usual.
+
+This is only valid for functions that do not keep references to their temporaries
+beyond their own execution (e.g. by storing them on the state object). Arrays that
+are returned from the function are never recycled.
+"""
+
+import threading
+
+from loguru import logger
+
+
+class WorkspacePool:
+    def __init__(self):
+        self._free = {}
+        self._lock = threading.Lock()
+        self.clear_stats()
+
+    def clear_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in_use = 0
+        self.peak_bytes = 0
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        if not requests:
+            return 0.
+        return self.hits / requests
+
+    @property
+    def pooled_bytes(self):
+        """Total size of all arrays that are currently available for re-use"""
+        return sum(arr.nbytes for arrays in self._free.values() for arr in arrays)
+
+    def acquire(self, backend, shape, dtype):
+        key = (tuple(shape), backend.dtype(dtype))
+
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                arr = free.pop()
+                self.hits += 1
+            else:
+                arr = None
+                self.misses += 1
+
+        if arr is None:
+            arr = backend.empty(shape, dtype=dtype)
+
+        with self._lock:
+            self.bytes_in_use += arr.nbytes
+            self.peak_bytes = max(self.peak_bytes, self.bytes_in_use)
+
+        return arr
+
+    def release(self, arrays):
+        with self._lock:
+            # reversed, so that arrays are handed out in the same order next time
+            for arr in reversed(arrays):
+                self._free.setdefault((arr.shape, arr.dtype), []).append(arr)
+                self.bytes_in_use -= arr.nbytes
+
+    def forget(self, arr):
+        """Stop tracking an array that left the pool for good"""
+        with self._lock:
+            self.bytes_in_use -= arr.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+    def log_stats(self):
+        logger.debug(
+            'Workspace pool: {:.1%} hit rate ({} of {} requests), {:.1f} MB peak usage, '
+            '{:.1f} MB pooled',
+            self.hit_rate, self.hits, self.hits + self.misses,
+            self.peak_bytes / 1024 ** 2, self.pooled_bytes / 1024 ** 2
+        )
+
+
+POOL = WorkspacePool()
+
+
+def _find_escaping(arrays, res):
+    """Arrays in ``arrays`` that are referenced by the return value ``res``"""
+    if res is None:
+        return ()
+
+    if not isinstance(res, (tuple, list)):
+        res = (res,)
+
+    referenced = set()
+    for obj in res:
+        referenced.add(id(obj))
+        base = getattr(obj, 'base', None)
+        if base is not None:
+            referenced.add(id(base))
+
+    return [arr for arr in arrays if id(arr) in referenced]
+
+
+def close_scope(arrays, res):
+    """Hands all arrays allocated in a workspace scope back to the pool,
+    except those referenced by the return value ``res``."""
+    escaping = _find_escaping(arrays, res)
+    for arr in escaping:
+        POOL.forget(arr)
+
+    if escaping:
+        escaping = set(map(id, escaping))
+        arrays = [arr for arr in arrays if id(arr) not in escaping]
+
+    POOL.release(arrays)